@@ -0,0 +1,863 @@
+"""
+Timing benchmarks for the SCED tool.
+
+How to run: go to the program directory, and type down the below command
+    python Benchmarks.py
+"""
+
+import time
+
+import GeneralFunctions
+
+
+# //---  Read me  ---//
+# Build a synthetic generic case in the Pyomo dict-data format accepted by
+# SCEDGenericCaseModel.create_instance(data=...). Buses form a ring, every
+# bus hosts one load and (every other bus) one generator with numSegment
+# cost-curve segments.
+def makeGenericCaseData(numBus, numSegment):
+    buses = list(range(1, numBus+1))
+    gens = list(range(1, numBus//2+1))
+    data = {}
+    data['BUS'] = {None: buses}
+    data['Bus_number'] = dict((n, n) for n in buses)
+    data['Bus_kv'] = dict((n, 230.0) for n in buses)
+    data['Bus_va'] = dict((n, 0.0) for n in buses)
+    data['Bus_area'] = dict((n, 1) for n in buses)
+
+    data['LOAD'] = {None: buses}
+    data['Load_busNumber'] = dict((d, d) for d in buses)
+    data['Load_id'] = dict((d, 1) for d in buses)
+    data['Load_isInSvc'] = dict((d, 1) for d in buses)
+    data['Load_pd'] = dict((d, 10.0) for d in buses)
+
+    data['GEN'] = {None: gens}
+    data['Gen_busNumber'] = dict((g, 2*g-1) for g in gens)
+    data['Gen_id'] = dict((g, 1) for g in gens)
+    data['Gen_isInSvc'] = dict((g, 1) for g in gens)
+    data['Gen_pgInit'] = dict((g, 20.0) for g in gens)
+    data['Gen_pgMax'] = dict((g, 10.0*numSegment) for g in gens)
+    data['Gen_pgMin'] = dict((g, 0.0) for g in gens)
+    data['Gen_energyRamp'] = dict((g, 1.0) for g in gens)
+    data['Gen_spinRamp'] = dict((g, 1.0) for g in gens)
+    data['Gen_costCurveFlag'] = dict((g, 1) for g in gens)
+
+    costIdx = 0
+    data['GenCost_genIdx'] = {}
+    data['GenCost_segmentIdx'] = {}
+    data['GenCost_segmentBreadth'] = {}
+    data['GenCost_segmentPrice'] = {}
+    for g in gens:
+        for s in range(1, numSegment+1):
+            costIdx = costIdx + 1
+            data['GenCost_genIdx'][costIdx] = g
+            data['GenCost_segmentIdx'][costIdx] = s
+            data['GenCost_segmentBreadth'][costIdx] = 10.0
+            data['GenCost_segmentPrice'][costIdx] = 10.0 + s
+    data['GENCOST'] = {None: list(range(1, costIdx+1))}
+
+    data['BRANCH'] = {None: buses}
+    data['Branch_frmBusNumber'] = dict((k, k) for k in buses)
+    data['Branch_toBusNumber'] = dict((k, k % numBus + 1) for k in buses)
+    data['Branch_id'] = dict((k, 1) for k in buses)
+    data['Branch_isInSvc'] = dict((k, 1) for k in buses)
+    data['Branch_r'] = dict((k, 0.01) for k in buses)
+    data['Branch_x'] = dict((k, 0.1) for k in buses)
+    data['Branch_angle'] = dict((k, 0.0) for k in buses)
+    data['Branch_pkInit'] = dict((k, 0.0) for k in buses)
+    data['Branch_rateA'] = dict((k, 100.0) for k in buses)
+    data['Branch_rateB'] = dict((k, 100.0) for k in buses)
+    data['Branch_rateC'] = dict((k, 100.0) for k in buses)
+    return {None: data}
+
+
+# Add numCtgcy single-branch outages to a case from makeGenericCaseData:
+# contingency c takes out ring branch c, so no outage islands the network.
+def addContingencies(caseData, numCtgcy):
+    data = caseData[None]
+    ctgcys = list(range(1, numCtgcy+1))
+    data['CONTINGENCY'] = {None: ctgcys}
+    data['Contingency_isEnabled'] = dict((c, 1) for c in ctgcys)
+    data['CONTINGENCYLINE'] = {None: ctgcys}
+    data['Contingency_index'] = dict((c, c) for c in ctgcys)
+    data['Contingency_branchIdx'] = dict((c, c) for c in ctgcys)
+    return caseData
+
+
+# //---  Read me  ---//
+# Time SCEDGenericCaseModel.create_instance for growing case sizes; with the
+# precomputed bus incidence and gen->segment maps the time per generator
+# should stay roughly flat (i.e. construction scales linearly).
+def benchModelConstruction(busSizes=(250, 500, 1000, 2000), numSegment=10):
+    from SCEDGenericCaseModel import model as SCEDModel
+    print("Model construction time (SCEDGenericCaseModel.create_instance)")
+    print("  numBus  numGen  numSegment  seconds  ms/gen")
+    for numBus in busSizes:
+        data = makeGenericCaseData(numBus, numSegment)
+        t0 = time.time()
+        SCEDModel.create_instance(data=data)
+        elapsed = time.time() - t0
+        numGen = numBus//2
+        print("  %6d  %6d  %10d  %7.3f  %6.3f" % (numBus, numGen, numGen*numSegment, elapsed, 1000*elapsed/numGen))
+
+
+# //---  Read me  ---//
+# Compare the Pyomo route (create_instance + writing the LP file) with the
+# matrix-form route of SCEDGenericCaseMatrixModel (sparse assembly), and the
+# end-to-end solve time of both with HiGHS.
+def benchMatrixAssembly(busSizes=(250, 500, 1000, 2000), numSegment=10):
+    import os
+    import tempfile
+    from pyomo.environ import SolverFactory, value
+    from SCEDGenericCaseModel import model as SCEDModel
+    import SCEDGenericCaseMatrixModel
+    print("Pyomo vs matrix-form assembly (generic case)")
+    print("  numBus  pyomoBuild  lpWrite  pyomoSolve  matrixBuild  matrixSolve  objDiff")
+    for numBus in busSizes:
+        data = makeGenericCaseData(numBus, numSegment)
+        t0 = time.time()
+        instance = SCEDModel.create_instance(data=data)
+        pyomoBuild = time.time() - t0
+        lpFile = os.path.join(tempfile.gettempdir(), "benchSCED.lp")
+        t0 = time.time()
+        instance.write(lpFile)
+        lpWrite = time.time() - t0
+        os.remove(lpFile)
+        t0 = time.time()
+        SolverFactory("appsi_highs").solve(instance)
+        pyomoSolve = time.time() - t0
+
+        matrixModel = SCEDGenericCaseMatrixModel.MatrixSCEDModel(data).buildLP()
+        solution = matrixModel.solve()
+        objDiff = abs(value(instance.minimizeCost) - solution.minimizeCost)
+        print("  %6d  %10.3f  %7.3f  %10.3f  %11.3f  %11.3f  %7.1e" % (numBus, pyomoBuild, lpWrite, pyomoSolve,
+              matrixModel.buildTime, matrixModel.solveTime, objDiff))
+
+
+# //---  Read me  ---//
+# Full (one network copy per contingency) vs compact (PTDF/LODF) contingency
+# formulation of SCEDGenericCaseModel: model size, build and solve time. The
+# compact one is a preventive model (no corrective redispatch), so the
+# objectives only match on cases where the full model does not redispatch.
+def benchCompactContingency(busSizes=(100, 200, 400), numCtgcy=20, numSegment=5):
+    from pyomo.environ import SolverFactory, value
+    from SCEDGenericCaseModel import model as SCEDModel
+    print("Full vs compact contingency formulation (generic case, %d contingencies)" % numCtgcy)
+    print("  numBus  formulation  rows  cols  build  solve  objective")
+    for numBus in busSizes:
+        for useCompact in (0, 1):
+            data = addContingencies(makeGenericCaseData(numBus, numSegment), numCtgcy)
+            data[None]['useCompactContingency'] = {None: useCompact}
+            t0 = time.time()
+            instance = SCEDModel.create_instance(data=data)
+            build = time.time() - t0
+            t0 = time.time()
+            SolverFactory("appsi_highs").solve(instance)
+            solve = time.time() - t0
+            print("  %6d  %11s  %5d  %5d  %5.2f  %5.2f  %.4f" % (numBus, ["full", "compact"][useCompact], instance.nconstraints(),
+                  instance.nvariables(), build, solve, value(instance.minimizeCost)))
+
+
+# //---  Read me  ---//
+# Consecutive SCED intervals with changing loads: a fresh instance and
+# SolverFactory per interval vs one PersistentSCEDSession updating Load_pd.
+def benchPersistentSolver(numBus=400, numInterval=10, numSegment=5, solverName="appsi_highs"):
+    from pyomo.environ import SolverFactory, value
+    from SCEDGenericCaseModel import model as SCEDModel
+    import PersistentSolver
+    print("Fresh vs persistent solver over %d intervals (generic case, %d buses, %s)" % (numInterval, numBus, solverName))
+    print("  interval  fresh  persistent  objDiff")
+    data = makeGenericCaseData(numBus, numSegment)
+    session = PersistentSolver.PersistentSCEDSession(SCEDModel.create_instance(data=data), solverName)
+    for t in range(numInterval):
+        loadPd = dict((d, 10.0*(1 + 0.02*t)) for d in data[None]['LOAD'][None])
+        t0 = time.time()
+        instance = SCEDModel.create_instance(data=data)
+        for d in loadPd:
+            instance.Load_pd[d] = loadPd[d]
+        SolverFactory(solverName).solve(instance)
+        fresh = time.time() - t0
+        t0 = time.time()
+        session.update({'Load_pd': loadPd})
+        session.solve()
+        persistent = time.time() - t0
+        objDiff = abs(value(instance.minimizeCost) - value(session.instance.minimizeCost))
+        print("  %8d  %5.3f  %10.3f  %7.1e" % (t+1, fresh, persistent, objDiff))
+
+
+# //---  Read me  ---//
+# Scenarios (load scaling and one branch outage each) solved by rebuilding the
+# instance vs as ScenarioOverlays on one base instance in a persistent session.
+def benchScenarioOverlay(numBus=400, numScenario=10, numSegment=5, solverName="appsi_highs"):
+    from pyomo.environ import SolverFactory, value
+    from SCEDGenericCaseModel import model as SCEDModel
+    import PersistentSolver
+    import ScenarioOverlay
+    print("Rebuild vs overlay for %d scenarios (generic case, %d buses, %s)" % (numScenario, numBus, solverName))
+    print("  scenario  rebuild  overlay  objDiff")
+    data = makeGenericCaseData(numBus, numSegment)
+    session = PersistentSolver.PersistentSCEDSession(SCEDModel.create_instance(data=data), solverName)
+    session.solve()
+    for t in range(numScenario):
+        factor = 1 + 0.02*t
+        k = 1 + t*numBus//numScenario
+        t0 = time.time()
+        case = dict(data[None])
+        case['Load_pd'] = dict((d, v*factor) for d, v in case['Load_pd'].items())
+        case['Branch_isInSvc'] = dict(case['Branch_isInSvc'])
+        case['Branch_isInSvc'][k] = 0
+        instance = SCEDModel.create_instance(data={None: case})
+        SolverFactory(solverName).solve(instance)
+        rebuildTime = time.time() - t0
+        t0 = time.time()
+        overlay = ScenarioOverlay.ScenarioOverlay()
+        overlay.scaleLoads(factor)
+        overlay.outageBranch(k)
+        overlay.apply(session.instance, session)
+        session.solve()
+        objDiff = abs(value(instance.minimizeCost) - value(session.instance.minimizeCost))
+        overlay.revert(session.instance, session)
+        overlayTime = time.time() - t0
+        print("  %8d  %7.3f  %7.3f  %7.1e" % (t+1, rebuildTime, overlayTime, objDiff))
+
+
+# //---  Read me  ---//
+# Monolithic N-1 SCED vs Benders decomposition (BendersDecomposition) for a
+# growing contingency list. Branch emergency ratings are tight and the
+# cheapest unit is large, so that the contingencies limit the dispatch.
+# Every Benders iteration re-solves the master and all the subproblems, so on
+# cases whose monolithic LP solves in well under a second the decomposition is
+# several times slower; it only pays off when the monolithic LP is too large
+# to build or solve in one piece and the subproblems run on several jobs.
+def benchBendersDecomposition(numBus=40, ctgcySizes=(5, 10, 20), numSegment=5, jobs=1, solverName="appsi_highs"):
+    from pyomo.environ import SolverFactory, value
+    from SCEDGenericCaseModel import model as SCEDModel
+    import Diary
+    import ParamManager
+    import BendersDecomposition
+    myDiary = Diary.Diary()
+    paramManager = ParamManager.ParamManager('configure.txt', myDiary)
+    paramManager.solverName = solverName
+    print("Monolithic vs Benders decomposition (generic case, %d buses, %d job(s), %s)" % (numBus, jobs, solverName))
+    print("  numCtgcy  monolithic  benders  iterations  master  subproblems  objDiff")
+    for numCtgcy in ctgcySizes:
+        data = addContingencies(makeGenericCaseData(numBus, numSegment), numCtgcy)
+        case = data[None]
+        case['Branch_rateC'] = dict((k, 30.0) for k in case['Branch_rateC'])
+        case['Gen_energyRamp'] = dict((g, 100.0) for g in case['Gen_energyRamp'])
+        case['Gen_pgMax'][1] = 200.0
+        for i in case['GenCost_genIdx']:
+            if case['GenCost_genIdx'][i] == 1:
+                case['GenCost_segmentBreadth'][i] = 40.0
+                case['GenCost_segmentPrice'][i] = 5.0
+        t0 = time.time()
+        instance = SCEDModel.create_instance(data=data)
+        SolverFactory(solverName).solve(instance)
+        monolithic = time.time() - t0
+        t0 = time.time()
+        benders = BendersDecomposition.BendersDecomposition(data, paramManager, myDiary)
+        benders.run(jobs)
+        bendersTime = time.time() - t0
+        objDiff = abs(value(instance.minimizeCost) - value(benders.master.bendersObjective))
+        masterTime = sum(h[6] for h in benders.history)
+        subTime = sum(h[7] for h in benders.history)
+        print("  %8d  %10.3f  %7.3f  %10d  %6.3f  %11.3f  %7.1e" % (numCtgcy, monolithic, bendersTime, len(benders.history),
+              masterTime, subTime, objDiff))
+    myDiary.close()
+
+
+# //---  Read me  ---//
+# Reduction of numScenario uniformly drawn (solar, wind) scenarios to numKeep
+# with every method of ScenarioReduction: time and Kantorovich distance (MW).
+def benchScenarioReduction(sizes=(1000, 10000, 100000), numKeep=25):
+    import numpy as np
+    import ScenarioReduction
+    print("Scenario reduction to %d scenarios" % numKeep)
+    print("  numScenario     method  seconds  distanceMW")
+    rng = np.random.default_rng(42)
+    for numScenario in sizes:
+        points = rng.uniform([0.0, 0.0], [50.0, 70.0], size=(numScenario, 2))
+        for method in ScenarioReduction.reductionMethods:
+            reduced, probabilities, labels, distance, seconds = ScenarioReduction.reduceScenarios(points, numKeep, method)
+            print("  %11d  %9s  %7.3f  %10.4f" % (numScenario, method, seconds, distance))
+
+
+# //---  Read me  ---//
+# Time to write the DFaxRC.dat table of numGen gens x numConstraint constraints
+# (DFax of the given density, as collectConstraintsData reads them) as the
+# dense matrix written cell by cell, as before, and as the sparse DFAX table
+# of the nonzero DFax written with GeneratePyomoDataFiles.formatRows.
+def benchDFaxWriter(numGen=10000, numConstraint=5000, density=0.05):
+    import os
+    import tempfile
+    import numpy as np
+    import GeneratePyomoDataFiles
+    rng = np.random.default_rng(42)
+    allDFax = []
+    dfaxRows = []
+    for jdx in range(0, numConstraint):
+        genDFax = [0]*numGen
+        for idx in np.nonzero(rng.random(numGen) < density)[0].tolist():
+            genDFax[idx] = float(rng.uniform(-1.0, 1.0))
+            dfaxRows.append([len(dfaxRows)+1, idx+1, jdx+1, genDFax[idx]])
+        allDFax.append(genDFax)
+    print("DFax file generation for %d gens x %d constraints, %d nonzero" % (numGen, numConstraint, len(dfaxRows)))
+    print("  writer        seconds  sizeMB")
+    folder = tempfile.mkdtemp()
+    fileName = os.path.join(folder, "DFaxRC.dat")
+    t0 = time.time()
+    with open(fileName, 'w') as f:
+        for idx in range(0, numGen):
+            f.write("%s %d" % (" ", (idx+1)))
+            for jdx in range(0, numConstraint):
+                f.write("%s %f" % (" ", allDFax[jdx][idx]))
+            f.write("%s" % ("\n"))
+    print("  densePerCell  %7.2f  %6.1f" % (time.time() - t0, os.path.getsize(fileName)/1e6))
+    t0 = time.time()
+    with open(fileName, 'w') as f:
+        f.write(GeneratePyomoDataFiles.formatRows(dfaxRows, GeneratePyomoDataFiles.dfaxFormats))
+    print("  sparseTable   %7.2f  %6.1f" % (time.time() - t0, os.path.getsize(fileName)/1e6))
+    os.remove(fileName)
+    os.rmdir(folder)
+
+
+# //---  Read me  ---//
+# Reference for benchRawTokenizer: GeneralFunctions.split as it was before the
+# single-pass rewrite, which rescans and copies the line for every delimiter.
+def baselineSplit(origStr, token, priorityToken):
+    origStr = GeneralFunctions.removeDoubleSlash(origStr)
+    origStr = GeneralFunctions.removeSpecialComments(origStr, "/*")
+    origStr = origStr.replace("\"",priorityToken) # change double quotes to single quotes
+    multiElem = []
+    numPriorityToken = origStr.count(priorityToken)  # priorityToken is a single quote; it will be a problem if it can also be a double quote
+    #numPriorityToken = origStr.count('\'')
+    if numPriorityToken == 0:
+        # there might be a problem if the first character is a comma, 
+        # however, this kind of case does not seem to exist.
+        multiElem = origStr.split(token)  # token should be a comma in this program
+        return multiElem
+    if numPriorityToken%2 == 1:
+        print ("Something is wrong in line: \n    " + origStr + \
+                "\n  the number of " + priorityToken + " should be even (paired).")
+        raise SystemExit
+    idxPriorityToken = []
+    copyStr = origStr
+    idx = copyStr.find(priorityToken)
+    idxOrig = idx
+    while idx != -1:
+        idxPriorityToken.append(idxOrig)
+        copyStr = copyStr[(idx+1):]
+        if not copyStr:
+            break
+        idx = copyStr.find(priorityToken)
+        idxOrig += (idx+1)
+    
+    copyStr = origStr
+    idxToken = copyStr.find(token)
+    idxPreviousToken = -1
+    idx = 0
+    markLastIterPriorityToken = 0
+    while idxToken != -1:
+        if (idxToken < idxPriorityToken[idx]) or (idxToken > idxPriorityToken[idx+1]):
+            if markLastIterPriorityToken == 0:
+                multiElem.append(origStr[(idxPreviousToken+1):idxToken])
+            else:
+                markLastIterPriorityToken = 0
+            copyStr = copyStr[:idxToken] + 'A' + copyStr[(idxToken+1):]
+            idxPreviousToken = idxToken
+            idxToken = copyStr.find(token)
+            if (idxToken > idxPriorityToken[idx+1]):
+                idx = idx + 2
+                if idx == len(idxPriorityToken):
+                    multiElem.append(origStr[(idxPreviousToken+1):idxToken])
+                    if copyStr.rfind(token) < idxPriorityToken[idx-1]:
+                        break
+                    while (idxToken < idxPriorityToken[idx-1]):
+                        copyStr = copyStr[:idxToken] + 'A' + copyStr[(idxToken+1):]
+                        idxToken = copyStr.find(token)
+                    leftStr = origStr[(idxToken + 1):]
+                    elems = leftStr.split(token)
+                    multiElem.extend(elems)
+                    break
+        else:
+            multiElem.append(origStr[idxPriorityToken[idx]:(idxPriorityToken[idx+1]+1)])
+            markLastIterPriorityToken = 1
+            idx = idx + 2
+            if idx == len(idxPriorityToken):
+                if copyStr.rfind(token) < idxPriorityToken[idx-1]:
+                    break
+                while (idxToken < idxPriorityToken[idx-1]):
+                    copyStr = copyStr[:idxToken] + 'A' + copyStr[(idxToken+1):]
+                    idxToken = copyStr.find(token)
+                leftStr = origStr[(idxToken + 1):]
+                elems = leftStr.split(token)
+                #multiElem = multiElem + elems
+                multiElem.extend(elems)
+                break
+            else:
+                idxToken = copyStr.find(token)
+                while (idxToken < idxPriorityToken[idx-1]):
+                    #copyStr[idxToken] = 'A'
+                    copyStr = copyStr[:idxToken] + 'A' + copyStr[(idxToken+1):]
+                    idxToken = copyStr.find(token)
+    idxLastToken = origStr.rfind(token)
+    idxLastPriorityToken = origStr.rfind(priorityToken)
+    if (idxLastToken < idxLastPriorityToken):
+        multiElem.append(origStr[(idxLastToken+1):])
+    return multiElem
+
+def baselineStrip(strs):
+    num = len(strs)
+    newStrs = []
+    for i in range(0, num):
+        newStrs.append(strs[i].strip())
+    return newStrs
+
+
+# //---  Read me  ---//
+# Tokenize a synthetic PSS/E RAW file of numLines bus, load, gen and branch
+# records (quoted names and IDs, with comments) through LoadInitFiles.getStrings,
+# against the previous tokenizer (baselineSplit, then baselineStrip; the tokens
+# must be the same) and a plain str.split of the same lines as the lower bound.
+def benchRawTokenizer(numLines=100000):
+    import os
+    import tempfile
+    import LoadInitFiles
+    import GeneralFunctions
+    records = ["%(n)d,'BUS%(n)-9d', 230.0000,1, 1, 1, 1,1.0200,-3.6564, 1.1,0.9,1.1,0.9",
+               "%(n)d,'1 ',1,1,1,5.765,2.0,0,0,0,0,1,1,0 /* LOAD 12",
+               "%(n)d,'1 ',   105.000,    10.000,   150.000,  -100.000,1.04000,     0,   100.000, 0.00000E+0, 1.00000E+0, 0.00000E+0, 0.00000E+0,1.00000,1,  100.0,   200.000,     0.000,   1,1.0000",
+               "%(n)d,     2,'1 ', 1.93800E-2, 5.91700E-2,   0.05280,   120.00,   130.00,   140.00,  0.00000,  0.00000,  0.00000,  0.00000,1,1,   0.00,   1,1.0000 // branch"]
+    folder = tempfile.mkdtemp()
+    fileName = os.path.join(folder, "bench.raw")
+    with open(fileName, 'w') as f:
+        for idx in range(0, numLines):
+            f.write(records[idx%len(records)] % {"n": idx+1} + "\n")
+    print("RAW tokenizer over %d lines" % numLines)
+    print("  tokenizer    seconds  linesPerSecond")
+    with open(fileName, 'r') as f:
+        lines = f.readlines()
+    t0 = time.time()
+    for line in lines:
+        line.split(',')
+    seconds = time.time() - t0
+    print("  str.split    %7.3f  %14.0f" % (seconds, numLines/seconds))
+    t0 = time.time()
+    baselineTokens = [baselineStrip(baselineSplit(line, ',', '\'')) for line in lines]
+    seconds = time.time() - t0
+    print("  baseline     %7.3f  %14.0f" % (seconds, numLines/seconds))
+    t0 = time.time()
+    tokens = [LoadInitFiles.getStrings(line) for line in lines]
+    seconds = time.time() - t0
+    print("  getStrings   %7.3f  %14.0f" % (seconds, numLines/seconds))
+    assert tokens == baselineTokens
+    os.remove(fileName)
+    os.rmdir(folder)
+
+
+# Write a synthetic PSS/E RAW file (bus, load, gen, branch and transformer
+# sections) with numBus buses, for the RAW reader benchmarks
+def writeSyntheticRaw(fileName, numBus):
+    with open(fileName, 'w') as f:
+        f.write("0, 100.00, 33, 0, 0, 60.00 / header\nline2\nline3\n")
+        for n in range(1, numBus+1):
+            f.write("%d,'BUS%-6d', 230.0000,1, 1, 1, 1, 1,1.0200,%.4f, 1.1,0.9,1.1,0.9\n" % (n, n, (n%17)*0.5 - 4.0))
+        f.write("0 / END OF BUS DATA, BEGIN LOAD DATA\n")
+        for n in range(2, numBus+1, 2):
+            f.write("%d,'1 ',1,1,1,%.3f,2.0,0,0,0,0,1,1,0 /* LOAD %d\n" % (n, 5.0 + n%23, n))
+        f.write("0 / END OF LOAD DATA, BEGIN GENERATOR DATA\n")
+        for n in range(1, numBus+1, 4):
+            f.write("%d,'1 ',30.828,0,10,-10,1.0,0,100,0,1,0,0,1,1,100,88.17,3.81,1,1 /* GEN %d Y\n" % (n, n))
+        f.write("0 / END OF GENERATOR DATA, BEGIN BRANCH DATA\n")
+        for n in range(1, numBus+1):
+            f.write("%d,%d,'1 ',0.04350,0.21129,0.0,99999.0,200.0,250.0,0.0,0.0,0,0,0,0,1,1 /* BR %d-%d\n" % (n, n%numBus+1, n, n%numBus+1))
+            if n%2 == 0:
+                f.write("%d,%d,'2 ',0.04350,0.21129,0.0,150.0,200.0,250.0,0.0,0.0,0,0,0,0,1,1 /* BR %d-%d 2\n" % (n, (n+7)%numBus+1, n, (n+7)%numBus+1))
+        f.write("0 / END OF BRANCH DATA, BEGIN TRANSFORMER DATA\n")
+        for n in range(1, numBus+1, 50):
+            f.write("%d,%d,'1 ',1,1,1 /* XFM %d-%d Y 1\n" % (n, n%numBus+1, n, n%numBus+1))
+        f.write("0 / END OF TRANSFORMER DATA\n")
+
+
+# //---  Read me  ---//
+# Parse time and peak traced memory of reading a synthetic RAW file of numBus
+# buses into objects (loadBuses/loadLoads/loadGens/loadBranches) and into
+# structured arrays (LoadInitFiles.readRawFile).
+def benchRawReader(busSizes=(5000, 20000, 80000)):
+    import os
+    import tempfile
+    import tracemalloc
+    import Diary
+    import GeneralFunctions
+    import LoadInitFiles
+    myDiary = Diary.Diary()
+    def readObjects(fileName):
+        with open(fileName, "r") as pf:
+            GeneralFunctions.skipNLines(pf, 3)
+            return [LoadInitFiles.loadBuses(pf, myDiary), LoadInitFiles.loadLoads(pf, myDiary), \
+                    LoadInitFiles.loadGens(pf, myDiary), LoadInitFiles.loadBranches(pf, myDiary)]
+    def readArrays(fileName):
+        return LoadInitFiles.readRawFile(fileName, myDiary)
+    print("RAW reader")
+    print("    numBus  numBranch   reader  seconds  peakMB")
+    folder = tempfile.mkdtemp()
+    fileName = os.path.join(folder, "bench.raw")
+    for numBus in busSizes:
+        writeSyntheticRaw(fileName, numBus)
+        for name, reader in [("objects", readObjects), ("arrays", readArrays)]:
+            t0 = time.time()
+            data = reader(fileName)
+            seconds = time.time() - t0
+            del data
+            tracemalloc.start()
+            data = reader(fileName)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print("  %8d  %9d  %7s  %7.3f  %6.1f" % (numBus, len(data[3]), name, seconds, peak/1e6))
+            del data
+    os.remove(fileName)
+    os.rmdir(folder)
+    myDiary.close()
+
+
+# //---  Read me  ---//
+# Attribute reads of the gens of a synthetic RAW file with numGen gens: the
+# objects of loadGens against the object views of loadRawViews, which copy
+# their row on the first read (first pass) and are plain objects after it.
+# Every pass reads six gen fields one gen at a time; the writers read whole
+# rows with RawGenericModel.recordRows instead (see benchRawToDataFile).
+def benchRecordViews(numGen=3000, numPass=10):
+    import os
+    import tempfile
+    import Diary
+    import GeneralFunctions
+    import LoadInitFiles
+    myDiary = Diary.Diary()
+    folder = tempfile.mkdtemp()
+    fileName = os.path.join(folder, "bench.raw")
+    writeSyntheticRaw(fileName, numGen*4)
+    with open(fileName, "r") as pf:
+        GeneralFunctions.skipNLines(pf, 3)
+        LoadInitFiles.loadBuses(pf, myDiary)
+        LoadInitFiles.loadLoads(pf, myDiary)
+        objects = LoadInitFiles.loadGens(pf, myDiary)
+    views = LoadInitFiles.loadRawViews(fileName, myDiary)[2]
+    print("Gen attribute reads (%d gens, %d passes)" % (len(objects), numPass))
+    print("  gens     firstPass  otherPasses")
+    for name, gens in [("objects", objects), ("views", views)]:
+        seconds = []
+        for p in range(0, numPass):
+            t0 = time.time()
+            for gen in gens:
+                gen.busNumber, gen.genID, gen.isInSvc, gen.PGen, gen.PMax, gen.PMin
+            seconds.append(time.time() - t0)
+        print("  %-7s  %9.4f  %11.4f" % (name, seconds[0], sum(seconds[1:])))
+    os.remove(fileName)
+    os.rmdir(folder)
+    myDiary.close()
+
+
+# Read a RAW file with the given reader and write its generic-case pyomo data
+# file into folder; run in a process of its own by benchRawToDataFile, it
+# returns the seconds taken and the peak RSS of the process in MB.
+def rawToDataFile(reader, rawFileName, folder):
+    import os
+    import resource
+    import Diary
+    import GeneralFunctions
+    import GeneratePyomoDataFiles
+    import LoadInitFiles
+    import RawGenericModel
+    os.chdir(folder)
+    myDiary = Diary.Diary()
+    t0 = time.time()
+    if reader == "objects":
+        with open(rawFileName, "r") as pf:
+            GeneralFunctions.skipNLines(pf, 3)
+            buses = LoadInitFiles.loadBuses(pf, myDiary)
+            loads = LoadInitFiles.loadLoads(pf, myDiary)
+            gens = LoadInitFiles.loadGens(pf, myDiary)
+            branches = LoadInitFiles.loadBranches(pf, myDiary)
+    else:
+        buses, loads, gens, branches = LoadInitFiles.loadRawViews(rawFileName, myDiary)
+    genericModel = RawGenericModel.GenericModel(buses, loads, gens, branches, [], [], [])
+    dataWriter = GeneratePyomoDataFiles.generatePyomoFiles(True, myDiary)
+    dataWriter.setGenericCaseModel(genericModel)
+    dataWriter.setNeedHeading(True)
+    dataWriter.writeAllDataGC()
+    seconds = time.time() - t0
+    myDiary.close()
+    for fileName in os.listdir(folder):
+        if fileName.startswith("Log_"):
+            os.remove(fileName)
+    return [seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1e3]
+
+
+# //---  Read me  ---//
+# Time and peak RSS of the whole data generation of a generic case, from a
+# synthetic RAW file of numBus buses to the pyomo data file, with the objects
+# of loadBuses/loadLoads/loadGens/loadBranches and with the views of
+# loadRawViews. Each run is a fresh process, so the peak RSS covers the RAW
+# records and every read GeneratePyomoDataFiles makes of them.
+def benchRawToDataFile(busSizes=(20000, 80000)):
+    import os
+    import tempfile
+    import multiprocessing
+    print("RAW file to generic-case pyomo data file")
+    print("    numBus   reader  seconds  peakRSSMB")
+    folder = tempfile.mkdtemp()
+    rawFileName = os.path.join(folder, "bench.raw")
+    pool = multiprocessing.get_context("spawn")
+    for numBus in busSizes:
+        writeSyntheticRaw(rawFileName, numBus)
+        for reader in ["objects", "views"]:
+            with pool.Pool(1, maxtasksperchild=1) as workers:
+                seconds, peak = workers.apply(rawToDataFile, (reader, rawFileName, folder))
+            print("  %8d  %7s  %7.3f  %9.1f" % (numBus, reader, seconds, peak))
+    for fileName in os.listdir(folder):
+        os.remove(os.path.join(folder, fileName))
+    os.rmdir(folder)
+
+
+# //---  Read me  ---//
+# Build a synthetic real-case model with the data used by
+# GeneratePyomoDataFiles.collectConstraintsData: numBranch named branches
+# (one in ten also with a transformer name), numGen named gens and
+# numFlowgate flowgates, each with one AOL constraint of numPnode pnodes.
+def makeConstraintsCase(numBranch, numFlowgate, numGen, numPnode, seed=42):
+    import random
+    import RawGenericModel
+    import RawEMSMarketModel
+    rng = random.Random(seed)
+    branches = []
+    for idx in range(0, numBranch):
+        branch = RawGenericModel.Branch(idx+1, idx+2, "'1 '", 1, 0.1, 100.0, 110.0, 120.0)
+        branch.setComment("LINE " + str(idx+1))
+        if idx%10 == 0:
+            branch.setXfmComment("XFM " + str(idx+1))
+        else:
+            branch.setXfmComment("")
+        branches.append(branch)
+    gens = []
+    for idx in range(0, numGen):
+        gen = RawGenericModel.Gen(idx+1, "'1 '", 1, 10.0, 100.0, 0.0)
+        gen.setComment("UNIT " + str(idx+1))
+        gens.append(gen)
+    flowgates = []
+    constDFaxAOL = []
+    for idx in range(0, numFlowgate):
+        monitored = branches[rng.randrange(numBranch)]
+        constraintNames = ["MISSING " + str(idx), monitored.xfmcomment or monitored.comment]
+        if idx%4 == 0:
+            flowgate = RawEMSMarketModel.Flowgate(idx+1, "FG " + str(idx+1), "", "Actual", constraintNames, [], [])
+        else:
+            outage = branches[rng.randrange(numBranch)]
+            flowgate = RawEMSMarketModel.Flowgate(idx+1, "FG " + str(idx+1), "", "Contingency", constraintNames, \
+                                                  [outage.comment], ["branch"])
+        flowgate.setLimitData([100.0])
+        flowgates.append(flowgate)
+        dfaxConst = RawEMSMarketModel.DFAX("FG " + str(numFlowgate - idx))
+        pnodes = rng.sample(range(1, 2*numGen+1), numPnode)  # half of the pnodes are not gens
+        dfaxConst.setPnodeNames(["UNIT " + str(n) for n in pnodes])
+        dfaxConst.setDFAXes([rng.uniform(-0.5, 0.5) for n in pnodes])
+        constDFaxAOL.append(dfaxConst)
+    aolDFAX = RawEMSMarketModel.DFAXList(None, None)
+    aolDFAX.setDFAXs(constDFaxAOL)
+    emsMarketModel = RawEMSMarketModel.EMSMarketModel([], [], gens, branches, flowgates, aolDFAX, None, [], [], [], [])
+    emsMarketModel.setIdxPeriod(0)
+    return emsMarketModel
+
+
+# //---  Read me  ---//
+# Reference for benchConstraintsData: the contingency, constraint and DFax
+# rows of collectConstraintsData as they were built before the name indexes,
+# by a linear scan of the flowgates, branches and pnode names per lookup.
+def scanConstraintsData(emsMarketModel):
+    def findIdx(items, name, attrs):
+        for idx, item in enumerate(items):
+            for attr in attrs:
+                if name == getattr(item, attr):
+                    return idx
+        return -1
+    flowgates = emsMarketModel.flowgates
+    gens = emsMarketModel.gens
+    branches = emsMarketModel.branches
+    contingencyRows = []
+    constraintRows = []
+    dfaxRows = []
+    for dfaxConst in emsMarketModel.aolDFAX.constDFaxAOL:
+        idx = findIdx(flowgates, dfaxConst.constraintName, ['fgName'])
+        if idx == -1:
+            continue
+        flowgate = flowgates[idx]
+        idxConstraint = -1
+        for constraintName in flowgate.constraintNames:
+            idx = findIdx(branches, constraintName, ['comment', 'xfmcomment'])
+            if idx != -1:
+                idxConstraint = idx + 1
+                break
+        if idxConstraint == -1:
+            continue
+        idxCtcgy = len(constraintRows) + 1
+        constraintRows.append([idxCtcgy, idxCtcgy, idxConstraint, flowgate.limitData[emsMarketModel.idxPeriod]])
+        if flowgate.constraintType == "Actual":
+            contingencyRows.append([len(contingencyRows)+1, idxCtcgy, -2])
+        else:
+            for contingencyName in flowgate.contingencyNames:
+                idx = findIdx(branches, contingencyName, ['comment', 'xfmcomment'])
+                if idx != -1:
+                    idx = idx + 1
+                contingencyRows.append([len(contingencyRows)+1, idxCtcgy, idx])
+        pnodeNames = dfaxConst.PnodeNames
+        for idxGen, gen in enumerate(gens):
+            idx = -1
+            for idxPnode, pnodeName in enumerate(pnodeNames):
+                if pnodeName == gen.comment:
+                    idx = idxPnode
+                    break
+            if idx != -1 and dfaxConst.dFaxes[idx] != 0:
+                dfaxRows.append([len(dfaxRows)+1, idxGen+1, idxCtcgy, dfaxConst.dFaxes[idx]])
+    return [contingencyRows, constraintRows, dfaxRows]
+
+
+# //---  Read me  ---//
+# Time of GeneratePyomoDataFiles.collectConstraintsData (flowgate, branch and
+# pnode matching of writeConstraintsData) on a synthetic real case, against
+# the linear scans of scanConstraintsData; the rows must be the same.
+def benchConstraintsData(numBranch=20000, numFlowgate=3000, numGen=1000, numPnode=50):
+    import Diary
+    import GeneratePyomoDataFiles
+    myDiary = Diary.Diary()
+    emsMarketModel = makeConstraintsCase(numBranch, numFlowgate, numGen, numPnode)
+    dataWriter = GeneratePyomoDataFiles.generatePyomoFiles(False, myDiary)
+    dataWriter.setRealCaseModel(emsMarketModel)
+    t0 = time.time()
+    constraintTables = dataWriter.collectConstraintsData()
+    secondsIndex = time.time() - t0
+    t0 = time.time()
+    scanTables = scanConstraintsData(emsMarketModel)
+    secondsScan = time.time() - t0
+    assert scanTables == [constraintTables[0], constraintTables[1], constraintTables[3]]
+    print("Constraint data of %d branches, %d flowgates, %d gens, %d pnodes per constraint" % (numBranch, numFlowgate, numGen, numPnode))
+    print("  scanSeconds  indexSeconds  constraints  contingencies  nonzeroDFax")
+    print("  %11.2f  %12.2f  %11d  %13d  %11d" % (secondsScan, secondsIndex, len(constraintTables[1]), len(constraintTables[0]), len(constraintTables[3])))
+    myDiary.close()
+    return constraintTables
+
+
+# //---  Read me  ---//
+# Build a synthetic real-case model with the market data used by
+# GeneratePyomoDataFiles.collectGenRCData: numUnit units (four per station,
+# one in twenty outside PJM) with one to three bid schedules each, 24 hourly
+# items and a status string per schedule, and numGen gens whose comments name
+# a unit (one in ten names no unit).
+def makeUnitMatchingCase(numGen, numUnit, seed=42):
+    import random
+    import GeneralClasses
+    import RawGenericModel
+    import RawEMSMarketModel
+    rng = random.Random(seed)
+    voltages = ["13.8", "18", "22", "138", "230"]
+    units = []
+    for idx in range(0, numUnit):
+        unit = RawEMSMarketModel.UnitIdentification(1000 + idx)
+        pool = "PJM" if idx%20 != 0 else "NYISO"
+        unit.setInfo(pool, "STA" + str(idx//4), voltages[idx%5], "G" + str(idx%4 + 1))
+        units.append(unit)
+    gens = []
+    for idx in range(0, numGen):
+        gen = RawGenericModel.Gen(idx+1, "'1 '", 1, rng.uniform(0.0, 100.0), 150.0, 10.0)
+        unit = units[rng.randrange(numUnit)]
+        station = unit.station if idx%10 != 0 else "NOSTA" + str(idx)
+        gen.setComment(station + " " + unit.voltage + "KV " + unit.unitName)
+        gens.append(gen)
+    date = GeneralClasses.Date(4, 9, 2016)
+    bids = []
+    hourlyData = []
+    scheduleStatus = []
+    energyOffers = []
+    multiRampRates = []
+    spinRampRates = []
+    scheduleID = 0
+    for unit in units:
+        for idxSchedule in range(0, rng.randint(1, 3)):
+            scheduleID = scheduleID + 1
+            bid = RawEMSMarketModel.Bid(scheduleID, unit.unitID, scheduleID)
+            bid.setColdNotificationTime(rng.choice([0.0, 0.1, 2.0]))
+            bid.setColdStartupTime(rng.choice([0.0, 0.05, 1.0]))
+            bid.setEconMax(150.0)
+            bid.setEconMin(10.0)
+            bid.setDefaultRampRate(rng.uniform(1.0, 10.0))
+            bid.setUseBidSlope(rng.randint(0, 1))
+            bid.setSpinOfferPrice(rng.uniform(0.0, 5.0))
+            bid.setRegOfferPrice(rng.uniform(0.0, 5.0))
+            bid.setLocaleID(1)
+            bids.append(bid)
+            status = RawEMSMarketModel.RtUnitStatusFix(scheduleID, unit.unitID, scheduleID)
+            status.setScheduleSt("".join(rng.choice("AAAU") for k in range(0, 288)))
+            scheduleStatus.append(status)
+            for hour in rng.sample(range(0, 24), 24):
+                hrItem = RawEMSMarketModel.HrEconMinMax(scheduleID, unit.unitID, scheduleID)
+                hrItem.setEconMin(10.0)
+                hrItem.setEconMax(rng.uniform(100.0, 150.0))
+                hrItem.setRegUnitStatus(rng.randint(0, 1))
+                hrItem.setSpinStatus(rng.randint(0, 1))
+                hrItem.setRegOfferMW(rng.uniform(0.0, 10.0))
+                hrItem.setSpinOfferMW(rng.uniform(0.0, 10.0))
+                hrItem.setEffectiveHour([date, GeneralClasses.Time(hour, 0, 0)])
+                hourlyData.append(hrItem)
+            energyOffer = RawEMSMarketModel.CostcurveEnergy(scheduleID, unit.unitID, scheduleID)
+            energyOffer.setOffers([50.0, 100.0, 150.0], [20.0, 25.0, 30.0])
+            energyOffers.append(energyOffer)
+        multiRamp = RawEMSMarketModel.CostcurveMultiRamp(unit.unitID)
+        multiRamp.setOffers([50.0, 150.0], [2.0, 3.0])
+        multiRampRates.append(multiRamp)
+        spinRamp = RawEMSMarketModel.CostcurveSpinRamp(unit.unitID)
+        spinRamp.setOffers([50.0, 150.0], [1.0, 1.5])
+        spinRampRates.append(spinRamp)
+    emsMarketModel = RawEMSMarketModel.EMSMarketModel([], [], gens, [], [], None, None, bids, hourlyData, scheduleStatus, \
+                                                      [energyOffers, multiRampRates, spinRampRates])
+    emsMarketModel.setUnits(units)
+    emsMarketModel.setDate(date)
+    emsMarketModel.setTime(GeneralClasses.Time(14, 7, 0))
+    emsMarketModel.setIdxPeriod(GeneralClasses.Time(14, 7, 0).getIdxPeriod(5))
+    return emsMarketModel
+
+
+# //---  Read me  ---//
+# Time of GeneratePyomoDataFiles.collectGenRCData, i.e. matching the raw gens
+# to the market units, bid schedules and hourly data, on a synthetic real case.
+def benchUnitMatching(numGen=5000, numUnit=10000):
+    import Diary
+    import GeneratePyomoDataFiles
+    myDiary = Diary.Diary()
+    emsMarketModel = makeUnitMatchingCase(numGen, numUnit)
+    dataWriter = GeneratePyomoDataFiles.generatePyomoFiles(False, myDiary)
+    dataWriter.setRealCaseModel(emsMarketModel)
+    dataWriter.setBlockPrice(1.0)
+    t0 = time.time()
+    genTables = dataWriter.collectGenRCData()
+    seconds = time.time() - t0
+    numMatched = len([gen for gen in emsMarketModel.gens if gen.unitID != -1])
+    print("Unit matching of %d gens, %d units, %d bids, %d hourly items" % (numGen, numUnit, len(emsMarketModel.bidData), len(emsMarketModel.hourlyData)))
+    print("  seconds  matched  genCostRows")
+    print("  %7.3f  %7d  %11d" % (seconds, numMatched, len(genTables[1])))
+    myDiary.close()
+    return genTables
+
+
+if __name__ == "__main__":
+    benchModelConstruction()
+    benchMatrixAssembly()
+    benchCompactContingency()
+    benchPersistentSolver()
+    benchScenarioOverlay()
+    benchBendersDecomposition()
+    benchScenarioReduction()
+    benchDFaxWriter()
+    benchRawTokenizer()
+    benchRawReader()
+    benchRecordViews()
+    benchRawToDataFile()
+    benchConstraintsData()
+    benchUnitMatching()
@@ -0,0 +1,257 @@
+"""
+Benders decomposition of the generic-case SCED: the master problem is the
+base case (no contingency), every enabled contingency is a subproblem of its
+own that checks the post-contingency response to the master dispatch and
+returns a feasibility or optimality cut on it. The subproblems are spread
+over a set of worker processes that keep their instances between iterations.
+
+Website: https://rpglab.github.io/resources/RT-SCED_Python/
+"""
+
+import time
+from pyomo.environ import Set, Param, Var, Constraint, ConstraintList, Objective, Suffix, NonNegativeReals, value
+from pyomo.core.expr.visitor import identify_variables
+
+import PyomoCaseData
+import PersistentSolver
+import WorkerPool
+from SCEDGenericCaseModel import model as SCEDModel
+
+
+# Base-case variables used by the contingency constraints; they are decided by
+# the master problem and fixed in the subproblems.
+couplingVarNames = ['pg', 'pk', 'pgmaxSlackVar', 'pgminSlackVar', 'spinRampSlackVar', 'brcFlowLimitSlackVar', 'interfaceLimiteSlackVar']
+
+# Constraints of the post-contingency state
+contingencyConstNames = ['nodeBalConst_Ctgcy', 'loadTotalConst_Ctgcy', 'fixOfflineAndNegativeLoad_Ctgcy',
+                         'brcFlowCalcConst_Ctgcy', 'brcFlowLimit_Ctgcy', 'brcFlowLimit_2_Ctgcy', 'brcFlowLimit_Compact',
+                         'brcFlowLimit_2_Compact', 'genMaxLimitConst_Ctgcy', 'genMinLimitConst_Ctgcy', 'genCostCurveFlagConst_Ctgcy',
+                         'spinRampLimit_Ctgcy', 'spinRampLimit_2_Ctgcy', 'interfaceLimitConst_Ctgcy', 'calcInterfaceTotalFlowConst_Ctgcy']
+
+
+# Case data with only the given contingencies (and their contingency lines)
+def getContingencyCaseData(data, ctgcys):
+    case = dict(data[None])
+    lines = [cL for cL in PyomoCaseData.getSet(case, "CONTINGENCYLINE") if case["Contingency_index"][cL] in ctgcys]
+    case["CONTINGENCY"] = {None: list(ctgcys)}
+    case["Contingency_isEnabled"] = dict((c, case["Contingency_isEnabled"][c]) for c in ctgcys)
+    case["CONTINGENCYLINE"] = {None: lines}
+    case["Contingency_index"] = dict((cL, case["Contingency_index"][cL]) for cL in lines)
+    case["Contingency_branchIdx"] = dict((cL, case["Contingency_branchIdx"][cL]) for cL in lines)
+    return {None: case}
+
+
+def getEnabledContingencies(data):
+    case = data[None]
+    return [c for c in PyomoCaseData.getSet(case, "CONTINGENCY") if case["Contingency_isEnabled"][c] == 1]
+
+
+# //---  Read me  ---//
+# Turn an instance holding a single contingency c into its Benders subproblem:
+#   - only the contingency constraints stay active;
+#   - BEN_VAR: the coupling variables used by them, tied to the master values
+#     by linkConst[v]: x[v] + benPlus[v] - benMinus[v] == benXhat[v];
+#   - benObjective = benCostWeight*(load shed cost of c)
+#                    + benElasticWeight*sum of (benPlus + benMinus).
+# The elastic variables keep the subproblem feasible for any master dispatch;
+# the duals of linkConst give the slope of the cuts.
+def addBendersSubproblemTerms(instance, c):
+    for con in instance.component_objects(Constraint, active=True):
+        if con.local_name not in contingencyConstNames:
+            con.deactivate()
+    used = set()
+    for con in instance.component_data_objects(Constraint, active=True):
+        for var in identify_variables(con.body, include_fixed=False):
+            used.add(id(var))
+    benVars = []
+    for name in couplingVarNames:
+        component = getattr(instance, name)
+        for idx in component:
+            if id(component[idx]) in used:
+                benVars.append((name, idx))
+    instance.BEN_VAR = Set(dimen=2, initialize=benVars)
+    instance.benXhat = Param(instance.BEN_VAR, mutable=True, initialize=0)
+    instance.benCostWeight = Param(mutable=True, initialize=1)
+    instance.benElasticWeight = Param(mutable=True, initialize=0)
+    instance.benPlus = Var(instance.BEN_VAR, within=NonNegativeReals, initialize=0)
+    instance.benMinus = Var(instance.BEN_VAR, within=NonNegativeReals, initialize=0)
+
+    def const_Link(instance, name, idx):
+        return getattr(instance, name)[idx] + instance.benPlus[name, idx] - instance.benMinus[name, idx] == instance.benXhat[name, idx]
+    instance.linkConst = Constraint(instance.BEN_VAR, rule=const_Link)
+
+    def benObj(instance):
+        recourse = instance.BaseMVA*instance.LoadShed_c_penalty*sum(instance.loadShed_c[c, d] for d in instance.LOAD
+                                                                      if c in instance.CONTINGENCY_FULL)
+        elastic = sum(instance.benPlus[v] + instance.benMinus[v] for v in instance.BEN_VAR)
+        return instance.benCostWeight*recourse + instance.benElasticWeight*elastic
+    instance.minimizeCost.deactivate()
+    instance.benObjective = Objective(rule=benObj)
+    instance.dual = Suffix(direction=Suffix.IMPORT)
+
+
+# Contingency subproblems of one worker, each with its own instance and
+# persistent solver session, built on first use.
+class contingencySubproblems:
+    def __init__(self, caseData, settings):
+        self.caseData = caseData  # {contingency: data}
+        self.settings = settings
+        self.instances = {}
+        self.sessions = {}
+
+    def getInstance(self, c):
+        if c not in self.instances:
+            instance = SCEDModel.create_instance(data=self.caseData[c])
+            addBendersSubproblemTerms(instance, c)
+            self.instances[c] = instance
+            self.sessions[c] = PersistentSolver.PersistentSCEDSession(instance, self.settings["solverName"], None,
+                                                                      self.settings["timeLimit"], self.settings["optGap"])
+        return self.instances[c]
+
+    def solveWithWeights(self, c, costWeight, elasticWeight):
+        instance = self.instances[c]
+        instance.benCostWeight = costWeight
+        instance.benElasticWeight = elasticWeight
+        # the legacy persistent and shell solvers only return the duals when asked
+        results = self.sessions[c].solve(suffixes=['dual'])
+        status = str(results.solver.termination_condition)
+        if not status.startswith("optimal"):
+            raise RuntimeError("Benders subproblem of contingency " + str(c) + ": " + status)
+        duals = dict((v, instance.dual[instance.linkConst[v]]) for v in instance.BEN_VAR)
+        return [value(instance.benObjective), duals]
+
+    # Solve every contingency at the master values xhat; returns
+    # {contingency: [cost, {v: dual}, deviation, {v: dual}, seconds]}: the
+    # (elastic) load shed cost and its duals and, if contingency c is not
+    # feasible at xhat, the smallest deviation from xhat and its duals
+    # (deviation is None otherwise).
+    def solve(self, xhat, elasticPenalty, tol):
+        cuts = {}
+        for c in self.caseData:
+            t0 = time.time()
+            instance = self.getInstance(c)
+            for v in instance.BEN_VAR:
+                instance.benXhat[v] = xhat.get(v, 0.0)
+            cost, costDuals = self.solveWithWeights(c, 1, elasticPenalty)
+            elastic = sum(value(instance.benPlus[v]) + value(instance.benMinus[v]) for v in instance.BEN_VAR)
+            if elastic <= tol:
+                cuts[c] = [cost, costDuals, None, None, time.time() - t0]
+            else:
+                deviation, deviationDuals = self.solveWithWeights(c, 0, 1)
+                cuts[c] = [cost, costDuals, deviation, deviationDuals, time.time() - t0]
+        return cuts
+
+
+# //---  Read me  ---//
+# Multi-cut Benders decomposition on the coupling variables (couplingVarNames):
+#   master: base case + theta[c] >= 0 per enabled contingency, objective
+#           minimizeCost + sum of theta[c], plus the cuts so far;
+#   subproblem c at the master values xhat:
+#     optimality cut   theta[c] >= Q_c(xhat) + sum of dual[v]*(x[v] - xhat[v])
+#     feasibility cut  F_c(xhat) + sum of dual[v]*(x[v] - xhat[v]) <= 0
+#   where Q_c is the load shed cost of contingency c, plus elasticPenalty times
+#   the deviation from xhat if c is not feasible at xhat (a lower estimate of
+#   the true cost, so the cut stays valid and steers the master away from
+#   infeasible dispatches), and F_c the smallest such deviation; the
+#   feasibility cut is only added when F_c(xhat) > 0.
+# The lower bound is the master objective, the upper bound the base-case cost
+# of the master dispatch plus the subproblem costs (when all are feasible).
+# Each worker process owns a fixed set of contingencies, so the subproblems
+# stay in their solver and only benXhat changes between iterations; the
+# master is a persistent session that only receives the new cuts.
+class BendersDecomposition:
+    def __init__(self, caseData, paramManager, myDiary):
+        self.myDiary = myDiary
+        self.caseData = caseData
+        self.settings = {"solverName": paramManager.getSolverName(),
+                         "timeLimit": paramManager.getSolverTimLimit(),
+                         "optGap": paramManager.getSolverOptGap()}
+        self.ctgcys = getEnabledContingencies(caseData)
+        self.master = None
+        self.history = []
+
+    def buildMaster(self):
+        master = SCEDModel.create_instance(data=getContingencyCaseData(self.caseData, []))
+        master.BENDERS_CTGCY = Set(initialize=self.ctgcys)
+        master.bendersTheta = Var(master.BENDERS_CTGCY, within=NonNegativeReals, initialize=0)
+        master.bendersCuts = ConstraintList()
+
+        def bendersObj(master):
+            return master.minimizeCost.expr + sum(master.bendersTheta[c] for c in master.BENDERS_CTGCY)
+        master.minimizeCost.deactivate()
+        master.bendersObjective = Objective(rule=bendersObj)
+        self.master = master
+        return master
+
+    def getCouplingValues(self):
+        xhat = {}
+        for name in couplingVarNames:
+            component = getattr(self.master, name)
+            for idx in component:
+                xhat[name, idx] = component[idx].value or 0.0
+        return xhat
+
+    # cutValue + sum of duals[v]*(x[v] - xhat[v]) as an expression of the master variables
+    def getCutExpression(self, cutValue, duals, xhat, dualTol=1e-9):
+        expr = cutValue
+        for v in duals:
+            if abs(duals[v]) > dualTol:
+                expr = expr + duals[v]*(getattr(self.master, v[0])[v[1]] - xhat[v])
+        return expr
+
+    def run(self, jobs=1, maxIteration=100, tol=1e-6, elasticPenalty=1e7):
+        t0 = time.time()
+        self.history = []
+        self.buildMaster()
+        session = PersistentSolver.PersistentSCEDSession(self.master, self.settings["solverName"], None,
+                                                         self.settings["timeLimit"], self.settings["optGap"])
+        groups = WorkerPool.splitIntoGroups(dict((c, getContingencyCaseData(self.caseData, [c])) for c in self.ctgcys), jobs)
+        workers = WorkerPool.WorkerPool(contingencySubproblems, groups, self.settings)
+        self.myDiary.hotlineWithLogType(5, "Benders decomposition with " + str(len(self.ctgcys)) + " contingency subproblems, "
+                                        + str(jobs) + " job(s)")
+        upperBound = float("inf")
+        results = None
+        try:
+            for iteration in range(1, maxIteration+1):
+                t1 = time.time()
+                results = session.solve()
+                if not str(results.solver.termination_condition).startswith("optimal"):
+                    raise RuntimeError("Benders master problem: " + str(results.solver.termination_condition))
+                lowerBound = value(self.master.bendersObjective)
+                masterTime = time.time() - t1
+                t1 = time.time()
+                xhat = self.getCouplingValues()
+                cuts = workers.solve(lambda group: (xhat, elasticPenalty, tol))
+                subTime = time.time() - t1
+                numOptimality = 0
+                numFeasibility = 0
+                newCuts = []
+                for c in self.ctgcys:
+                    cost, costDuals, deviation, deviationDuals = cuts[c][:4]
+                    if cost > value(self.master.bendersTheta[c]) + tol*max(1.0, abs(cost)):
+                        numOptimality = numOptimality + 1
+                        expr = self.getCutExpression(cost, costDuals, xhat)
+                        newCuts.append(self.master.bendersCuts.add(self.master.bendersTheta[c] >= expr))
+                    if deviation is not None:
+                        numFeasibility = numFeasibility + 1
+                        expr = self.getCutExpression(deviation, deviationDuals, xhat)
+                        newCuts.append(self.master.bendersCuts.add(expr <= 0))
+                if numFeasibility == 0:
+                    upperBound = min(upperBound, value(self.master.minimizeCost) + sum(cuts[c][0] for c in self.ctgcys))
+                gap = (upperBound - lowerBound)/max(1.0, abs(upperBound))
+                self.history.append([iteration, lowerBound, upperBound, gap, numOptimality, numFeasibility, masterTime, subTime])
+                self.myDiary.hotlineWithLogType(6, "Benders iteration " + str(iteration) + ": lower bound " + format(lowerBound, '.4f')
+                                                + ", upper bound " + format(upperBound, '.4f') + ", gap " + format(gap, '.2e') + ", "
+                                                + str(numOptimality) + " optimality and " + str(numFeasibility) + " feasibility cuts, master "
+                                                + format(masterTime, '.3f') + "s, subproblems " + format(subTime, '.3f') + "s")
+                if len(newCuts) == 0 or gap <= tol:
+                    self.myDiary.hotlineWithLogType(5, "Benders decomposition converged in " + str(iteration) + " iterations, "
+                                                    + format(time.time() - t0, '.2f') + " seconds")
+                    break
+                session.addConstraints(newCuts)
+            else:
+                self.myDiary.hotlineWithLogType(1, "Benders decomposition stopped after " + str(maxIteration)
+                                                + " iterations without convergence")
+        finally:
+            workers.close()
+        return results
@@ -0,0 +1,93 @@
+"""
+Iterative contingency screening (lazy constraint generation) for the compact
+contingency formulation of SCEDGenericCaseModel.
+
+Website: https://rpglab.github.io/resources/RT-SCED_Python/
+"""
+
+import time
+import numpy as np
+from pyomo.environ import value
+
+import SCEDGenericCaseModel
+
+
+# Base-case flows of all branches at the current dispatch, in the order of the
+# rows of the compact contingency factors
+def getBaseFlows(instance):
+    return np.array([instance.pk[k].value or 0.0 for k in instance.BRANCH])  # None if not used by any constraint
+
+
+# DC post-contingency flows of all branches for contingency c at the current
+# dispatch; baseFlows from getBaseFlows can be shared by the contingencies
+def calcContingencyFlows(instance, c, baseFlows=None):
+    lodf, outaged, brcPos = instance.ctgcyFlowFactors[c]
+    if baseFlows is None:
+        baseFlows = getBaseFlows(instance)
+    return baseFlows + lodf @ baseFlows[[brcPos[k] for k in outaged]]
+
+
+# (contingency, branch) pairs whose post-contingency flow exceeds rateC (plus
+# the branch slack) and that do not yet have a flow limit in the instance
+def findViolations(instance, tol=1e-6):
+    violations = []
+    baseFlows = getBaseFlows(instance)
+    for c in instance.CONTINGENCY_COMPACT:
+        if c not in instance.ctgcyFlowFactors:
+            continue
+        flows = calcContingencyFlows(instance, c, baseFlows)
+        brcPos = instance.ctgcyFlowFactors[c][2]
+        outaged = instance.outageBranchesOfCtgcy.get(c, [])
+        for k in instance.BRANCH:
+            if instance.Branch_isInSvc[k] == 0 or k in outaged or (c, k) in instance.CTGCY_MONITOR:
+                continue
+            limit = value(instance.Branch_rateC[k]) + value(instance.brcFlowLimitSlackVar[k])
+            if abs(flows[brcPos[k]]) > limit + tol:
+                violations.append((c, k))
+    return violations
+
+
+# Add the post-contingency flow limits of the given (contingency, branch) pairs,
+# the new constraints are returned
+def addFlowLimits(instance, pairs):
+    constraints = []
+    for c, k in pairs:
+        if (c, k) not in instance.CTGCY_FLOW:
+            instance.CTGCY_FLOW.add((c, k))
+            instance.ctgcyFlow[c, k] = SCEDGenericCaseModel.expr_CtgcyFlow(instance, c, k)
+        instance.CTGCY_MONITOR.add((c, k))
+        instance.brcFlowLimit_Compact[c, k] = SCEDGenericCaseModel.const_BrcFlowLimit_Compact(instance, c, k)
+        instance.brcFlowLimit_2_Compact[c, k] = SCEDGenericCaseModel.const_BrcFlowLimit_2_Compact(instance, c, k)
+        constraints.append(instance.brcFlowLimit_Compact[c, k])
+        constraints.append(instance.brcFlowLimit_2_Compact[c, k])
+    return constraints
+
+
+# //---  Read me  ---//
+# Solve the base case (plus the limits already in CTGCY_MONITOR), check the
+# post-contingency flows of all contingencies with the solved dispatch, add
+# the violated limits and re-solve until no violation remains. solveArgs are
+# passed to opt.solve; the results of the last solve are returned. opt may be
+# a PersistentSCEDSession, which is then told about the added constraints.
+def solveWithScreening(instance, opt, myDiary, maxIteration=20, tol=1e-6, **solveArgs):
+    results = None
+    for iteration in range(1, maxIteration+1):
+        t0 = time.time()
+        results = opt.solve(instance, **solveArgs)
+        solveTime = time.time() - t0
+        t0 = time.time()
+        violations = findViolations(instance, tol)
+        checkTime = time.time() - t0
+        myDiary.hotlineWithLogType(6, "Contingency screening iteration " + str(iteration) + ": solve time " + format(solveTime, '.3f')
+                                   + "s, check time " + format(checkTime, '.3f') + "s, " + str(len(violations))
+                                   + " violated post-contingency flow limits added")
+        if len(violations) == 0:
+            myDiary.hotlineWithLogType(5, "Contingency screening converged, " + str(len(instance.CTGCY_MONITOR))
+                                       + " post-contingency flow limits are in the model")
+            return results
+        constraints = addFlowLimits(instance, violations)
+        if hasattr(opt, 'addConstraints'):
+            opt.addConstraints(constraints)
+    myDiary.hotlineWithLogType(1, "Contingency screening stopped after " + str(maxIteration)
+                               + " iterations with violated post-contingency flow limits remaining")
+    return results
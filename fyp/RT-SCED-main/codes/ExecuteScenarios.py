@@ -1,47 +1,83 @@
-import subprocess
+"""
+Run the generic-case SCED for a set of scenario files (by default the 25
+reduced scenarios). The base case is loaded once and the scenarios are solved
+in this process or in a pool of N worker processes. With --stochastic, they
+are solved together as one two-stage stochastic SCED instead (StochasticSCED),
+weighted by the populations of their KMeans clusters, either as one LP or by
+progressive hedging (--method ph) over N worker processes. With --store, the
+scenarios are read from a ScenarioStore folder (by scenario id, all of them
+if no id is given) instead of scenario files.
+
+How to run: go to the program directory, and type down the below command
+    python ExecuteScenarios.py [--jobs N] [scenario files ...]
+    python ExecuteScenarios.py --stochastic [--generated generated_scenarios.dat] [scenario files ...]
+    python ExecuteScenarios.py --stochastic --method ph [--jobs N] [--rho RHO] [scenario files ...]
+    python ExecuteScenarios.py --store scenario_store/reduced [--stochastic] [--jobs N] [scenario ids ...]
+"""
+
+import argparse
 import os
 
-# Output folder for results
-output_folder = "scenario_results"
-os.makedirs(output_folder, exist_ok=True)
-
-# Get all the reduced scenario files
-reduced_scenario_files = [f"reduced_scenario_{i+1}.dat" for i in range(25)]
-
-# Store results
-results = []
-
-# Loop through each reduced scenario file
-for scenario_idx, scenario_file in enumerate(reduced_scenario_files, start=1):
-    print(f"Processing {scenario_file}...")
-
-    # Create a sub-folder for each scenario to store the results
-    scenario_folder = os.path.join(output_folder, f"scenario_{scenario_idx}")
-    os.makedirs(scenario_folder, exist_ok=True)
-
-    # Run the SCED model using subprocess
-    try:
-        # Run the simulation with the corresponding scenario file
-        subprocess.run(
-            ["python", "RunSCEDGenericCaseModel.py", scenario_file],
-            check=True,
-            capture_output=True,
-        )
-
-        # Save results uniquely inside the scenario-specific folder
-        result_file = os.path.join(scenario_folder, f"results_scenario_{scenario_idx}.txt")
-        if os.path.exists("results.txt"):
-            os.rename("results.txt", result_file)
-        print(f"Results for scenario {scenario_idx} saved to {result_file}")
-        results.append(f"Scenario {scenario_idx}: Success")
-
-    except subprocess.CalledProcessError as e:
-        print(f"Error running SCED for scenario {scenario_idx}: {e}")
-        results.append(f"Scenario {scenario_idx}: Failed")
-
-# Write all results to a consolidated results file inside the main output folder
-with open(os.path.join(output_folder, "scenario_results_summary.txt"), "w") as summary_file:
-    for result in results:
-        summary_file.write(result + "\n")
-
-print("All scenarios processed.")
+import Diary
+import ParamManager
+import ScenarioRunner
+import ScenarioStore
+import StochasticSCED
+import ProgressiveHedging
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the generic-case SCED for a set of scenarios")
+    parser.add_argument("--jobs", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--stochastic", action="store_true", help="solve all scenarios as one two-stage stochastic SCED")
+    parser.add_argument("--method", choices=["extensive", "ph"], default="extensive",
+                        help="stochastic only: one extensive-form LP, or progressive hedging over --jobs worker processes")
+    parser.add_argument("--rho", type=float, default=10000.0, help="progressive hedging penalty, in objective units per per-unit MW")
+    parser.add_argument("--generated", default=None,
+                        help="generated scenarios whose nearest reduced scenario gives the cluster populations (stochastic only)")
+    parser.add_argument("--store", default=None, help="scenario store folder (see ScenarioStore.py); the scenarios are its ids")
+    parser.add_argument("scenarioFiles", nargs="*", default=[])
+    args = parser.parse_args()
+
+    store = None
+    if args.store is not None:
+        store = ScenarioStore.ScenarioStore(args.store)
+        if len(args.scenarioFiles) == 0:
+            args.scenarioFiles = list(store.ids)
+    elif len(args.scenarioFiles) == 0:
+        args.scenarioFiles = [f"reduced_scenario_{i+1}.dat" for i in range(25)]
+
+    # Output folder for results
+    output_folder = "scenario_results"
+    os.makedirs(output_folder, exist_ok=True)
+
+    myDiary = Diary.Diary()
+    paramManager = ParamManager.ParamManager('configure.txt', myDiary)
+
+    if args.stochastic:
+        stochastic = StochasticSCED.StochasticSCED(paramManager, myDiary)
+        if store is not None:
+            names, scenarios, probabilities = StochasticSCED.loadScenariosFromStore(store, myDiary, args.scenarioFiles)
+        else:
+            names, scenarios, probabilities = StochasticSCED.loadScenarios(args.scenarioFiles, myDiary, args.generated)
+        resultFile = os.path.join(output_folder, "stochastic_results.txt")
+        if args.method == "ph":
+            ph = ProgressiveHedging.ProgressiveHedging(stochastic, myDiary)
+            ph.run(names, scenarios, probabilities, args.jobs, args.rho)
+            ph.writeResults(resultFile)
+        else:
+            stochastic.build(names, scenarios, probabilities)
+            stochastic.solve()
+            stochastic.writeResults(resultFile)
+        print("Stochastic SCED solved, results are in " + resultFile)
+    else:
+        runner = ScenarioRunner.ScenarioRunner(paramManager, myDiary)
+        rows = runner.run(args.scenarioFiles, args.jobs, store)
+
+        # Write all results to a consolidated results file inside the main output folder
+        summaryFile = os.path.join(output_folder, "scenario_results_summary.txt")
+        runner.writeTable(rows, summaryFile)
+        for row in rows:
+            print(f"{row['scenario']}: {row['status']}, objective {row['objective']}")
+        print("All scenarios processed, results are in " + summaryFile)
+    myDiary.close()
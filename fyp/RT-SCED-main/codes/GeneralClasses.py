@@ -36,8 +36,12 @@ def isSameDate(date1, date2):
 
 # return how many hours away between two times
 def calcDiffHours(date1, hr1, date2, hr2):
-    diffHr = (date1.year - date2.year)*365*24  # TODO: a year may have 366 days, however, for this sced tool, that case may never occur.
-    diffHr = diffHr + (date1.month - date2.month)*30*24 # TODO: THIS IS JUST a roughly estimation. Again, for this sced tool, it is good enough.
-    diffHr = diffHr + (date1.day - date2.day)*24
-    diffHr = diffHr + hr1 - hr2
-    return abs(diffHr)
+    return abs(calcHourNumber(date1, hr1) - calcHourNumber(date2, hr2))
+
+# hours from the year 0 to a time, in the same rough calendar as calcDiffHours;
+# used to sort times, calcDiffHours is the difference of two hour numbers
+def calcHourNumber(date, hr):
+    hourNumber = date.year*365*24  # TODO: a year may have 366 days, however, for this sced tool, that case may never occur.
+    hourNumber = hourNumber + date.month*30*24 # TODO: THIS IS JUST a roughly estimation. Again, for this sced tool, it is good enough.
+    hourNumber = hourNumber + date.day*24
+    return hourNumber + hr
@@ -18,87 +18,37 @@ def skipNLines(f, num):
 # //---  Read me  ---//
 # Split a string based on delimiter (the input variable token), however, 
 # any delimiter inside a pair of single quotes or double quotes
-# will not be considered as a delimiter
+# will not be considered as a delimiter.
+# The string is cut at the quotes once, so the even parts are outside the
+# quotes and the odd parts inside; only the even parts are split by token,
+# which keeps the whole line in a single pass. A field with quotes is
+# returned whole, with its quotes and any text around them.
 def split(origStr, token, priorityToken):
     origStr = removeDoubleSlash(origStr)
     origStr = removeSpecialComments(origStr, "/*")
     origStr = origStr.replace("\"",priorityToken) # change double quotes to single quotes
-    multiElem = []
-    numPriorityToken = origStr.count(priorityToken)  # priorityToken is a single quote; it will be a problem if it can also be a double quote
-    #numPriorityToken = origStr.count('\'')
-    if numPriorityToken == 0:
-        # there might be a problem if the first character is a comma, 
-        # however, this kind of case does not seem to exist.
-        multiElem = origStr.split(token)  # token should be a comma in this program
-        return multiElem
-    if numPriorityToken%2 == 1:
+    parts = origStr.split(priorityToken)
+    if len(parts) == 1:
+        return origStr.split(token)  # token should be a comma in this program
+    if len(parts)%2 == 0:
         print ("Something is wrong in line: \n    " + origStr + \
                 "\n  the number of " + priorityToken + " should be even (paired).")
         raise SystemExit
-    idxPriorityToken = []
-    copyStr = origStr
-    idx = copyStr.find(priorityToken)
-    idxOrig = idx
-    while idx != -1:
-        idxPriorityToken.append(idxOrig)
-        copyStr = copyStr[(idx+1):]
-        if not copyStr:
-            break
-        idx = copyStr.find(priorityToken)
-        idxOrig += (idx+1)
-    
-    copyStr = origStr
-    idxToken = copyStr.find(token)
-    idxPreviousToken = -1
-    idx = 0
-    markLastIterPriorityToken = 0
-    while idxToken != -1:
-        if (idxToken < idxPriorityToken[idx]) or (idxToken > idxPriorityToken[idx+1]):
-            if markLastIterPriorityToken == 0:
-                multiElem.append(origStr[(idxPreviousToken+1):idxToken])
-            else:
-                markLastIterPriorityToken = 0
-            copyStr = copyStr[:idxToken] + 'A' + copyStr[(idxToken+1):]
-            idxPreviousToken = idxToken
-            idxToken = copyStr.find(token)
-            if (idxToken > idxPriorityToken[idx+1]):
-                idx = idx + 2
-                if idx == len(idxPriorityToken):
-                    multiElem.append(origStr[(idxPreviousToken+1):idxToken])
-                    if copyStr.rfind(token) < idxPriorityToken[idx-1]:
-                        break
-                    while (idxToken < idxPriorityToken[idx-1]):
-                        copyStr = copyStr[:idxToken] + 'A' + copyStr[(idxToken+1):]
-                        idxToken = copyStr.find(token)
-                    leftStr = origStr[(idxToken + 1):]
-                    elems = leftStr.split(token)
-                    multiElem.extend(elems)
-                    break
-        else:
-            multiElem.append(origStr[idxPriorityToken[idx]:(idxPriorityToken[idx+1]+1)])
-            markLastIterPriorityToken = 1
-            idx = idx + 2
-            if idx == len(idxPriorityToken):
-                if copyStr.rfind(token) < idxPriorityToken[idx-1]:
-                    break
-                while (idxToken < idxPriorityToken[idx-1]):
-                    copyStr = copyStr[:idxToken] + 'A' + copyStr[(idxToken+1):]
-                    idxToken = copyStr.find(token)
-                leftStr = origStr[(idxToken + 1):]
-                elems = leftStr.split(token)
-                #multiElem = multiElem + elems
-                multiElem.extend(elems)
-                break
-            else:
-                idxToken = copyStr.find(token)
-                while (idxToken < idxPriorityToken[idx-1]):
-                    #copyStr[idxToken] = 'A'
-                    copyStr = copyStr[:idxToken] + 'A' + copyStr[(idxToken+1):]
-                    idxToken = copyStr.find(token)
-    idxLastToken = origStr.rfind(token)
-    idxLastPriorityToken = origStr.rfind(priorityToken)
-    if (idxLastToken < idxLastPriorityToken):
-        multiElem.append(origStr[(idxLastToken+1):])
+    multiElem = []
+    chunks = []     # pieces of the current field, quoted pieces with their quotes
+    for idx, part in enumerate(parts):
+        if idx%2 == 1:
+            chunks.append(priorityToken + part + priorityToken)
+            continue
+        pieces = part.split(token)
+        if len(pieces) == 1:
+            chunks.append(part)
+            continue
+        chunks.append(pieces[0])
+        multiElem.append("".join(chunks))
+        multiElem.extend(pieces[1:-1])  # fields with no quote
+        chunks = [pieces[-1]]
+    multiElem.append("".join(chunks))
     return multiElem
 
 
@@ -140,11 +90,7 @@ def returnSpecialComments(str, sc):
 # Removes all trailing whitespace of each string;
 # the input variables strs should be a list of string variables.
 def strip(strs):
-    num = len(strs)
-    newStrs = []
-    for i in range(0, num):
-        newStrs.append(strs[i].strip())
-    return newStrs
+    return [elem.strip() for elem in strs]
    
 def getFloatNumbers(strs):
     floatNum = []
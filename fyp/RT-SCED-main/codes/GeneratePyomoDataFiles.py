@@ -8,6 +8,44 @@ Website: https://rpglab.github.io/resources/RT-SCED_Python/
 
 import os
 import math
+import bisect
+import itertools
+import RawGenericModel
+
+# Columns of each pyomo table (the index comes first in every row and is not listed);
+# shared by the .dat writers below and the in-memory dict-data builders.
+busColumns = ["Bus_number", "Bus_kv", "Bus_va", "Bus_area"]
+busFormats = ["%d", "%d", "%f", "%f", "%d"]
+loadColumns = ["Load_busNumber", "Load_id", "Load_isInSvc", "Load_pd"]
+loadFormats = ["%d", "%d", "%s", "%d", "%f"]
+genGCColumns = ["Gen_busNumber", "Gen_id", "Gen_isInSvc", "Gen_pgInit", "Gen_pgMax", "Gen_pgMin", \
+                "Gen_energyRamp", "Gen_spinRamp", "Gen_costCurveFlag"]
+genGCFormats = ["%d", "%d", "%s", "%d", "%f", "%f", "%f", "%f", "%f", "%d"]
+genRCColumns = ["Gen_busNumber", "Gen_id", "Gen_isInSvc", "Gen_pgInit", "Gen_pgMax", "Gen_pgMin", "Gen_hasMarketData", \
+                "Gen_useBidSlope", "Gen_costCurveSegmentNum", "Gen_energyRamp", "Gen_spinRamp", "Gen_regUnitStatus", \
+                "Gen_regOfferPrice", "Gen_regOfferMW", "Gen_spinUnitStatus", "Gen_spinOfferPrice", "Gen_spinOfferMW", \
+                "Gen_fastStartUnitFlag", "Gen_coldNotificationTime", "Gen_coldStartupTime", "Gen_area"]
+genRCFormats = ["%d", "%d", "%s", "%d", "%f", "%f", "%f", "%d", "%d", "%d", "%f", "%f", \
+                "%d", "%f", "%f", "%d", "%f", "%f", "%d", "%f", "%f", "%d"]
+genCostColumns = ["GenCost_genIdx", "GenCost_segmentIdx", "GenCost_segmentBreadth", "GenCost_segmentPrice"]
+genCostFormats = ["%d", "%d", "%d", "%f", "%f"]
+branchColumns = ["Branch_frmBusNumber", "Branch_toBusNumber", "Branch_id", "Branch_isInSvc", "Branch_r", "Branch_x", \
+                 "Branch_angle", "Branch_pkInit", "Branch_rateA", "Branch_rateB", "Branch_rateC"]
+branchFormats = ["%d", "%d", "%d", "%s", "%d", "%f", "%f", "%f", "%f", "%f", "%f", "%f"]
+reserveAreaColumns = ["ReserveArea_genArea", "ReserveArea_regulationReq", "ReserveArea_reqPenaltyPrice", "ReserveArea_spinReq", \
+                      "ReserveArea_spinPenaltyPrice", "ReserveArea_primaryReq", "ReserveArea_primaryPenaltyPrice"]
+reserveAreaFormats = ["%d", "%d", "%f", "%f", "%f", "%f", "%f", "%f"]
+contingencyRCColumns = ["Contingency_idx", "Contingency_branchIdx"]
+contingencyRCFormats = ["%d", "%d", "%d"]
+constraintColumns = ["Constraint_contingencyIdx", "Constraint_monitorBranchIdx", "Constraint_monitorBranchLimit"]
+constraintFormats = ["%d", "%d", "%d", "%f"]
+scenarioColumns = ["isBaseCase"]
+scenarioFormats = ["%d", "%d"]
+dfaxColumns = ["DFax_genIdx", "DFax_constraintIdx", "DFax_value"]
+dfaxFormats = ["%d", "%d", "%d", "%f"]
+
+# Rows formatted into one buffer by writeRows
+rowsPerWrite = 10000
 
 class generatePyomoFiles():
     'Store data for each flowgate; \
@@ -46,15 +84,15 @@ class generatePyomoFiles():
     def busNumMatchGC(self):
         self.busNumToIdxGC = {}
         idx = 0
-        for bus in self.genericModel.buses:
-            self.busNumToIdxGC[bus.busNumber] = idx
+        for busNumber, in RawGenericModel.recordRows(self.genericModel.buses, ['busNumber']):
+            self.busNumToIdxGC[busNumber] = idx
             idx = idx + 1
     
     def busNumToCostCurveIdx(self):
         self.busNumToCostCurveMultiRampIdxGC = {}
         for idx, genMultiRamp in enumerate(self.genericModel.gensMultiRamp):
             busNumber = genMultiRamp.busNumber
-            if self.busNumToCostCurveMultiRampIdxGC.has_key(busNumber) == True:
+            if busNumber in self.busNumToCostCurveMultiRampIdxGC:
                 array = self.busNumToCostCurveMultiRampIdxGC.get(busNumber)
                 array.append(idx)
                 self.busNumToCostCurveMultiRampIdxGC[busNumber] = array
@@ -65,7 +103,7 @@ class generatePyomoFiles():
         self.busNumToCostCurveSpinRampIdxGC = {}
         for idx, genSpinRamp in enumerate(self.genericModel.gensSpinRamp):
             busNumber = genSpinRamp.busNumber
-            if self.busNumToCostCurveSpinRampIdxGC.has_key(busNumber) == True:
+            if busNumber in self.busNumToCostCurveSpinRampIdxGC:
                 array = self.busNumToCostCurveSpinRampIdxGC.get(busNumber)
                 array.append(idx)
                 self.busNumToCostCurveSpinRampIdxGC[busNumber] = array
@@ -74,9 +112,8 @@ class generatePyomoFiles():
                 self.busNumToCostCurveSpinRampIdxGC[busNumber] = array
     
         self.busNumToGenIdxGC = {}
-        for idx, gen in enumerate(self.genericModel.gens):
-            busNumber = gen.busNumber
-            if self.busNumToGenIdxGC.has_key(busNumber) == True:
+        for idx, (busNumber,) in enumerate(RawGenericModel.recordRows(self.genericModel.gens, ['busNumber'])):
+            if busNumber in self.busNumToGenIdxGC:
                 array = self.busNumToGenIdxGC.get(busNumber)
                 array.append(idx)
                 self.busNumToGenIdxGC[busNumber] = array
@@ -91,8 +128,8 @@ class generatePyomoFiles():
     def busNumMatchRC(self):
         self.busNumToIdxRC = {}
         idx = 0
-        for bus in self.emsMarketModel.buses:
-            self.busNumToIdxRC[bus.busNumber] = idx
+        for busNumber, in RawGenericModel.recordRows(self.emsMarketModel.buses, ['busNumber']):
+            self.busNumToIdxRC[busNumber] = idx
             idx = idx + 1
     
     # given a schedule ID, return index of the corresponding unit status data entry
@@ -135,7 +172,8 @@ class generatePyomoFiles():
             self.spinRampCostCurveUnitIDToIdx[item.unitID] = idx
             idx = idx + 1
 
-    # given a schedule ID, return index of the corresponding hourly_economic_min_max data entry
+    # given a schedule ID, return index of the corresponding hourly_economic_min_max data entry;
+    # hourTimesOfScheduleID has the (hour number, index) of these entries, sorted by time
     def unitHourlyMatch(self):
         self.hourScheduleIDToIdx = {}
         idx = 0
@@ -145,6 +183,11 @@ class generatePyomoFiles():
             else:
                 self.hourScheduleIDToIdx[item.unitScheduleID] = [idx]
             idx = idx + 1
+        hourlyData = self.emsMarketModel.hourlyData
+        self.hourTimesOfScheduleID = {}
+        for scheduleID, idxItems in self.hourScheduleIDToIdx.items():
+            self.hourTimesOfScheduleID[scheduleID] = sorted([(GeneralClasses.calcHourNumber(hourlyData[idx].date, hourlyData[idx].hour), idx) \
+                                                             for idx in idxItems])
 
     # given a schedule ID, return index of generator in the raw file
     def unitRawMatch(self):
@@ -188,7 +231,68 @@ class generatePyomoFiles():
             self.myDiary.hotlineWithLogType(5, "A new file " + self.fileNamePyomoGC + " has been created and filled with needed data")
         else:
             self.myDiary.hotlineWithLogType(5, "All generic-case files with regular data-format have been created and filled with needed data")
-        
+
+    # Form the real-case data in memory, as the dict-data taken by
+    # SCEDModel.create_instance(data=...); no pyomo-format file is written or parsed.
+    def getPyomoDataRC(self):
+        isDataForRC = True
+        data = {}
+        addPyomoTable(data, "BUS", busColumns, generatePyomoFiles.collectBusData(self, self.emsMarketModel.buses))
+        addPyomoTable(data, "LOAD", loadColumns, generatePyomoFiles.collectLoadData(self, self.emsMarketModel.loads))
+        genTables = generatePyomoFiles.collectGenRCData(self)
+        addPyomoTable(data, "GEN", genRCColumns, genTables[0])
+        addPyomoTable(data, "GENCOST", genCostColumns, genTables[1])
+        addPyomoTable(data, "BRANCH", branchColumns, generatePyomoFiles.collectBranchData(self, isDataForRC))
+        addPyomoTable(data, "RESERVEArea", reserveAreaColumns, generatePyomoFiles.collectReserveReqData(self))
+        constraintTables = generatePyomoFiles.collectConstraintsData(self)
+        addPyomoTable(data, "CONTINGENCY", contingencyRCColumns, constraintTables[0])
+        addPyomoTable(data, "CONSTRAINT", constraintColumns, constraintTables[1])
+        addPyomoTable(data, "SCENARIO", scenarioColumns, constraintTables[2])
+        addPyomoTable(data, "DFAX", dfaxColumns, constraintTables[3])
+        return {None: data}
+
+    # Form the generic-case data in memory, as the dict-data taken by
+    # SCEDModel.create_instance(data=...); no pyomo-format file is written or parsed.
+    def getPyomoDataGC(self):
+        isDataForRC = False
+        data = {}
+        addPyomoTable(data, "BUS", busColumns, generatePyomoFiles.collectBusData(self, self.genericModel.buses))
+        addPyomoTable(data, "LOAD", loadColumns, generatePyomoFiles.collectLoadData(self, self.genericModel.loads))
+        genTables = generatePyomoFiles.collectGenGCData(self)
+        addPyomoTable(data, "GEN", genGCColumns, genTables[0])
+        addPyomoTable(data, "GENCOST", genCostColumns, genTables[1])
+        addPyomoTable(data, "BRANCH", branchColumns, generatePyomoFiles.collectBranchData(self, isDataForRC))
+        return {None: data}
+
+    # write the heading line of a table
+    def writeHeading(self, f, setName, columns):
+        heading = "  " + " ".join(columns) + " "
+        if self.isCodeGeneratePyomoFiles == True:
+            f.write("param:  " + setName + ": " + heading + " :=")
+        elif self.needHeading == True:
+            f.write("  index" + heading)
+        f.write("\n")
+
+    # write one row of a table (without the line break)
+    def writeRow(self, f, row, formats):
+        f.write(rowFormat(formats) % tuple(row[:len(formats)]))
+
+    # write the rows of a table, the first item of each row is the index;
+    # rows (a list, 2-D NumPy array or generator) are formatted into one buffer
+    # and written at once per rowsPerWrite rows
+    def writeRows(self, f, rows, formats):
+        if hasattr(rows, "tolist"):
+            rows = rows.tolist()
+        rows = iter(rows)
+        chunk = list(itertools.islice(rows, rowsPerWrite))
+        while len(chunk) > 0:
+            f.write(formatRows(chunk, formats))
+            chunk = list(itertools.islice(rows, rowsPerWrite))
+
+    # collect bus data; return a generator of rows, each row is [index] + busColumns
+    def collectBusData(self, buses):
+        rows = RawGenericModel.recordRows(buses, ['busNumber', 'busKV', 'busVa', 'busArea'])
+        return ([idx+1] + list(values) for idx, values in enumerate(rows))
 
     # write bus data to a file
     def writeBusData(self, buses, isDataForRC):
@@ -197,25 +301,18 @@ class generatePyomoFiles():
             fileNameInit = "busRC.dat"
         fileName = generatePyomoFiles.checkIsCodeGeneratePyomoFiles(self, fileNameInit, isDataForRC)
         generatePyomoFiles.dumpNewFileCreation(self, fileName, fileNameInit)
+        rows = generatePyomoFiles.collectBusData(self, buses)
         with open(fileName, 'a') as f:
-            heading = "  Bus_number Bus_kv Bus_va Bus_area "
-            if self.isCodeGeneratePyomoFiles == True:
-                f.write("param: BUS: " + heading + " :=")
-            elif self.needHeading == True:
-                f.write("  index" + heading)
-            f.write("\n")
-            
-            idx = 0
-            for bus in buses:
-                idx = idx + 1
-                f.write("%s %d" % (" ", idx))
-                f.write("%s %d" % (" ", bus.busNumber))
-                f.write("%s %f" % (" ", bus.busKV))
-                f.write("%s %f" % (" ", bus.busVa))
-                f.write("%s %d %s" % (" ", bus.busArea, "\n"))
+            generatePyomoFiles.writeHeading(self, f, "BUS", busColumns)
+            generatePyomoFiles.writeRows(self, f, rows, busFormats)
             if self.isCodeGeneratePyomoFiles == True:
                 f.write(";\n\n")
 
+    # collect load data; return a generator of rows, each row is [index] + loadColumns
+    def collectLoadData(self, loads):
+        rows = RawGenericModel.recordRows(loads, ['busNumber', 'loadID', 'isInSvc', 'Pload'])
+        return ([idx+1] + list(values) for idx, values in enumerate(rows))
+
     # write load data to a file
     def writeLoadData(self, loads, isDataForRC):
         fileNameInit = "loadGC.dat"
@@ -223,135 +320,109 @@ class generatePyomoFiles():
             fileNameInit = "loadRC.dat"
         fileName = generatePyomoFiles.checkIsCodeGeneratePyomoFiles(self, fileNameInit, isDataForRC)
         generatePyomoFiles.dumpNewFileCreation(self, fileName, fileNameInit)
+        rows = generatePyomoFiles.collectLoadData(self, loads)
         with open(fileName, 'a') as f:
-            heading = "  Load_busNumber Load_id Load_isInSvc Load_pd "
-            if self.isCodeGeneratePyomoFiles == True:
-                f.write("param:  LOAD: " + heading + " :=")
-            elif self.needHeading == True:
-                f.write("  index" + heading)
-            f.write("\n")
-            
-            idx = 0
-            for load in loads:
-                idx = idx + 1
-                f.write("%s %d" % (" ", idx))
-                f.write("%s %d" % (" ", load.busNumber))
-                f.write("%s %s" % (" ", load.loadID))
-                f.write("%s %d" % (" ", load.isInSvc))
-                f.write("%s %f" % (" ", load.Pload))
-                f.write("%s" % ("\n"))
+            generatePyomoFiles.writeHeading(self, f, "LOAD", loadColumns)
+            generatePyomoFiles.writeRows(self, f, rows, loadFormats)
             if self.isCodeGeneratePyomoFiles == True:
                 f.write(";\n\n")
 
+    # collect generic-case gen and genCost data;
+    # return [genRows, genCostRows], each row is [index] + genGCColumns/genCostColumns
+    def collectGenGCData(self):
+        generatePyomoFiles.busNumToCostCurveIdx(self)
+
+        genCostRows = []
+        genIdxHasCostCurve = {}
+        mwSegmentPreviousData = 0
+        busNumberPreviousData = -1
+        genIDPreviousData = -1
+        genIdxPreviousData = -1
+        idxSegment = -1
+        for idx, genCostCurveOutput in enumerate(self.genericModel.gensCostCurveOutput):
+            busNumber = genCostCurveOutput.busNumber
+            genID = genCostCurveOutput.genID
+
+            isTheSameGenPrior = False
+            if busNumber == busNumberPreviousData:
+                if genID == genIDPreviousData:
+                    isTheSameGenPrior = True
+                    genIdx = genIdxPreviousData
+                    idxSegment = idxSegment + 1
+            if isTheSameGenPrior == False:
+                genIdx = generatePyomoFiles.findTheGenIdxGC(self, busNumber, genID)
+                genIdxHasCostCurve[genIdx] = 1
+                if genIdx == -1:
+                    self.myDiary.hotlineWithLogType(2, "the "+str(idx+1)+"-th line of cost curve cannot be matched to a valid generator, thus, skipped")
+                    continue
+                busNumberPreviousData = busNumber
+                genIDPreviousData = genID
+                genIdxPreviousData = genIdx
+                idxSegment = 1
+                mwSegmentPreviousData = 0
+            segmentBreadth = genCostCurveOutput.MW - mwSegmentPreviousData
+            if segmentBreadth < 0:
+                segmentBreadth = 0
+                self.myDiary.hotlineWithLogType(2, "the "+str(idx+1)+"-th line of cost curve has negative segment breadth, thus, it is set to 0")
+            genCostRows.append([idx+1, genIdx+1, idxSegment, segmentBreadth, genCostCurveOutput.price])
+            mwSegmentPreviousData = genCostCurveOutput.MW
+        self.myDiary.hotlineWithLogType(6, "The number of generators that have cost curve is: "+str(len(genIdxHasCostCurve)))
+
+        genRows = []
+        rows = RawGenericModel.recordRows(self.genericModel.gens, ['busNumber', 'genID', 'isInSvc', 'PGen', 'PMax', 'PMin'])
+        for idx, values in enumerate(rows):
+            busNumber, genID, isInSvc, PGen, PMax, PMin = values
+            pgen = PGen
+            if self.isPositivePgPmaxPminNeeded == True:
+                if pgen < 0:
+                    self.myDiary.hotlineWithLogType(1, "When generate generic case, unit " + str(idx+1) + " pgen is negative, " + str(pgen) + ", is set to 0")
+                    pgen = 0
+
+            pgmax = PMax
+            if self.isPositivePgPmaxPminNeeded == True:
+                if pgmax < 0:
+                    self.myDiary.hotlineWithLogType(1, "When generate generic case, unit " + str(idx+1) + " pgmax is negative, " + str(pgmax) + ", is set to 0")
+                    pgmax = 0
+
+            pgmin = PMin
+            if self.isPositivePgPmaxPminNeeded == True:
+                if pgmin < 0:
+                    self.myDiary.hotlineWithLogType(1, "When generate generic case, unit " + str(idx+1) + " pgmin is negative, " + str(pgmin) + ", is set to 0")
+                    pgmin = 0
+
+            multiRamprate = generatePyomoFiles.findTheRampRate(self, busNumber, genID, PGen, \
+                            self.busNumToCostCurveMultiRampIdxGC, self.genericModel.gensMultiRamp)
+            spinRamprate = generatePyomoFiles.findTheRampRate(self, busNumber, genID, PGen, \
+                            self.busNumToCostCurveSpinRampIdxGC, self.genericModel.gensSpinRamp)
+
+            hasCostCurveFlag = 0
+            if idx in genIdxHasCostCurve:
+                hasCostCurveFlag = 1
+            genRows.append([idx+1, busNumber, genID, isInSvc, pgen, pgmax, pgmin, \
+                            multiRamprate, spinRamprate, hasCostCurveFlag])
+        return [genRows, genCostRows]
+
     # write gen and genCost data to separate files
     def writeGenGCData(self):
-        generatePyomoFiles.busNumToCostCurveIdx(self)
-        
+        genTables = generatePyomoFiles.collectGenGCData(self)
+
         fileNameInit = "genCostGC.dat"
         isDataForRC = False
         fileName = generatePyomoFiles.checkIsCodeGeneratePyomoFiles(self, fileNameInit, isDataForRC)
         generatePyomoFiles.dumpNewFileCreation(self, fileName, fileNameInit)
-        genIdxHasCostCurve = {}
         with open(fileName, 'a') as f:
-            heading = "  GenCost_genIdx GenCost_segmentIdx GenCost_segmentBreadth GenCost_segmentPrice"
-            if self.isCodeGeneratePyomoFiles == True:
-                f.write("param:  GENCOST: " + heading + " :=")
-            elif self.needHeading == True:
-                f.write("  index" + heading)
-            f.write("\n")
-
-            mwSegmentPreviousData = 0
-            busNumberPreviousData = -1
-            genIDPreviousData = -1
-            genIdxPreviousData = -1
-            idxSegment = -1
-            for idx, genCostCurveOutput in enumerate(self.genericModel.gensCostCurveOutput):
-                busNumber = genCostCurveOutput.busNumber
-                genID = genCostCurveOutput.genID
-                
-                isTheSameGenPrior = False
-                if busNumber == busNumberPreviousData:
-                    if genID == genIDPreviousData:
-                        isTheSameGenPrior = True
-                        genIdx = genIdxPreviousData
-                        idxSegment = idxSegment + 1
-                if isTheSameGenPrior == False:
-                    genIdx = generatePyomoFiles.findTheGenIdxGC(self, busNumber, genID)
-                    genIdxHasCostCurve[genIdx] = 1
-                    if genIdx == -1:
-                        self.myDiary.hotlineWithLogType(2, "the "+str(idx+1)+"-th line of cost curve cannot be matched to a valid generator, thus, skipped")
-                        continue
-                    busNumberPreviousData = busNumber
-                    genIDPreviousData = genID
-                    genIdxPreviousData = genIdx
-                    idxSegment = 1
-                    mwSegmentPreviousData = 0
-                f.write("%s %d" % (" ", (idx+1)))
-                f.write("%s %d" % (" ", (genIdx+1)))
-                f.write("%s %d" % (" ", idxSegment))
-                segmentBreadth = genCostCurveOutput.MW - mwSegmentPreviousData
-                if segmentBreadth < 0:
-                    segmentBreadth = 0
-                    self.myDiary.hotlineWithLogType(2, "the "+str(idx+1)+"-th line of cost curve has negative segment breadth, thus, it is set to 0")
-                f.write("%s %f" % (" ", segmentBreadth))
-                f.write("%s %f" % (" ", genCostCurveOutput.price))
-                f.write("%s" % ("\n"))
-                mwSegmentPreviousData = genCostCurveOutput.MW
+            generatePyomoFiles.writeHeading(self, f, "GENCOST", genCostColumns)
+            generatePyomoFiles.writeRows(self, f, genTables[1], genCostFormats)
             if self.isCodeGeneratePyomoFiles == True:
                 f.write(";\n\n")
-        self.myDiary.hotlineWithLogType(6, "The number of generators that have cost curve is: "+str(len(genIdxHasCostCurve)))
 
         fileNameInit = "genGC.dat"
         isDataForRC = False
         fileName = generatePyomoFiles.checkIsCodeGeneratePyomoFiles(self, fileNameInit, isDataForRC)
         generatePyomoFiles.dumpNewFileCreation(self, fileName, fileNameInit)
         with open(fileName, 'a') as f:
-            heading = "  Gen_busNumber Gen_id  Gen_isInSvc  Gen_pgInit Gen_pgMax Gen_pgMin Gen_energyRamp Gen_spinRamp Gen_costCurveFlag"
-            if self.isCodeGeneratePyomoFiles == True:
-                f.write("param:  GEN: " + heading + " :=")
-            elif self.needHeading == True:
-                f.write("  index" + heading)
-            f.write("\n")
-
-            for idx, gen in enumerate(self.genericModel.gens):
-                f.write("%s %d" % (" ", (idx+1)))
-                f.write("%s %d" % (" ", gen.busNumber))
-                f.write("%s %s" % (" ", gen.genID))
-                f.write("%s %d" % (" ", gen.isInSvc))
-                
-                pgen = gen.PGen
-                if self.isPositivePgPmaxPminNeeded == True:
-                    if pgen < 0:
-                        self.myDiary.hotlineWithLogType(1, "When generate generic case, unit " + str(idx+1) + " pgen is negative, " + str(pgen) + ", is set to 0")
-                        pgen = 0
-                f.write("%s %f" % (" ", pgen))
-                
-                pgmax = gen.PMax
-                if self.isPositivePgPmaxPminNeeded == True:
-                    if pgmax < 0:
-                        self.myDiary.hotlineWithLogType(1, "When generate generic case, unit " + str(idx+1) + " pgmax is negative, " + str(pgmax) + ", is set to 0")
-                        pgmax = 0
-                f.write("%s %f" % (" ", pgmax))
-                
-                pgmin = gen.PMin
-                if self.isPositivePgPmaxPminNeeded == True:
-                    if pgmin < 0:
-                        self.myDiary.hotlineWithLogType(1, "When generate generic case, unit " + str(idx+1) + " pgmin is negative, " + str(pgmin) + ", is set to 0")
-                        pgmin = 0
-                f.write("%s %f" % (" ", pgmin))
-                
-                multiRamprate = generatePyomoFiles.findTheRampRate(self, gen.busNumber, gen.genID, gen.PGen, \
-                                self.busNumToCostCurveMultiRampIdxGC, self.genericModel.gensMultiRamp)
-                spinRamprate = generatePyomoFiles.findTheRampRate(self, gen.busNumber, gen.genID, gen.PGen, \
-                                self.busNumToCostCurveSpinRampIdxGC, self.genericModel.gensSpinRamp)
-                f.write("%s %f" % (" ", multiRamprate))
-                f.write("%s %f" % (" ", spinRamprate))
-
-                hasCostCurveFlag = 0
-                if genIdxHasCostCurve.has_key(idx):
-                    hasCostCurveFlag = 1
-                f.write("%s %d" % (" ", hasCostCurveFlag))
-                f.write("%s" % ("\n"))
+            generatePyomoFiles.writeHeading(self, f, "GEN", genGCColumns)
+            generatePyomoFiles.writeRows(self, f, genTables[0], genGCFormats)
             if self.isCodeGeneratePyomoFiles == True:
                 f.write(";\n\n")
             
@@ -366,7 +437,7 @@ class generatePyomoFiles():
             
     def findTheRampRate(self, busNumber, genID, pg, busNumToCostCurveRampIdx, costcurveRampIdx):
         ramprate = 0
-        if busNumToCostCurveRampIdx.has_key(busNumber) == False:
+        if busNumber not in busNumToCostCurveRampIdx:
             return ramprate
         indicesRamp = busNumToCostCurveRampIdx[busNumber]
         for idxRamp in indicesRamp:
@@ -378,8 +449,11 @@ class generatePyomoFiles():
                     return genRamp.rampRates[idxMW]
         return ramprate
 
-    # write gen and genCost data to separate files
-    def writeGenRCData(self):
+    # collect real-case gen and genCost data;
+    # return [genRows, genCostRows, genRowFormats], each row is [index] + genRCColumns/genCostColumns;
+    # genRowFormats has the formats of each gen row, where the zeros filled in for
+    # missing market data are written as "%d", as the .dat file always had them
+    def collectGenRCData(self):
         matchUnitID(self.emsMarketModel.gens, self.emsMarketModel.units)
         generatePyomoFiles.unitBidMatch(self)
         generatePyomoFiles.unitCostCurveMatch(self)
@@ -406,13 +480,13 @@ class generatePyomoFiles():
         for gen in gens:
             scheduleID = gen.unitScheduleID
             flagUsingDummyValues = False
-            if scheduleID in self.hourScheduleIDToIdx:
-                idxItems = self.hourScheduleIDToIdx[scheduleID]
+            if scheduleID in self.hourTimesOfScheduleID:
+                hourTimes = self.hourTimesOfScheduleID[scheduleID]
             else:
                 flagUsingDummyValues = True
             idxTarget = -1
             if flagUsingDummyValues == False:
-                idxTarget = findHourlyDataIdx(hourlyData, idxItems, self.emsMarketModel.date, self.emsMarketModel.time.hour)
+                idxTarget = findHourlyDataIdxSorted(hourTimes, self.emsMarketModel.date, self.emsMarketModel.time.hour)
                 if (idxTarget < 0):
                     flagUsingDummyValues = True
             if flagUsingDummyValues == True:
@@ -463,130 +537,149 @@ class generatePyomoFiles():
         EnergyRamp = getGensRamp(gens, multiRampRates, self.multiRampCostCurveUnitIDToIdx, bids, self.bidScheduleIDToIdx)
         SpinRamp = getGensRamp(gens, spinRampRate, self.spinRampCostCurveUnitIDToIdx, bids, self.bidScheduleIDToIdx)
         
+        genRows = []
+        genRowFormats = []
         gensUseBidSlope = []
+        rows = RawGenericModel.recordRows(gens, ['busNumber', 'genID', 'isInSvc', 'PGen', 'PMax', 'PMin'])
+        for idx, values in enumerate(rows):
+            busNumber, genID, isInSvc, PGen, PMax, PMin = values
+            gen = gens[idx]
+            pgen = PGen
+            if self.isPositivePgPmaxPminNeeded == True:
+                if pgen < 0:
+                    self.myDiary.hotlineWithLogType(1, "When generate real EMS-Market case, unit " + str(idx+1) + " pgen is negative, " + str(pgen) + ", is set to 0")
+                    pgen = 0
+            row = [idx+1, busNumber, genID, isInSvc, pgen]
+            
+            scheduleID = gen.unitScheduleID
+            if scheduleID < 0:
+                pgmax = PMax
+                pgmin = PMin
+                #make sure pgmax and pgmin is postive
+                if self.isPositivePgPmaxPminNeeded == True:
+                    if pgmax < 0:
+                        self.myDiary.hotlineWithLogType(1, "When generate real EMS-Market case, unit " + str(idx+1) + " pgmax is negative, " + str(pgmax) + ", is set to 0")
+                        pgmax = 0
+                    if pgmin < 0:
+                        self.myDiary.hotlineWithLogType(1, "When generate real EMS-Market case, unit " + str(idx+1) + " pgmin is negative, " + str(pgmin) + ", is set to 0")
+                        pgmin = 0
+                row = row + [pgmax, pgmin] + [0]*15
+                formats = genRCFormats[:7] + ["%d"]*15
+                gensUseBidSlope.append(0)
+            else:
+                idxBid = self.bidScheduleIDToIdx[scheduleID]
+                bid = bids[idxBid]
+                pgmax = bid.econMax
+                pgmin = bid.econMin
+                if EconMax[idx] != -1:
+                    pgmax = EconMax[idx]
+                    pgmin = EconMin[idx]
+                #make sure pgmax and pgmin is postive
+                if self.isPositivePgPmaxPminNeeded == True:
+                    if pgmax < 0:
+                        self.myDiary.hotlineWithLogType(1, "When generate real EMS-Market case, unit " + str(idx+1) + " pgmax is negative, " + str(pgmax) + ", is set to 0")
+                        pgmax = 0
+                    if pgmin < 0:
+                        self.myDiary.hotlineWithLogType(1, "When generate real EMS-Market case, unit " + str(idx+1) + " pgmin is negative, " + str(pgmin) + ", is set to 0")
+                        pgmin = 0
+                row = row + [pgmax, pgmin, 1, bid.useBidSlope]
+                gensUseBidSlope.append(bid.useBidSlope)
+                row = row + [CostCurveSegmentNum[idx], EnergyRamp[idx], SpinRamp[idx]]
+                formats = list(genRCFormats)
+
+                notANaN = True
+                if math.isnan(RegUnitStatus[idx]):
+                    notANaN = False
+                if math.isnan(bid.regOfferPrice):
+                    notANaN = False
+                if math.isnan(Reg_Offer_Mw[idx]):
+                    notANaN = False
+                if notANaN:
+                    row = row + [RegUnitStatus[idx], bid.regOfferPrice, Reg_Offer_Mw[idx]]
+                else:
+                    row = row + [0, 0, 0]
+                    formats[12:15] = ["%d"]*3
+                    
+                notANaN = True
+                if math.isnan(SpinUnitStatus[idx]):
+                    notANaN = False
+                if math.isnan(bid.spinOfferPrice):
+                    notANaN = False
+                if math.isnan(Spin_Offer_Mw[idx]):
+                    notANaN = False
+                if notANaN:
+                    row = row + [SpinUnitStatus[idx], bid.spinOfferPrice, Spin_Offer_Mw[idx]]
+                else:
+                    row = row + [0, 0, 0]
+                    formats[15:18] = ["%d"]*3
+                
+                fastStartTol = 1.0/6  # 10 minutes
+                coldnotificationtime = bid.coldNotificationTime
+                coldstartuptime = bid.coldStartupTime
+                FastStartUnitFlag = 0
+                if (coldnotificationtime + coldstartuptime) < fastStartTol:
+                    FastStartUnitFlag = 1
+                row = row + [FastStartUnitFlag, coldnotificationtime, coldstartuptime]  # in hour
+                row.append(bid.localeID)
+            genRows.append(row)
+            genRowFormats.append(formats)
+        
+        genCostRows = []
+        idxPyomo = 0
+        idxSegment = 1
+        doLinearization = False
+        idxPriorGen = -1
+        for idx in range(0, len(genIdxCostCurve)):
+            idxGen = genIdxCostCurve[idx] - 1
+            if idxPriorGen != idxGen:
+                doLinearization = False
+                idxPriorGen = idxGen
+            
+            if gensUseBidSlope[idxGen] == 1 and segmentIdxCostCurve[idx] != 1:
+                doLinearization = True
+            
+            if doLinearization == False:
+                idxSegment = 1
+                idxPyomo = idxPyomo + 1
+                genCostRows.append([idxPyomo, genIdxCostCurve[idx], segmentIdxCostCurve[idx], \
+                                    segmentBreadthCostCurve[idx], segmentPriceCostCurve[idx]])
+            else:
+                p1 = segmentPriceCostCurve[idx-1]
+                p2 = segmentPriceCostCurve[idx]
+                m1 = 0
+                m2 = segmentBreadthCostCurve[idx]
+                pm = linearInterpolate(p1, m1, p2, m2, self.blockPrice)
+                ps = pm[0]
+                ms = pm[1]
+                for k in range(1, len(ps)):
+                    idxPyomo = idxPyomo + 1
+                    idxSegment = idxSegment + 1
+                    genCostRows.append([idxPyomo, genIdxCostCurve[idx], idxSegment, ms[k], ps[k]])
+        return [genRows, genCostRows, genRowFormats]
+
+    # write gen and genCost data to separate files
+    def writeGenRCData(self):
+        genTables = generatePyomoFiles.collectGenRCData(self)
+        gens = self.emsMarketModel.gens
+
         fileNameInit = "genRC.dat"
         isDataForRC = True
         fileName = generatePyomoFiles.checkIsCodeGeneratePyomoFiles(self, fileNameInit, isDataForRC)
         generatePyomoFiles.dumpNewFileCreation(self, fileName, fileNameInit)
         with open(fileName, 'a') as f:
-            heading = "  Gen_busNumber Gen_id  Gen_isInSvc  Gen_pgInit Gen_pgMax Gen_pgMin Gen_hasMarketData"
-            heading = heading + " Gen_useBidSlope  Gen_costCurveSegmentNum  Gen_energyRamp Gen_spinRamp Gen_regUnitStatus"
-            heading = heading + " Gen_regOfferPrice Gen_regOfferMW Gen_spinUnitStatus Gen_spinOfferPrice Gen_spinOfferMW"
-            heading = heading + " Gen_fastStartUnitFlag Gen_coldNotificationTime Gen_coldStartupTime Gen_area "
-            if self.isCodeGeneratePyomoFiles == True:
-                f.write("param:  GEN: " + heading + " :=")
-            elif self.needHeading == True:
-                f.write("  unitID unitScheduleID index" + heading + " genName")
-            f.write("\n")
+            if self.isCodeGeneratePyomoFiles == False and self.needHeading == True:
+                f.write("  unitID unitScheduleID index  " + " ".join(genRCColumns) + "  genName\n")
+            else:
+                generatePyomoFiles.writeHeading(self, f, "GEN", genRCColumns)
 
-            idx = 0
-            for gen in self.emsMarketModel.gens:
+            for idx, row in enumerate(genTables[0]):
                 if self.isCodeGeneratePyomoFiles == False:
-                    f.write("%s %d" % (" ", gen.unitID))   
-                    f.write("%s %d" % (" ", gen.unitScheduleID))
-
-                f.write("%s %d" % (" ", (idx+1)))
-                f.write("%s %d" % (" ", gen.busNumber))
-                f.write("%s %s" % (" ", gen.genID))
-                f.write("%s %d" % (" ", gen.isInSvc))
-                
-                pgen = gen.PGen
-                if self.isPositivePgPmaxPminNeeded == True:
-                    if pgen < 0:
-                        self.myDiary.hotlineWithLogType(1, "When generate real EMS-Market case, unit " + str(idx+1) + " pgen is negative, " + str(pgen) + ", is set to 0")
-                        pgen = 0
-                f.write("%s %f" % (" ", pgen))
-                
-                scheduleID = gen.unitScheduleID
-                if scheduleID < 0:
-                    pgmax = gen.PMax
-                    pgmin = gen.PMin
-                    #make sure pgmax and pgmin is postive
-                    if self.isPositivePgPmaxPminNeeded == True:
-                        if pgmax < 0:
-                            self.myDiary.hotlineWithLogType(1, "When generate real EMS-Market case, unit " + str(idx+1) + " pgmax is negative, " + str(pgmax) + ", is set to 0")
-                            pgmax = 0
-                        if pgmin < 0:
-                            self.myDiary.hotlineWithLogType(1, "When generate real EMS-Market case, unit " + str(idx+1) + " pgmin is negative, " + str(pgmin) + ", is set to 0")
-                            pgmin = 0
-                    f.write("%s %f" % (" ", pgmax))
-                    f.write("%s %f" % (" ", pgmin))
-                    for i in range(0, 15):
-                        f.write(" 0")
-                    gensUseBidSlope.append(0)
-                else:
-                    idxBid = self.bidScheduleIDToIdx[scheduleID]
-                    bid = bids[idxBid]
-                    pgmax = bid.econMax
-                    pgmin = bid.econMin
-                    if EconMax[idx] != -1:
-                        pgmax = EconMax[idx]
-                        pgmin = EconMin[idx]
-                    #make sure pgmax and pgmin is postive
-                    if self.isPositivePgPmaxPminNeeded == True:
-                        if pgmax < 0:
-                            self.myDiary.hotlineWithLogType(1, "When generate real EMS-Market case, unit " + str(idx+1) + " pgmax is negative, " + str(pgmax) + ", is set to 0")
-                            pgmax = 0
-                        if pgmin < 0:
-                            self.myDiary.hotlineWithLogType(1, "When generate real EMS-Market case, unit " + str(idx+1) + " pgmin is negative, " + str(pgmin) + ", is set to 0")
-                            pgmin = 0
-                    f.write("%s %f" % (" ", pgmax))
-                    f.write("%s %f" % (" ", pgmin))
-                    f.write("%s %d" % (" ", 1))
-                    f.write("%s %d" % (" ", bid.useBidSlope))
-                    gensUseBidSlope.append(bid.useBidSlope)
-                    
-                    f.write("%s %d" % (" ", CostCurveSegmentNum[idx]))
-                    f.write("%s %f" % (" ", EnergyRamp[idx]))
-                    f.write("%s %f" % (" ", SpinRamp[idx]))
-
-                    notANaN = True
-                    if math.isnan(RegUnitStatus[idx]):
-                        notANaN = False
-                    if math.isnan(bid.regOfferPrice):
-                        notANaN = False
-                    if math.isnan(Reg_Offer_Mw[idx]):
-                        notANaN = False
-                    if notANaN:
-                        f.write("%s %d" % (" ", RegUnitStatus[idx]))
-                        f.write("%s %f" % (" ", bid.regOfferPrice))
-                        f.write("%s %f" % (" ", Reg_Offer_Mw[idx]))
-                    else:
-                        f.write("%s %d" % (" ", 0))
-                        f.write("%s %d" % (" ", 0))
-                        f.write("%s %d" % (" ", 0))
-                        
-                    notANaN = True
-                    if math.isnan(SpinUnitStatus[idx]):
-                        notANaN = False
-                    if math.isnan(bid.spinOfferPrice):
-                        notANaN = False
-                    if math.isnan(Spin_Offer_Mw[idx]):
-                        notANaN = False
-                    if notANaN:
-                        f.write("%s %d" % (" ", SpinUnitStatus[idx]))
-                        f.write("%s %f" % (" ", bid.spinOfferPrice))
-                        f.write("%s %f" % (" ", Spin_Offer_Mw[idx]))
-                    else:
-                        f.write("%s %d" % (" ", 0))
-                        f.write("%s %d" % (" ", 0))
-                        f.write("%s %d" % (" ", 0))
-                    
-                    fastStartTol = 1.0/6  # 10 minutes
-                    coldnotificationtime = bid.coldNotificationTime
-                    coldstartuptime = bid.coldStartupTime
-                    FastStartUnitFlag = 0
-                    if (coldnotificationtime + coldstartuptime) < fastStartTol:
-                        FastStartUnitFlag = 1
-                    f.write("%s %d" % (" ", FastStartUnitFlag))
-                    f.write("%s %f" % (" ", coldnotificationtime)) # in hour
-                    f.write("%s %f" % (" ", coldstartuptime))  # in hour
-                    
-                    f.write("%s %d" % (" ", bid.localeID))
+                    f.write("%s %d" % (" ", gens[idx].unitID))   
+                    f.write("%s %d" % (" ", gens[idx].unitScheduleID))
+                generatePyomoFiles.writeRow(self, f, row, genTables[2][idx])
                 if self.isCodeGeneratePyomoFiles == False:
-                    f.write(" %s" % (gen.comment))
+                    f.write(" %s" % (gens[idx].comment))
                 f.write("%s" % ("\n"))
-                idx = idx + 1
             if self.isCodeGeneratePyomoFiles == True:
                 f.write(";\n\n")
         
@@ -595,149 +688,93 @@ class generatePyomoFiles():
         fileName = generatePyomoFiles.checkIsCodeGeneratePyomoFiles(self, fileNameInit, isDataForRC)
         generatePyomoFiles.dumpNewFileCreation(self, fileName, fileNameInit)
         with open(fileName, 'a') as f:
-            heading = "  GenCost_genIdx GenCost_segmentIdx  GenCost_segmentBreadth  GenCost_segmentPrice "
-            if self.isCodeGeneratePyomoFiles == True:
-                f.write("param:  GENCOST: " + heading + " :=")
-            elif self.needHeading == True:
-                f.write("  index" + heading)
-            f.write("\n")
-
-            idxPyomo = 0
-            idxSegment = 1
-            doLinearization = False
-            idxPriorGen = -1
-            for idx in range(0, len(genIdxCostCurve)):
-                idxGen = genIdxCostCurve[idx] - 1
-                if idxPriorGen != idxGen:
-                    doLinearization = False
-                    idxPriorGen = idxGen
-                
-                if gensUseBidSlope[idxGen] == 1 and segmentIdxCostCurve[idx] != 1:
-                    doLinearization = True
-                
-                if doLinearization == False:
-                    idxSegment = 1
-                    idxPyomo = idxPyomo + 1
-                    f.write("%s %d" % (" ", idxPyomo))
-                    #f.write("%s %d" % (" ", idxGenCostCurve[idx]))
-                    f.write("%s %d" % (" ", genIdxCostCurve[idx]))
-                    f.write("%s %d" % (" ", segmentIdxCostCurve[idx]))
-                    f.write("%s %f" % (" ", segmentBreadthCostCurve[idx]))
-                    f.write("%s %f" % (" ", segmentPriceCostCurve[idx]))
-                    f.write("%s" % ("\n"))
-                else:
-                    p1 = segmentPriceCostCurve[idx-1]
-                    p2 = segmentPriceCostCurve[idx]
-                    m1 = 0
-                    m2 = segmentBreadthCostCurve[idx]
-                    pm = linearInterpolate(p1, m1, p2, m2, self.blockPrice)
-                    ps = pm[0]
-                    ms = pm[1]
-                    for k in range(1, len(ps)):
-                        idxPyomo = idxPyomo + 1
-                        idxSegment = idxSegment + 1
-                        f.write("%s %d" % (" ", idxPyomo))
-                        f.write("%s %d" % (" ", genIdxCostCurve[idx]))
-                        f.write("%s %d" % (" ", idxSegment))
-                        f.write("%s %f" % (" ", ms[k]))
-                        f.write("%s %f" % (" ", ps[k]))
-                        f.write("%s" % ("\n"))
+            generatePyomoFiles.writeHeading(self, f, "GENCOST", genCostColumns)
+            generatePyomoFiles.writeRows(self, f, genTables[1], genCostFormats)
             if self.isCodeGeneratePyomoFiles == True:
                 f.write(";\n\n")
             
 
+    # collect reserve requirements; each row is [index] + reserveAreaColumns
+    def collectReserveReqData(self):
+        reserveReq = self.emsMarketModel.reserveReq
+        PJMRTO_Reg = reserveReq.PJMRTO_Reg
+        PJMRTO_SR = reserveReq.PJMRTO_SR
+        PJMRTO_PR = reserveReq.PJMRTO_PR
+        MAD_SR = reserveReq.MAD_SR
+        MAD_PR = reserveReq.MAD_PR
+        rows = []
+        rows.append([1, PJMRTO_Reg[0], PJMRTO_Reg[1], PJMRTO_Reg[2], \
+                     PJMRTO_SR[1], PJMRTO_SR[2], PJMRTO_PR[1], PJMRTO_PR[2]])
+        rows.append([2, MAD_SR[0], 0, 0, \
+                     MAD_SR[1], MAD_SR[2], MAD_PR[1], MAD_PR[2]])
+        return rows
+
     # write reserve requirements to a file
     def writeReserveReqData(self):
         fileNameInit = "reserveReqRC.dat"
         isDataForRC = True
         fileName = generatePyomoFiles.checkIsCodeGeneratePyomoFiles(self, fileNameInit, isDataForRC)
         generatePyomoFiles.dumpNewFileCreation(self, fileName, fileNameInit)
+        rows = generatePyomoFiles.collectReserveReqData(self)
         with open(fileName, 'a') as f:
-            heading = "  ReserveArea_genArea ReserveArea_regulationReq  ReserveArea_reqPenaltyPrice  ReserveArea_spinReq"
-            heading = heading + " ReserveArea_spinPenaltyPrice ReserveArea_primaryReq ReserveArea_primaryPenaltyPrice "
-            if self.isCodeGeneratePyomoFiles == True:
-                f.write("param:  RESERVEArea: " + heading + " :=")
-            elif self.needHeading == True:
-                f.write("  index" + heading)
-            f.write("\n")
-
-            reserveReq = self.emsMarketModel.reserveReq
-            PJMRTO_Reg = reserveReq.PJMRTO_Reg
-            PJMRTO_SR = reserveReq.PJMRTO_SR
-            PJMRTO_PR = reserveReq.PJMRTO_PR
-            MAD_SR = reserveReq.MAD_SR
-            MAD_PR = reserveReq.MAD_PR
-            
-            f.write("%s %d %f %f %f %f %f %f" % (" 1 ", PJMRTO_Reg[0], PJMRTO_Reg[1], PJMRTO_Reg[2], \
-                          PJMRTO_SR[1], PJMRTO_SR[2], PJMRTO_PR[1], PJMRTO_PR[2]))
-            f.write("%s" % ("\n"))
-            f.write("%s %d %f %f %f %f %f %f" % (" 2 ", MAD_SR[0], 0, 0, \
-                          MAD_SR[1], MAD_SR[2], MAD_PR[1], MAD_PR[2],))
-            f.write("%s" % ("\n"))
+            generatePyomoFiles.writeHeading(self, f, "RESERVEArea", reserveAreaColumns)
+            generatePyomoFiles.writeRows(self, f, rows, reserveAreaFormats)
             if self.isCodeGeneratePyomoFiles == True:
                 f.write(";\n\n")
 
-    # write branch data to a file
-    def writeBranchData(self, isDataForRC):
-        fileNameInit = "branchRC.dat"
-        branches = ''
+    # collect branch data; return a generator of rows, each row is [index] + branchColumns
+    def collectBranchData(self, isDataForRC):
         if isDataForRC == True:
             branches = self.emsMarketModel.branches
             generatePyomoFiles.busNumMatchRC(self)
-            calcLineFlow(branches, self.emsMarketModel.buses, self.busNumToIdxRC)
+            pkInits = calcLineFlow(branches, self.emsMarketModel.buses, self.busNumToIdxRC)
         else:
-            fileNameInit = "branchGC.dat"
             generatePyomoFiles.busNumMatchGC(self)
             branches = self.genericModel.branches
-            calcLineFlow(branches, self.genericModel.buses, self.busNumToIdxGC)
+            pkInits = calcLineFlow(branches, self.genericModel.buses, self.busNumToIdxGC)
+        rows = RawGenericModel.recordRows(branches, ['frmBusNumber', 'toBusNumber', 'brcID', 'isInSvc', 'R', 'X', \
+                                                     'angle', 'rateA', 'rateB', 'rateC'])
+        return ([idx+1, frmBusNumber, toBusNumber, brcID, isInSvc, R, X, angle * math.pi / 180, pkInits[idx], rateA, rateB, rateC] \
+                for idx, (frmBusNumber, toBusNumber, brcID, isInSvc, R, X, angle, rateA, rateB, rateC) in enumerate(rows))
+
+    # write branch data to a file
+    def writeBranchData(self, isDataForRC):
+        fileNameInit = "branchRC.dat"
+        if isDataForRC == False:
+            fileNameInit = "branchGC.dat"
+        rows = generatePyomoFiles.collectBranchData(self, isDataForRC)
         fileName = generatePyomoFiles.checkIsCodeGeneratePyomoFiles(self, fileNameInit, isDataForRC)
         generatePyomoFiles.dumpNewFileCreation(self, fileName, fileNameInit)
         with open(fileName, 'a') as f:
-            heading = "  Branch_frmBusNumber Branch_toBusNumber  Branch_id  Branch_isInSvc Branch_r Branch_x Branch_angle "
-            heading = heading + " Branch_pkInit Branch_rateA Branch_rateB Branch_rateC "
-            if self.isCodeGeneratePyomoFiles == True:
-                f.write("param:  BRANCH: " + heading + " :=")
-            elif self.needHeading == True:
-                f.write("  index" + heading)
-            f.write("\n")
-
-            idx = 0
-            for branch in branches:
-                idx = idx + 1
-                f.write("%s %d" % (" ", idx))
-                f.write("%s %d" % (" ", branch.frmBusNumber))
-                f.write("%s %d" % (" ", branch.toBusNumber))
-                f.write("%s %s" % (" ", branch.brcID))
-                f.write("%s %d" % (" ", branch.isInSvc))
-                f.write("%s %f" % (" ", branch.R))
-                f.write("%s %f" % (" ", branch.X))
-                angleInRadian = branch.angle * math.pi / 180
-                f.write("%s %f" % (" ", angleInRadian))
-                f.write("%s %f" % (" ", branch.pkInitMW))
-                f.write("%s %f" % (" ", branch.rateA))
-                f.write("%s %f" % (" ", branch.rateB))
-                f.write("%s %f" % (" ", branch.rateC))
-                f.write("%s" % ("\n"))
+            generatePyomoFiles.writeHeading(self, f, "BRANCH", branchColumns)
+            generatePyomoFiles.writeRows(self, f, rows, branchFormats)
             if self.isCodeGeneratePyomoFiles == True:
                 f.write(";\n\n")
 
-    # write contingency data to a file
-    def writeConstraintsData(self):
+    # collect contingency, constraint, scenario and DFax data;
+    # return [contingencyRows, constraintRows, scenarioRows, dfaxRows],
+    # each dfaxRow is [index] + dfaxColumns, for the nonzero DFax only
+    def collectConstraintsData(self):
         flowgates = self.emsMarketModel.flowgates
         gens = self.emsMarketModel.gens
         branches = self.emsMarketModel.branches
         idxPeriod = self.emsMarketModel.idxPeriod
+        flowgateIdxOfName = indexByNames(flowgates, ['fgName'])
+        branchIdxOfName = indexByNames(branches, ['comment', 'xfmcomment'])
+        genIdxesOfName = {}
+        for idxGen, gen in enumerate(gens):
+            genIdxesOfName.setdefault(gen.comment, []).append(idxGen)
         
         allContingency = []
         allConstraint = []
-        allDFax = []
+        dfaxRows = []
         flowgateNumbers = []
         
         idxCtcgy = 0
         aolDFAX = self.emsMarketModel.aolDFAX
         constDFaxAOL = aolDFAX.constDFaxAOL
         for dfaxConst in constDFaxAOL:
-            idx = findFlowgate(dfaxConst, flowgates)
+            idx = flowgateIdxOfName.get(dfaxConst.constraintName, -1)
             if idx == -1:
                 continue
             
@@ -745,7 +782,7 @@ class generatePyomoFiles():
             constraintNames = flowgate.constraintNames
             idxConstraint = -1
             for constraintName in constraintNames:
-                idx = findBranch(branches, constraintName)
+                idx = branchIdxOfName.get(constraintName, -1)
                 if idx != -1:
                     idxConstraint = idx + 1
                     break
@@ -763,40 +800,58 @@ class generatePyomoFiles():
             else:
                 contingencyNames = flowgate.contingencyNames
                 for contingencyName in contingencyNames:
-                    idx = findBranch(branches, contingencyName)
+                    idx = branchIdxOfName.get(contingencyName, -1)
                     if idx != -1:
                         idx = idx + 1
                     allContingency.append([idxCtcgy, idx])
             
+            # the first pnode of a name gives the DFax of every gen of that name
             pnodeNames = dfaxConst.PnodeNames
             dFaxValues = dfaxConst.dFaxes
-            genDFax = []
-            for gen in gens:
-                genName = gen.comment
-                idx = findIdxSameName(pnodeNames, genName)
-                if idx == -1:
-                    genDFax.append(0)
+            dFaxOfGen = []
+            for pnodeName, idx in indexByNames(pnodeNames, None).items():
+                if dFaxValues[idx] != 0:
+                    for idxGen in genIdxesOfName.get(pnodeName, []):
+                        dFaxOfGen.append((idxGen, dFaxValues[idx]))
+            dFaxOfGen.sort()
+            for idxGen, dFaxValue in dFaxOfGen:
+                dfaxRows.append([len(dfaxRows)+1, idxGen+1, idxCtcgy, dFaxValue])
+
+        contingencyRows = []
+        for idx in range(0, len(allContingency)):
+            contingencyRows.append([idx+1, allContingency[idx][0], allContingency[idx][1]])
+
+        constraintRows = []
+        for idx in range(0, len(allConstraint)):
+            constraintRows.append([idx+1, allConstraint[idx][0], allConstraint[idx][1], allConstraint[idx][2]])
+
+        scenarioRows = []
+        scenario = set()
+        for idx in range(0, len(allContingency)):
+            idxCntgy = allContingency[idx][0]
+            if idxCntgy in scenario:
+                continue
+            else:
+                scenario.add(idxCntgy)
+                if idxCntgy == -2:
+                    scenarioRows.append([len(scenario), 1])
                 else:
-                    genDFax.append(dFaxValues[idx])
-            allDFax.append(genDFax)
-            
+                    scenarioRows.append([len(scenario), 0])
+        self.myDiary.hotlineWithLogType(6, "The number of nonzero DFax is: " + str(len(dfaxRows)) + ", out of " \
+                                        + str(len(gens)*len(constraintRows)) + " gen-constraint pairs")
+        return [contingencyRows, constraintRows, scenarioRows, dfaxRows]
+
+    # write contingency data to a file
+    def writeConstraintsData(self):
+        constraintTables = generatePyomoFiles.collectConstraintsData(self)
+
         fileNameInit = "contingencyRC.dat"
         isDataForRC = True
         fileName = generatePyomoFiles.checkIsCodeGeneratePyomoFiles(self, fileNameInit, isDataForRC)
         generatePyomoFiles.dumpNewFileCreation(self, fileName, fileNameInit)
         with open(fileName, 'a') as f:
-            heading = "  Contingency_idx Contingency_branchIdx "
-            if self.isCodeGeneratePyomoFiles == True:
-                f.write("param:  CONTINGENCY: " + heading + " :=")
-            elif self.needHeading == True:
-                f.write("  index" + heading)
-            f.write("\n")
-
-            for idx in range(0, len(allContingency)):
-                f.write("%s %d" % (" ", (idx+1)))
-                f.write("%s %d" % (" ", allContingency[idx][0]))
-                f.write("%s %d" % (" ", allContingency[idx][1]))
-                f.write("%s" % ("\n"))
+            generatePyomoFiles.writeHeading(self, f, "CONTINGENCY", contingencyRCColumns)
+            generatePyomoFiles.writeRows(self, f, constraintTables[0], contingencyRCFormats)
             if self.isCodeGeneratePyomoFiles == True:
                 f.write(";\n\n")
                 
@@ -805,19 +860,8 @@ class generatePyomoFiles():
         fileName = generatePyomoFiles.checkIsCodeGeneratePyomoFiles(self, fileNameInit, isDataForRC)
         generatePyomoFiles.dumpNewFileCreation(self, fileName, fileNameInit)
         with open(fileName, 'a') as f:
-            heading = "  Constraint_contingencyIdx Constraint_monitorBranchIdx Constraint_monitorBranchLimit "
-            if self.isCodeGeneratePyomoFiles == True:
-                f.write("param:  CONSTRAINT: " + heading + " :=")
-            elif self.needHeading == True:
-                f.write("  index" + heading)
-            f.write("\n")
-
-            for idx in range(0, len(allConstraint)):
-                f.write("%s %d" % (" ", (idx+1)))
-                f.write("%s %d" % (" ", allConstraint[idx][0]))
-                f.write("%s %d" % (" ", allConstraint[idx][1]))
-                f.write("%s %f" % (" ", allConstraint[idx][2]))
-                f.write("%s" % ("\n"))
+            generatePyomoFiles.writeHeading(self, f, "CONSTRAINT", constraintColumns)
+            generatePyomoFiles.writeRows(self, f, constraintTables[1], constraintFormats)
             if self.isCodeGeneratePyomoFiles == True:
                 f.write(";\n\n")
 
@@ -826,26 +870,8 @@ class generatePyomoFiles():
         fileName = generatePyomoFiles.checkIsCodeGeneratePyomoFiles(self, fileNameInit, isDataForRC)
         generatePyomoFiles.dumpNewFileCreation(self, fileName, fileNameInit)
         with open(fileName, 'a') as f:
-            heading = "  isBaseCase "
-            if self.isCodeGeneratePyomoFiles == True:
-                f.write("param:  SCENARIO: " + heading + " :=")
-            elif self.needHeading == True:
-                f.write("  index" + heading)
-            f.write("\n")
-
-            scenario = []
-            for idx in range(0, len(allContingency)):
-                idxCntgy = allContingency[idx][0]
-                if idxCntgy in scenario:
-                    continue
-                else:
-                    scenario.append(idxCntgy)
-                    f.write("%s %d" % (" ", len(scenario)))
-                    if idxCntgy == -2:
-                        f.write("%s %d" % (" ", 1))
-                    else:
-                        f.write("%s %d" % (" ", 0))
-                    f.write("%s" % ("\n"))
+            generatePyomoFiles.writeHeading(self, f, "SCENARIO", scenarioColumns)
+            generatePyomoFiles.writeRows(self, f, constraintTables[2], scenarioFormats)
             if self.isCodeGeneratePyomoFiles == True:
                 f.write(";\n\n")
                 
@@ -854,21 +880,8 @@ class generatePyomoFiles():
         fileName = generatePyomoFiles.checkIsCodeGeneratePyomoFiles(self, fileNameInit, isDataForRC)
         generatePyomoFiles.dumpNewFileCreation(self, fileName, fileNameInit)
         with open(fileName, 'a') as f:
-            rowIdxStr = " "
-            for idx in range(1, len(allConstraint)+1):
-                rowIdxStr = rowIdxStr + str(idx) + " "
-            heading = " dFax "
-            if self.isCodeGeneratePyomoFiles == True:
-                f.write("param  " + heading + ":   " + rowIdxStr + " := ")
-            elif self.needHeading == True:
-                f.write("  twoDimIdx " + rowIdxStr)
-            f.write("\n")
-
-            for idx in range(0, len(gens)):
-                f.write("%s %d" % (" ", (idx+1)))
-                for jdx in range(0, len(allConstraint)):
-                    f.write("%s %f" % (" ", allDFax[jdx][idx]))
-                f.write("%s" % ("\n"))
+            generatePyomoFiles.writeHeading(self, f, "DFAX", dfaxColumns)
+            generatePyomoFiles.writeRows(self, f, constraintTables[3], dfaxFormats)
             if self.isCodeGeneratePyomoFiles == True:
                 f.write(";\n\n")
                 
@@ -888,66 +901,103 @@ class generatePyomoFiles():
         if fileName == fileNameInit:
             self.myDiary.hotline("A new file " + fileName + " will be created very soon")
 
-def findBranch(branches, lineName):
-    for idx, branch in enumerate(branches):
-        if lineName == branch.comment:
-            return idx
-        elif lineName == branch.xfmcomment:
-            return idx
-    return -1
-    
-def findIdxSameName(pnodeNames, genName):
-    for idx, pnodeName in enumerate(pnodeNames):
-        if pnodeName == genName:
-            return idx
-    return -1
+# Format string of one table row: each item is preceded by two spaces,
+# i.e. the same text as writing ("%s " + format) % (" ", item) item by item.
+def rowFormat(formats):
+    return "".join("  " + fmt for fmt in formats)
 
-def findFlowgate(dfaxConst, flowgates):
-    nameDFaxConst = dfaxConst.constraintName
-    for idx, flowgate in enumerate(flowgates):
-        if nameDFaxConst == flowgate.fgName:
-            return idx
-    return -1
+# Format the rows of a table (list of lists or 2-D NumPy array) into one string,
+# one line per row.
+def formatRows(rows, formats):
+    if hasattr(rows, "tolist"):
+        rows = rows.tolist()
+    lineFormat = rowFormat(formats) + "\n"
+    return "".join([lineFormat % tuple(row) for row in rows])
 
+# Add one table to the pyomo dict-data: the index set plus one param per column.
+# rows may be a list of lists, a generator of rows or a 2-D NumPy array; the
+# first column is the index.
+def addPyomoTable(data, setName, columns, rows):
+    if hasattr(rows, "tolist"):
+        rows = rows.tolist()
+    indices = []
+    for idx in range(0, len(columns)):
+        data[columns[idx]] = {}
+    for row in rows:
+        index = int(row[0])
+        indices.append(index)
+        for idx in range(0, len(columns)):
+            data[columns[idx]][index] = row[idx+1]
+    data[setName] = {None: indices}
+    return data
+
+# //---  Read me  ---//
+# name -> index of the first item with that name, in item order; with attrs,
+# the name of an item is any of its attrs (the first item where any attr
+# matches wins), without attrs the items are the names.
+# Built once per table, so that a lookup by name is a dict lookup instead of
+# a linear scan of the table.
+def indexByNames(items, attrs):
+    idxOfName = {}
+    for idx, item in enumerate(items):
+        if attrs is None:
+            idxOfName.setdefault(item, idx)
+        else:
+            for attr in attrs:
+                idxOfName.setdefault(getattr(item, attr), idx)
+    return idxOfName
+
+# return the Pk_init in MW of each branch
 def calcLineFlow(branches, buses, busNumToIdx):
-    for branch in branches:
-        idxFrmBus = busNumToIdx[branch.frmBusNumber]
-        idxToBus = busNumToIdx[branch.toBusNumber]
+    busVa = [va for va, in RawGenericModel.recordRows(buses, ['busVa'])]
+    pkInits = []
+    for frmBusNumber, toBusNumber, X in RawGenericModel.recordRows(branches, ['frmBusNumber', 'toBusNumber', 'X']):
+        idxFrmBus = busNumToIdx[frmBusNumber]
+        idxToBus = busNumToIdx[toBusNumber]
         
         # TODO: for now, the DC power flow model is used to calculate the Pk_init in MW
-        deltaK = buses[idxFrmBus].busVa - buses[idxToBus].busVa
-        pkInit = 100*deltaK/branch.X  # by timing 100 is to convert per unit value to MW value
-        branch.setPkInitMW(pkInit)
+        deltaK = busVa[idxFrmBus] - busVa[idxToBus]
+        pkInit = 100*deltaK/X  # by timing 100 is to convert per unit value to MW value
+        pkInits.append(pkInit)
+    return pkInits
 
+# //---  Read me  ---//
+# A gen gets the unitID of the first PJM unit, not yet matched to an earlier
+# gen, whose station, voltage and unitName are all substrings of the gen
+# comment. The units are indexed once by station, and for a gen only the
+# substrings of its comment with the length of some station are looked up, so
+# just the units of the stations in the comment are compared.
 def matchUnitID(gens, units):
-    flag = []
-    for i in range(0, len(units)):
-        flag.append(-1)
-    # excluding generators outside PJM territory
-    for i in range(0, len(units)):
-        unit = units[i]
-        if unit.pool != "PJM":
-            flag[i] = 0
+    unitIdxesOfStation = {}
+    for idx, unit in enumerate(units):
+        # excluding generators outside PJM territory
+        if unit.pool == "PJM":
+            unitIdxesOfStation.setdefault(unit.station, []).append(idx)
+    stationLengths = sorted(set([len(station) for station in unitIdxesOfStation]))
+    isMatched = [False]*len(units)
     numMatched = 0
     for gen in gens:
         longName = gen.comment
         gen.setUnitID(-1)
-        idx = 0
-        for unit in units:
-            foundIt = False
-            if flag[idx] == -1:
-                if unit.station in longName:
-                    if unit.voltage in longName:
-                        if unit.unitName in longName:
-                            foundIt = True
-            if foundIt:
-                gen.setUnitID(unit.unitID)
-                flag[idx] = 0
-                numMatched = numMatched + 1
-                break
-            idx = idx + 1
+        stations = set()
+        for length in stationLengths:
+            for i in range(0, len(longName) - length + 1):
+                if longName[i:i+length] in unitIdxesOfStation:
+                    stations.add(longName[i:i+length])
+        idxFound = -1
+        for station in stations:
+            for idx in unitIdxesOfStation[station]:
+                if idxFound != -1 and idx > idxFound:
+                    break
+                unit = units[idx]
+                if not isMatched[idx] and unit.voltage in longName and unit.unitName in longName:
+                    idxFound = idx
+                    break
+        if idxFound != -1:
+            gen.setUnitID(units[idxFound].unitID)
+            isMatched[idxFound] = True
+            numMatched = numMatched + 1
 #    print "number of units matched: ", numMatched
-    
 
 # find the scheduleID from bid data
 def findUnitScheduleID(emsMarketModel, statusScheduleIDToIdx):
@@ -955,12 +1005,15 @@ def findUnitScheduleID(emsMarketModel, statusScheduleIDToIdx):
     bids = emsMarketModel.bidData
     scheduleStatus = emsMarketModel.scheduleStatus
     idxPeriod = emsMarketModel.idxPeriod
+    bidIdxesOfUnitID = {}
+    for idx, bid in enumerate(bids):
+        bidIdxesOfUnitID.setdefault(bid.unitID, []).append(idx)
     for gen in emsMarketModel.gens:
         unitID = gen.unitID
         if unitID == -1:
             gen.setUnitScheduleID(-1)
         else:
-            unitList = findValues(bids, unitID)
+            unitList = bidIdxesOfUnitID.get(unitID, [])
             if len(unitList) == 0:
                 gen.setUnitScheduleID(-2)
             else:
@@ -988,13 +1041,6 @@ def findPriceSchedule(bids, unitListValid):
     return idxUnitPriceScheduleID
             
                 
-def findValues(bids, unitID):
-    idxList = []
-    for i in range(0, len(bids)):
-        if bids[i].unitID == unitID:
-            idxList.append(i)
-    return idxList
-    
 def findValue(array, number):
     idx = 0
     for item in array:
@@ -1004,15 +1050,24 @@ def findValue(array, number):
     return -1
 
 import GeneralClasses
-# find the same hour item, if no same item, then, find the closest time period
-def findHourlyDataIdx(hourlyData, idxItems, date, hour):
+# find the same hour item, if no same item, then, find the closest time period;
+# hourTimes are the (hour number, index) of the items sorted by time: the
+# closest items are found by bisection, and of two equally close items the one
+# with the lower index is taken
+def findHourlyDataIdxSorted(hourTimes, date, hour):
+    hourNumber = GeneralClasses.calcHourNumber(date, hour)
+    pos = bisect.bisect_left(hourTimes, (hourNumber, -1))
     idxTarget = -1
     diffHour = float("inf")
-    for idx in idxItems:
-        diffHour2 = GeneralClasses.calcDiffHours(date, hour, hourlyData[idx].date, hourlyData[idx].hour)
-        if diffHour2 < diffHour:
-            diffHour = diffHour2
-            idxTarget = idx
+    if pos < len(hourTimes):
+        diffHour = hourTimes[pos][0] - hourNumber
+        idxTarget = hourTimes[pos][1]
+    if pos > 0:
+        hourNumberBefore = hourTimes[pos-1][0]
+        posBefore = bisect.bisect_left(hourTimes, (hourNumberBefore, -1))
+        diffHour2 = hourNumber - hourNumberBefore
+        if diffHour2 < diffHour or (diffHour2 == diffHour and hourTimes[posBefore][1] < idxTarget):
+            idxTarget = hourTimes[posBefore][1]
     return idxTarget
 
 
@@ -12,6 +12,7 @@ import RawGenericModel
 import RawEMSMarketModel
 
 import math
+import numpy as np
 
 #/////////////////////////// --- Read Generic Model Data --- ////////////////////////////
 def endOfRawItem(line):
@@ -154,6 +155,7 @@ def loadBranches(pf, myDiary):
     myDiary.hotline("Start to read raw file - branch data")
     numInSvc = 0
     branches = []
+    idxBrcOfKey = {}  # (frmBusNumber, toBusNumber, brcID) -> index of the first branch with that key
     line = pf.readline()
     while not endOfRawItem(line):
         branch = readBranchData(line)
@@ -161,6 +163,9 @@ def loadBranches(pf, myDiary):
         branch.setComment(comment)
         if branch.isInSvc == 1:
             numInSvc = numInSvc + 1
+        key = (branch.frmBusNumber, branch.toBusNumber, branch.brcID)
+        if key not in idxBrcOfKey:
+            idxBrcOfKey[key] = len(branches)
         branches.append(branch)
         line = pf.readline()
     
@@ -171,7 +176,7 @@ def loadBranches(pf, myDiary):
         frmBusNumber = int(strs[0])
         toBusNumber = int(strs[1])
         brcID = strs[2]
-        idxBrc = findIdxBranch(branches, frmBusNumber, toBusNumber, brcID)
+        idxBrc = idxBrcOfKey.get((frmBusNumber, toBusNumber, brcID), -1)
         if idxBrc != -1:
             xfmComment = GeneralFunctions.returnSpecialComments(line, '/*')
             xfmComment = removeXfmYinfo(xfmComment)
@@ -190,6 +195,8 @@ def removeXfmYinfo(xfmComment):
         xfmComment = xfmComment[:idx].rstrip()
     return xfmComment
 
+# linear search of a branch by (from, to, id); loadBranches and the models
+# (GenericModel/EMSMarketModel.findIdxBranch) use a dict keyed by (from, to, id) instead
 def findIdxBranch(branches, frmBusNumber, toBusNumber, brcID):
     idxBrc = -1
     for idx, branch in enumerate(branches):
@@ -203,12 +210,237 @@ def findIdxBranch(branches, frmBusNumber, toBusNumber, brcID):
         break
     return idxBrc
 
+# //---  Read me  ---//
+# Streaming RAW reader: the bus, load, gen and branch sections (and the
+# transformer names) are read in one pass straight into NumPy structured
+# arrays with the columns below, instead of one object per record; a string
+# column ('U') is sized to its longest value in the file. The lines of a
+# section are read chunkRows at a time and a chunk is parsed by np.loadtxt;
+# a chunk with a line loadtxt cannot split like getStrings (a delimiter or
+# an odd number of quotes inside quotes, double quotes, missing fields) is
+# parsed line by line instead. Use loadRawViews for Bus/Load/Gen/Branch-like objects.
+rawBusFields = [('busNumber', 'i8'), ('busKV', 'f8'), ('busType', 'i4'), ('busArea', 'i4'), ('busVm', 'f8'), ('busVa', 'f8')]
+rawLoadFields = [('busNumber', 'i8'), ('loadID', 'U'), ('isInSvc', 'i4'), ('Pload', 'f8'), ('comment', 'U')]
+rawGenFields = [('busNumber', 'i8'), ('genID', 'U'), ('isInSvc', 'i4'), ('PGen', 'f8'), ('PMax', 'f8'), ('PMin', 'f8'), ('comment', 'U')]
+rawBranchFields = [('frmBusNumber', 'i8'), ('toBusNumber', 'i8'), ('brcID', 'U'), ('isInSvc', 'i4'), ('R', 'f8'), ('X', 'f8'), \
+                   ('rateA', 'f8'), ('rateB', 'f8'), ('rateC', 'f8'), ('angle', 'f8'), ('comment', 'U'), ('xfmcomment', 'U')]
+
+# RAW fields read by np.loadtxt for each section: (name, field index, dtype)
+rawIdWidth = 16
+rawBusColumns = [('busNumber', 0, 'i8'), ('busKV', 2, 'f8'), ('busType', 3, 'i4'), ('busArea', 6, 'i4'), ('busVm', 8, 'f8'), ('busVa', 9, 'f8')]
+rawLoadColumns = [('busNumber', 0, 'i8'), ('loadID', 1, 'U%d' % rawIdWidth), ('isInSvc', 2, 'i4'), ('Pload', 5, 'f8')]
+rawGenColumns = [('busNumber', 0, 'i8'), ('genID', 1, 'U%d' % rawIdWidth), ('PGen', 2, 'f8'), ('isInSvc', 14, 'i4'), ('PMax', 16, 'f8'), ('PMin', 17, 'f8')]
+rawBranchColumns = [('frmBusNumber', 0, 'i8'), ('toBusNumber', 1, 'i8'), ('brcID', 2, 'U%d' % rawIdWidth), ('R', 3, 'f8'), ('X', 4, 'f8'), \
+                    ('rateA', 6, 'f8'), ('rateB', 7, 'f8'), ('rateC', 8, 'f8'), ('shift', 9, 'f8'), ('angle', 10, 'f8'), ('isInSvc', 15, 'i4')]
+
+# A RAW line without its comments if its fields are simply the delimited
+# pieces (no delimiter and an even number of quotes inside every quote,
+# no double quotes); None otherwise
+def getPlainRawBody(line):
+    body = line
+    idx = body.find("//")
+    if idx != -1:
+        body = body[:idx]
+    idx = body.find("/*")
+    if idx != -1:
+        body = body[:idx]
+    if '"' in body:
+        return None
+    if "'" in body:
+        parts = body.split("'")
+        if len(parts)%2 == 0 or ',' in "".join(parts[1::2]):
+            return None
+    return body
+
+def getRawComment(line):
+    if "/*" not in line:
+        return ''
+    return GeneralFunctions.returnSpecialComments(line, '/*')
+
+# per-line parsers, the same fields as readBusData, readLoadData, ...
+def parseRawBus(strs, line):
+    return (int(strs[0]), float(strs[2]), int(strs[3]), int(strs[6]), float(strs[8]), math.radians(float(strs[9])))
+
+def parseRawLoad(strs, line):
+    return (int(strs[0]), strs[1], int(strs[2]), float(strs[5]), getRawComment(line))
+
+def parseRawGen(strs, line):
+    return (int(strs[0]), strs[1], int(strs[14]), float(strs[2]), float(strs[16]), float(strs[17]), \
+            removeY(getRawComment(line)))
+
+def parseRawBranch(strs, line):
+    angle = 0.0
+    if float(strs[9]) != 0:
+        angle = float(strs[10])
+    return (abs(int(strs[0])), abs(int(strs[1])), strs[2], int(strs[15]), float(strs[3]), float(strs[4]), \
+            float(strs[6]), float(strs[7]), float(strs[8]), angle, getRawComment(line), "")
+
+# chunk finishers: from the np.loadtxt values of rawXxxColumns to the columns of rawXxxFields
+def finishRawBus(values, lines):
+    return {'busVa': np.radians(values['busVa'])}
+
+def finishRawLoad(values, lines):
+    return {'loadID': np.char.strip(values['loadID']), 'comment': [getRawComment(line) for line in lines]}
+
+def finishRawGen(values, lines):
+    return {'genID': np.char.strip(values['genID']), 'comment': [removeY(getRawComment(line)) for line in lines]}
+
+def finishRawBranch(values, lines):
+    return {'frmBusNumber': np.abs(values['frmBusNumber']), 'toBusNumber': np.abs(values['toBusNumber']), \
+            'brcID': np.char.strip(values['brcID']), 'angle': np.where(values['shift'] != 0, values['angle'], 0.0), \
+            'comment': [getRawComment(line) for line in lines], 'xfmcomment': [""]*len(lines)}
+
+rawSections = {'bus': [rawBusFields, rawBusColumns, parseRawBus, finishRawBus], \
+               'load': [rawLoadFields, rawLoadColumns, parseRawLoad, finishRawLoad], \
+               'gen': [rawGenFields, rawGenColumns, parseRawGen, finishRawGen], \
+               'branch': [rawBranchFields, rawBranchColumns, parseRawBranch, finishRawBranch]}
+
+# dtype of rawFields with each string column sized to widths[name]
+def rawRecordDtype(rawFields, widths):
+    dtype = []
+    for name, kind in rawFields:
+        if kind == 'U':
+            kind = 'U' + str(max(1, widths[name]))
+        dtype.append((name, kind))
+    return np.dtype(dtype)
+
+# width of each string column of rawFields in columns (arrays or lists of str)
+def rawStringWidths(rawFields, columns):
+    widths = {}
+    for name, kind in rawFields:
+        if kind == 'U':
+            column = columns[name]
+            if isinstance(column, np.ndarray):
+                widths[name] = int(np.char.str_len(column).max(initial=0))
+            else:
+                widths[name] = max([0] + [len(elem) for elem in column])
+    return widths
+
+# parse the lines of one chunk of a section into a structured array
+def readRawChunk(lines, section):
+    rawFields, rawColumns, parseRecord, finishChunk = rawSections[section]
+    bodies = [getPlainRawBody(line) for line in lines]
+    if None not in bodies:
+        try:
+            values = np.loadtxt(bodies, delimiter=',', comments=None, ndmin=1, \
+                                usecols=[col for name, col, kind in rawColumns], \
+                                dtype=[(name, kind) for name, col, kind in rawColumns])
+        except ValueError:
+            values = None
+        if values is not None and len(values) == len(lines):
+            columns = finishChunk(values, lines)
+            for name, kind in rawFields:
+                if name not in columns:
+                    columns[name] = values[name]
+            widths = rawStringWidths(rawFields, columns)
+            if max([0] + [widths[name] for name, col, kind in rawColumns if kind.startswith('U')]) < rawIdWidth:
+                records = np.empty(len(lines), dtype=rawRecordDtype(rawFields, widths))
+                for name, kind in rawFields:
+                    records[name] = columns[name]
+                return records
+    rows = [parseRecord(getStrings(line), line) for line in lines]
+    columns = dict((name, [row[j] for row in rows]) for j, (name, kind) in enumerate(rawFields))
+    return np.array(rows, dtype=rawRecordDtype(rawFields, rawStringWidths(rawFields, columns)))
+
+# read one RAW section, up to its "0 / END OF ..." line, into a structured array
+def readRawSection(pf, section, chunkRows=4096):
+    rawFields = rawSections[section][0]
+    chunks = []
+    lines = []
+    line = pf.readline()
+    while not endOfRawItem(line):
+        lines.append(line)
+        if len(lines) == chunkRows:
+            chunks.append(readRawChunk(lines, section))
+            lines = []
+        line = pf.readline()
+    if len(lines) > 0 or len(chunks) == 0:
+        chunks.append(readRawChunk(lines, section))
+    if len(chunks) == 1:
+        return chunks[0]
+    widths = {}
+    for name, kind in rawFields:
+        if kind == 'U':
+            widths[name] = max([chunk.dtype[name].itemsize//4 for chunk in chunks])
+    records = np.empty(sum([len(chunk) for chunk in chunks]), dtype=rawRecordDtype(rawFields, widths))
+    start = 0
+    for chunk in chunks:
+        records[start:(start+len(chunk))] = chunk
+        start = start + len(chunk)
+    return records
+
+# set the xfmcomment of the branches named in the transformer section;
+# a transformer is matched to the first branch with the same (from, to, id)
+def readRawXfmComments(pf, branches):
+    xfmComments = {}
+    line = pf.readline()
+    while not endOfRawItem(line):
+        strs = getStrings(line)
+        key = (int(strs[0]), int(strs[1]), strs[2])
+        xfmComments[key] = removeXfmYinfo(getRawComment(line))
+        line = pf.readline()
+    if len(xfmComments) == 0:
+        return branches
+    # only the branches between the buses of a transformer are looked at
+    busPairs = np.array([[key[0], key[1]] for key in xfmComments], dtype=np.int64)
+    scale = int(max(branches['toBusNumber'].max(initial=0), np.abs(busPairs[:, 1]).max())) + 1
+    candidates = np.nonzero(np.isin(branches['frmBusNumber']*scale + branches['toBusNumber'], \
+                                    busPairs[:, 0]*scale + busPairs[:, 1]))[0]
+    comments = {}
+    for idx in candidates.tolist():
+        key = (int(branches['frmBusNumber'][idx]), int(branches['toBusNumber'][idx]), str(branches['brcID'][idx]))
+        if key in xfmComments and key not in comments:
+            comments[key] = idx
+    if len(comments) == 0:
+        return branches
+    widths = dict((name, branches.dtype[name].itemsize//4) for name in ['brcID', 'comment', 'xfmcomment'])
+    widths['xfmcomment'] = max([widths['xfmcomment']] + [len(xfmComments[key]) for key in comments])
+    branches = branches.astype(rawRecordDtype(rawBranchFields, widths))
+    for key, idx in comments.items():
+        branches['xfmcomment'][idx] = xfmComments[key]
+    return branches
+
+# //---  Read me  ---//
+# Read the bus, load, gen and branch data of a RAW file in one pass;
+# return [buses, loads, gens, branches] as structured arrays (see rawBusFields, ...)
+def readRawFile(fileName, myDiary, numHeaderLines=3):
+    myDiary.hotline("Start to read raw file " + fileName + " into arrays")
+    with open(fileName, "r") as pf:
+        GeneralFunctions.skipNLines(pf, numHeaderLines)
+        buses = readRawSection(pf, 'bus')
+        loads = readRawSection(pf, 'load')
+        gens = readRawSection(pf, 'gen')
+        branches = readRawSection(pf, 'branch')
+        branches = readRawXfmComments(pf, branches)
+    myDiary.hotline("Finish reading raw file " + fileName + " into arrays")
+    myDiary.hotlineWithLogType(6, "   there are " + str(len(buses)) + " buses")
+    isInSvc = loads['isInSvc'] == 1
+    myDiary.hotlineWithLogType(6, "   there are " + str(len(loads)) + " loads")
+    myDiary.hotlineWithLogType(6, "   there are " + str(int(isInSvc.sum())) + " in-service loads" )
+    myDiary.hotlineWithLogType(6, "   the total in-service load in MW is: " + str(float(loads['Pload'][isInSvc].sum())))
+    isInSvc = gens['isInSvc'] == 1
+    myDiary.hotlineWithLogType(6, "   there are " + str(len(gens)) + " generators")
+    myDiary.hotlineWithLogType(6, "   there are " + str(int(isInSvc.sum())) + " in-service generators" )
+    myDiary.hotlineWithLogType(6, "   the total in-service generation capacity in MW is: " + str(float(gens['PMax'][isInSvc].sum())))
+    myDiary.hotlineWithLogType(6, "   there are " + str(len(branches)) + " branches")
+    myDiary.hotlineWithLogType(6, "   there are " + str(int((branches['isInSvc'] == 1).sum())) + " in-service branches" )
+    return [buses, loads, gens, branches]
+
+# Read a RAW file with readRawFile and return [buses, loads, gens, branches]
+# as lists of object views (RawGenericModel.BusView, ...) of the arrays,
+# for the code written for loadBuses/loadLoads/loadGens/loadBranches.
+def loadRawViews(fileName, myDiary, numHeaderLines=3):
+    records = readRawFile(fileName, myDiary, numHeaderLines)
+    viewClasses = [RawGenericModel.BusView, RawGenericModel.LoadView, RawGenericModel.GenView, RawGenericModel.BranchView]
+    return [RawGenericModel.recordViews(records[idx], viewClasses[idx]) for idx in range(0, len(records))]
+
+
 def splitStrings(strs, num):
     strings = []
     for i in range(num):
         temp = []
         strings.append(temp)
-    size = len(strs)/num
+    size = len(strs)//num
     for i in range(size):
         for j in range(num):
             strings[j].append(strs[i*num+j])
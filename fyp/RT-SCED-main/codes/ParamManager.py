@@ -23,6 +23,13 @@ class ParamManager:
         self.pyomoDataFormatInputFileGC = 'pyomoDataForGenericCaseModel.dat'   
 
         self.isPositivePgPmaxPminNeeded = False
+        self.buildModelInMemory = False
+        self.useMatrixLPEngine = False
+        self.useCompactContingency = False
+        self.useContingencyScreening = False
+        self.usePersistentSolver = False
+        self.useBendersDecomposition = False
+        self.numDecompositionJobs = 1
         
         # parse the configure file
         with open(configFilePath, 'r') as configFile:
@@ -61,6 +68,38 @@ class ParamManager:
                         self.isPositivePgPmaxPminNeeded = True
                     else:
                         self.isPositivePgPmaxPminNeeded = False
+                elif key == 'buildModelInMemory':
+                    if value.lower() == 'true':
+                        self.buildModelInMemory = True
+                    else:
+                        self.buildModelInMemory = False
+                elif key == 'useMatrixLPEngine':
+                    if value.lower() == 'true':
+                        self.useMatrixLPEngine = True
+                    else:
+                        self.useMatrixLPEngine = False
+                elif key == 'useCompactContingency':
+                    if value.lower() == 'true':
+                        self.useCompactContingency = True
+                    else:
+                        self.useCompactContingency = False
+                elif key == 'useContingencyScreening':
+                    if value.lower() == 'true':
+                        self.useContingencyScreening = True
+                    else:
+                        self.useContingencyScreening = False
+                elif key == 'useBendersDecomposition':
+                    if value.lower() == 'true':
+                        self.useBendersDecomposition = True
+                    else:
+                        self.useBendersDecomposition = False
+                elif key == 'numDecompositionJobs':
+                    self.numDecompositionJobs = int(value)
+                elif key == 'usePersistentSolver':
+                    if value.lower() == 'true':
+                        self.usePersistentSolver = True
+                    else:
+                        self.usePersistentSolver = False
                 elif key == 'handle_CostCurveSegment_Pgmin':
                     if value.lower() == 'true':
                         self.handle_CostCurveSegment_Pgmin = True
@@ -166,6 +205,20 @@ class ParamManager:
         return self.generatePyomoDataFiles
     def getNeedHeading(self):
         return self.needHeading
+    def getBuildModelInMemory(self):
+        return self.buildModelInMemory
+    def getUseMatrixLPEngine(self):
+        return self.useMatrixLPEngine
+    def getUseCompactContingency(self):
+        return self.useCompactContingency
+    def getUseContingencyScreening(self):
+        return self.useContingencyScreening
+    def getUsePersistentSolver(self):
+        return self.usePersistentSolver
+    def getUseBendersDecomposition(self):
+        return self.useBendersDecomposition
+    def getNumDecompositionJobs(self):
+        return self.numDecompositionJobs
     def getIsPositivePgPmaxPminNeeded(self):
         return self.isPositivePgPmaxPminNeeded
     def getHandle_CostCurveSegment_Pgmin(self):
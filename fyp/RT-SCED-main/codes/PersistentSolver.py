@@ -0,0 +1,216 @@
+"""
+Persistent solver session: one model instance kept in one solver across
+consecutive SCED solves (intervals, scenarios, screening iterations).
+
+Website: https://rpglab.github.io/resources/RT-SCED_Python/
+"""
+
+import time
+from pyomo.environ import SolverFactory, Constraint, Var, Objective
+from pyomo.core.expr.visitor import identify_mutable_parameters
+
+
+# Time limit / optimization gap option names of the legacy persistent interfaces
+legacyOptionNames = {
+    'gurobi_persistent': ['TimeLimit', 'MIPGap'],
+    'cplex_persistent': ['timelimit', 'mip_tolerances_mipgap'],
+    'xpress_persistent': ['maxtime', 'miprelstop'],
+}
+
+
+# //---  Read me  ---//
+# The instance is handed to the solver once. Between solves the caller only
+# changes mutable Params (Load_pd, Gen_pgInit, Gen_pgMax, Solar_pgMax, ...),
+# either directly on the instance or through update(); each solve then only
+# pushes the changed coefficients/bounds to the solver and re-optimizes from
+# the previous basis instead of regenerating and re-reading the whole model.
+#   - appsi solvers (e.g. appsi_highs): the appsi persistent model is reused and
+#     only the parameter update is switched on.
+#   - legacy persistent solvers (gurobi_persistent, cplex_persistent, ...):
+#     constraints and variable bounds that use a changed Param are re-sent.
+#   - any other solver falls back to a regular solve of the whole instance.
+# Constraints created after the first solve (e.g. by contingency screening)
+# must be reported with addConstraints(); constraints (de)activated and
+# variables fixed/unfixed (e.g. by a ScenarioOverlay) with updateComponents().
+class PersistentSCEDSession:
+    def __init__(self, instance, solverName, myDiary=None, timeLimit=None, optGap=None):
+        self.instance = instance
+        self.solverName = solverName
+        self.myDiary = myDiary
+        self.opt = SolverFactory(solverName)
+        self.isAppsi = solverName.startswith('appsi_')
+        self.isLegacyPersistent = (not self.isAppsi) and hasattr(self.opt, 'set_instance')
+        self.numSolve = 0
+        self.newConstraints = []
+        self.changedConstraints = {}
+        self.changedVars = {}
+        self.removedConstraints = set()  # ids of deactivated constraints that are not in the solver model
+        self.paramUsers = {}
+        self.paramValues = {}
+        self.setOptions(timeLimit, optGap)
+
+    def setOptions(self, timeLimit, optGap):
+        if self.isAppsi:
+            if timeLimit is not None:
+                self.opt.config.time_limit = float(timeLimit)
+            if optGap is not None:
+                self.opt.config.mip_gap = float(optGap)
+        elif self.solverName in legacyOptionNames:
+            names = legacyOptionNames[self.solverName]
+            if timeLimit is not None:
+                self.opt.options[names[0]] = float(timeLimit)
+            if optGap is not None:
+                self.opt.options[names[1]] = float(optGap)
+        else:
+            if timeLimit is not None:
+                self.opt.options['tmlim'] = timeLimit  # tmlim is for glpk
+            if optGap is not None:
+                self.opt.options['mipgap'] = optGap
+
+    def isPersistent(self):
+        return self.isAppsi or self.isLegacyPersistent
+
+    # Set mutable Params: paramValues is {paramName: {index: value}}
+    def update(self, paramValues):
+        for name in paramValues:
+            param = getattr(self.instance, name)
+            for idx in paramValues[name]:
+                param[idx] = paramValues[name][idx]
+
+    def addConstraints(self, constraints):
+        self.newConstraints.extend(constraints)
+
+    def updateComponents(self, constraints=(), variables=()):
+        for con in constraints:
+            self.changedConstraints[id(con)] = con
+        for var in variables:
+            self.changedVars[id(var)] = var
+
+    # Send the constraints (de)activated and the variables changed since the last solve
+    def _pushComponentChanges(self, isFirstSolve):
+        toAdd = []
+        toRemove = []
+        for key in self.changedConstraints:
+            con = self.changedConstraints[key]
+            if isFirstSolve:
+                if not con.active:
+                    self.removedConstraints.add(key)
+            elif con.active and key in self.removedConstraints:
+                toAdd.append(con)
+                self.removedConstraints.discard(key)
+            elif not con.active and key not in self.removedConstraints:
+                toRemove.append(con)
+                self.removedConstraints.add(key)
+        variables = list(self.changedVars.values())
+        self.changedConstraints = {}
+        self.changedVars = {}
+        if isFirstSolve:
+            return
+        if self.isAppsi:
+            if len(toRemove) > 0:
+                self.opt.remove_constraints(toRemove)
+            if len(toAdd) > 0:
+                self.opt.add_constraints(toAdd)
+            for var in variables:
+                try:
+                    self.opt.update_variables([var])
+                except KeyError:
+                    pass  # the variable is not used by the solver model
+        elif self.isLegacyPersistent:
+            for con in toRemove:
+                self.opt.remove_constraint(con)
+            self.newConstraints.extend(toAdd)
+            for var in variables:
+                try:
+                    self.opt.update_var(var)
+                except (KeyError, ValueError):
+                    pass  # the variable is not used by the solver model
+
+    # Map every mutable Param used by a constraint/variable bound/objective to its users
+    def _collectParamUsers(self):
+        self.paramUsers = {}
+        for con in self.instance.component_data_objects(Constraint, active=True):
+            self._addParamUser(con, [con.body, con.lower, con.upper])
+        for var in self.instance.component_data_objects(Var):
+            self._addParamUser(var, [var.lower, var.upper])
+        for obj in self.instance.component_data_objects(Objective, active=True):
+            self._addParamUser(obj, [obj.expr])
+        self.paramValues = dict((id(p), [p, p.value]) for p, users in self.paramUsers.values())
+
+    def _addParamUser(self, component, exprs):
+        for expr in exprs:
+            if expr is None:
+                continue
+            for p in identify_mutable_parameters(expr):
+                self.paramUsers.setdefault(id(p), [p, []])[1].append(component)
+
+    # Re-send the constraints, bounds and objective that use a changed Param
+    def _updateLegacyInstance(self):
+        changed = {}
+        for key in self.paramValues:
+            p, oldValue = self.paramValues[key]
+            if p.value != oldValue:
+                self.paramValues[key][1] = p.value
+                for component in self.paramUsers[key][1]:
+                    changed[id(component)] = component
+        for component in changed.values():
+            if component.ctype is Constraint:
+                self.opt.remove_constraint(component)
+                self.opt.add_constraint(component)
+            elif component.ctype is Var:
+                self.opt.update_var(component)
+            else:
+                self.opt.set_objective(component)
+        for con in self.newConstraints:
+            self.opt.add_constraint(con)
+            self._addParamUser(con, [con.body, con.lower, con.upper])
+        for key in self.paramUsers:
+            if key not in self.paramValues:
+                self.paramValues[key] = [self.paramUsers[key][0], self.paramUsers[key][0].value]
+        return len(changed)
+
+    def _configureAppsiUpdate(self, isFirstSolve):
+        config = self.opt.update_config
+        config.check_for_new_or_removed_constraints = isFirstSolve
+        config.check_for_new_or_removed_vars = isFirstSolve
+        config.check_for_new_or_removed_params = isFirstSolve
+        config.check_for_new_objective = isFirstSolve
+        config.update_constraints = isFirstSolve
+        config.update_vars = isFirstSolve
+        config.update_named_expressions = isFirstSolve
+        config.update_objective = isFirstSolve
+        config.update_params = True
+
+    # solveArgs are those of opt.solve; the instance argument is accepted so that
+    # the session can be used wherever a SolverFactory object is expected.
+    def solve(self, instance=None, **solveArgs):
+        t0 = time.time()
+        isFirstSolve = (self.numSolve == 0)
+        if self.isAppsi:
+            solveArgs.pop('suffixes', None)  # not supported by the appsi legacy interface
+            self._configureAppsiUpdate(isFirstSolve)
+            self._pushComponentChanges(isFirstSolve)
+            if not isFirstSolve and len(self.newConstraints) > 0:
+                self.opt.add_constraints(self.newConstraints)
+            results = self.opt.solve(self.instance, **solveArgs)
+        elif self.isLegacyPersistent:
+            self._pushComponentChanges(isFirstSolve)
+            if isFirstSolve:
+                self.opt.set_instance(self.instance)
+                self._collectParamUsers()
+            else:
+                numChanged = self._updateLegacyInstance()
+                if self.myDiary is not None:
+                    self.myDiary.hotlineWithLogType(0, "Persistent solver: " + str(numChanged) + " model components updated")
+            results = self.opt.solve(**solveArgs)
+        else:
+            self.changedConstraints = {}
+            self.changedVars = {}
+            results = self.opt.solve(self.instance, **solveArgs)
+        self.newConstraints = []
+        self.numSolve = self.numSolve + 1
+        if self.myDiary is not None:
+            self.myDiary.hotlineWithLogType(6, "Solve " + str(self.numSolve) + " with " + self.solverName
+                                            + (" (persistent)" if self.isPersistent() else "") + " took "
+                                            + format(time.time() - t0, '.3f') + " seconds")
+        return results
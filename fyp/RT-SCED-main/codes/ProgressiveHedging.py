@@ -0,0 +1,195 @@
+"""
+Progressive hedging for the two-stage stochastic SCED of the generic case
+(see StochasticSCED): every scenario is a SCEDGenericCaseModel instance of its
+own, solved again at each iteration with a persistent solver; the scenario
+subproblems are spread over a set of worker processes that keep their
+instances from one iteration to the next.
+
+How to run: see ExecuteScenarios.py (--stochastic --method ph)
+
+Website: https://rpglab.github.io/resources/RT-SCED_Python/
+"""
+
+import time
+from pyomo.environ import Set, Param, Var, Constraint, Objective, NonNegativeReals, value
+
+import SCEDGenericCaseMatrixModel
+import PersistentSolver
+import StochasticSCED
+import WorkerPool
+from SCEDGenericCaseModel import model as SCEDModel
+
+
+# Breakpoints (in per unit) of the tangent lines approximating the quadratic
+# proximal term rho/2*(x - xbar)^2, which keeps the subproblems LPs.
+proxBreakpoints = [-1.0, -0.5, -0.2, -0.1, -0.05, -0.02, -0.01, -0.005, -0.002, -0.001, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0]
+
+
+# //---  Read me  ---//
+# Add the first stage and the progressive hedging terms to a scenario instance:
+#   - PH_GEN: the conventional units (StochasticSCED.getFirstStageGens);
+#   - pgSchedule[g]: the scenario's copy of the first-stage schedule, from
+#     which its dispatch may deviate by up to its reserve, as in the extensive
+#     form: -sr[g] <= pg[g] - pgSchedule[g] <= sr[g] (recourseUp/Down);
+#   - PH_VAR: the first-stage variables, ('pgSchedule', g) and ('sr', g) for g in PH_GEN;
+#   - phW, phXbar, phRho: mutable Params set at every iteration, so that the
+#     persistent solver only updates coefficients;
+#   - phProx[v] >= phRho*(a*(x[v] - phXbar[v]) - a^2/2) for every breakpoint a;
+#   - phObjective: minimizeCost + sum of phW[v]*x[v] + sum of phProx[v].
+def addProgressiveHedgingTerms(instance):
+    instance.PH_GEN = Set(initialize=StochasticSCED.getFirstStageGens(instance))
+    instance.pgSchedule = Var(instance.PH_GEN, initialize=0)
+
+    def const_RecourseUp(instance, g):
+        return instance.pg[g] - instance.pgSchedule[g] <= instance.sr[g]
+    instance.recourseUp = Constraint(instance.PH_GEN, rule=const_RecourseUp)
+
+    def const_RecourseDown(instance, g):
+        return instance.pg[g] - instance.pgSchedule[g] >= -instance.sr[g]
+    instance.recourseDown = Constraint(instance.PH_GEN, rule=const_RecourseDown)
+
+    instance.PH_VAR = Set(dimen=2, initialize=[(name, g) for name in ['pgSchedule', 'sr'] for g in instance.PH_GEN])
+    instance.PH_BREAKPOINT = Set(initialize=range(len(proxBreakpoints)))
+    instance.phW = Param(instance.PH_VAR, mutable=True, initialize=0)
+    instance.phXbar = Param(instance.PH_VAR, mutable=True, initialize=0)
+    instance.phRho = Param(mutable=True, initialize=0)
+    instance.phProx = Var(instance.PH_VAR, within=NonNegativeReals, initialize=0)
+
+    def getVar(instance, v):
+        return getattr(instance, v[0])[v[1]]
+
+    def const_PhProx(instance, name, g, i):
+        a = proxBreakpoints[i]
+        return instance.phProx[name, g] >= instance.phRho*(a*(getVar(instance, (name, g)) - instance.phXbar[name, g]) - a*a/2)
+    instance.phProxConst = Constraint(instance.PH_VAR, instance.PH_BREAKPOINT, rule=const_PhProx)
+
+    def phObj(instance):
+        expr = instance.minimizeCost.expr
+        expr += sum(instance.phW[v]*getVar(instance, v) for v in instance.PH_VAR)
+        expr += sum(instance.phProx[v] for v in instance.PH_VAR)
+        return expr
+    instance.minimizeCost.deactivate()
+    instance.phObjective = Objective(rule=phObj)
+
+
+# Scenario subproblems of one worker, each with its own instance and persistent
+# solver session, built on first use.
+class scenarioSubproblems:
+    def __init__(self, caseData, settings):
+        self.caseData = caseData  # {scenario: data}
+        self.settings = settings
+        self.instances = {}
+        self.sessions = {}
+
+    def getInstance(self, s):
+        if s not in self.instances:
+            instance = SCEDModel.create_instance(data=self.caseData[s])
+            addProgressiveHedgingTerms(instance)
+            self.instances[s] = instance
+            self.sessions[s] = PersistentSolver.PersistentSCEDSession(instance, self.settings["solverName"], None,
+                                                                      self.settings["timeLimit"], self.settings["optGap"])
+        return self.instances[s]
+
+    # Solve every scenario with its weights w[s] and the common xbar and rho;
+    # returns {scenario: [status, cost, {v: x}, seconds]}
+    def solve(self, xbar, w, rho):
+        solutions = {}
+        for s in self.caseData:
+            t0 = time.time()
+            try:
+                instance = self.getInstance(s)
+                instance.phRho = rho
+                for v in instance.PH_VAR:
+                    instance.phXbar[v] = xbar.get(v, 0.0)
+                    instance.phW[v] = w[s].get(v, 0.0)
+                results = self.sessions[s].solve()
+                status = str(results.solver.termination_condition)
+                x = dict((v, value(getattr(instance, v[0])[v[1]])) for v in instance.PH_VAR)
+                solutions[s] = [status, value(instance.minimizeCost), x, time.time() - t0]
+            except Exception as e:
+                solutions[s] = ["failed: " + str(e), None, None, time.time() - t0]
+        return solutions
+
+
+# //---  Read me  ---//
+# Progressive hedging (Rockafellar and Wets) on the first-stage schedule and
+# spinning reserve of the conventional units:
+#   iteration 0: every scenario is solved alone (w = 0, rho = 0);
+#   xbar = sum of probability[s]*x[s];  w[s] = w[s] + rho*(x[s] - xbar);
+#   then every scenario is solved with its w[s] and the proximal term around
+#   xbar, until the probability-weighted distance of the scenario solutions to
+#   xbar (in MW) is below tol.
+# Each worker process owns a fixed set of scenarios for all iterations, so its
+# instances stay in the solver and only the Params change between iterations.
+# rho is in objective units per per-unit of first-stage variable; it has to be
+# large next to the generation prices (objective = BaseMVA*price*pg) for the
+# scenarios to agree, e.g. 1e4 for the generic case.
+class ProgressiveHedging:
+    def __init__(self, stochasticSCED, myDiary):
+        self.stochasticSCED = stochasticSCED
+        self.myDiary = myDiary
+        self.settings = {"solverName": stochasticSCED.solverName,
+                         "timeLimit": stochasticSCED.timeLimit,
+                         "optGap": stochasticSCED.optGap}
+        self.names = []
+        self.xbar = {}
+        self.history = []
+        self.baseMVA = 100.0
+
+    def run(self, names, scenarios, probabilities, jobs=1, rho=10000.0, maxIteration=100, tol=0.5):
+        t0 = time.time()
+        self.names = list(names)
+        self.history = []
+        caseData = dict((s, data) for s, data in enumerate(StochasticSCED.getScenarioCaseData(self.stochasticSCED.baseData, scenarios)))
+        self.baseMVA = SCEDGenericCaseMatrixModel.getScalar(caseData[0][None], "BaseMVA")
+        probability = dict(enumerate(probabilities))
+        w = dict((s, {}) for s in caseData)
+        xbar = {}
+        self.myDiary.hotlineWithLogType(5, "Progressive hedging with " + str(len(caseData)) + " scenarios, " + str(jobs)
+                                        + " job(s), rho " + str(rho))
+        workers = WorkerPool.WorkerPool(scenarioSubproblems, WorkerPool.splitIntoGroups(caseData, jobs), self.settings)
+        try:
+            for iteration in range(maxIteration+1):
+                t1 = time.time()
+                iterationRho = 0.0 if iteration == 0 else rho
+                solutions = workers.solve(lambda group: (xbar, dict((s, w[s]) for s in group), iterationRho))
+                failed = [s for s in solutions if solutions[s][2] is None or not solutions[s][0].startswith("optimal")]
+                if len(failed) > 0:
+                    raise RuntimeError("Progressive hedging: scenario " + self.names[failed[0]] + " " + solutions[failed[0]][0])
+                keys = list(solutions[0][2])
+                xbar = dict((v, sum(probability[s]*solutions[s][2][v] for s in solutions)) for v in keys)
+                for s in solutions:
+                    for v in keys:
+                        w[s][v] = w[s].get(v, 0.0) + rho*(solutions[s][2][v] - xbar[v])
+                distance = sum(probability[s]*sum(abs(solutions[s][2][v] - xbar[v]) for v in keys) for s in solutions)*self.baseMVA
+                maxDeviation = max(abs(solutions[s][2][v] - xbar[v]) for s in solutions for v in keys)*self.baseMVA
+                expectedCost = sum(probability[s]*solutions[s][1] for s in solutions)
+                self.history.append([iteration, distance, maxDeviation, expectedCost, time.time() - t1])
+                self.myDiary.hotlineWithLogType(6, "Progressive hedging iteration " + str(iteration) + ": distance to xbar "
+                                                + format(distance, '.4f') + " MW, max deviation " + format(maxDeviation, '.4f')
+                                                + " MW, expected cost " + format(expectedCost, '.4f') + ", "
+                                                + format(time.time() - t1, '.3f') + " seconds")
+                if iteration > 0 and distance < tol:
+                    self.myDiary.hotlineWithLogType(5, "Progressive hedging converged in " + str(iteration) + " iterations, "
+                                                    + format(time.time() - t0, '.2f') + " seconds")
+                    break
+            else:
+                self.myDiary.hotlineWithLogType(1, "Progressive hedging stopped after " + str(maxIteration)
+                                                + " iterations without convergence")
+        finally:
+            workers.close()
+        self.xbar = xbar
+        return xbar
+
+    # First-stage schedule (MW) and the convergence of every iteration
+    def writeResults(self, fileName):
+        with open(fileName, "w") as f:
+            f.write("gen pgMW srMW\n")
+            gens = [v[1] for v in self.xbar if v[0] == 'pgSchedule']
+            for g in gens:
+                f.write(str(g) + " " + format(self.xbar['pgSchedule', g]*self.baseMVA, '.4f') + " "
+                        + format(self.xbar['sr', g]*self.baseMVA, '.4f') + "\n")
+            f.write("iteration distanceMW maxDeviationMW expectedCost seconds\n")
+            for iteration, distance, maxDeviation, expectedCost, seconds in self.history:
+                f.write(str(iteration) + " " + format(distance, '.4f') + " " + format(maxDeviation, '.4f') + " "
+                        + format(expectedCost, '.4f') + " " + format(seconds, '.3f') + "\n")
@@ -0,0 +1,36 @@
+"""
+Loading of the generic-case pyomo data (.dat) files into pyomo dict-data.
+
+The dict-data is the {None: {...}} structure taken by
+SCEDModel.create_instance(data=...); it is shared by the matrix-form engine,
+the Benders decomposition, the scenario runner and the stochastic SCED.
+
+Website: https://rpglab.github.io/resources/RT-SCED_Python/
+"""
+
+
+# name of each set of SCEDGenericCaseModel
+setNames = ["BUS", "LOAD", "GEN", "GENCOST", "BRANCH", "SOLAR_GEN", "WIND_GEN",
+            "INTERFACE", "INTERFACELINE", "CONTINGENCY", "CONTINGENCYLINE"]
+
+
+# Read a pyomo-format .dat file of the generic case into pyomo dict-data,
+# i.e. the same {None: {...}} structure taken by SCEDModel.create_instance(data=...)
+def loadPyomoDataFile(fileName):
+    from pyomo.environ import DataPortal
+    from SCEDGenericCaseModel import model as SCEDModel
+    portal = DataPortal(model=SCEDModel, filename=fileName)
+    data = {}
+    for name in portal.keys():
+        data[name] = dict(portal[name]) if isinstance(portal[name], dict) else {None: portal[name]}
+    for name in setNames:
+        if name in data and None not in data[name]:
+            data[name] = {None: list(data[name])}
+    return {None: data}
+
+
+# Members of a set of the case data (the {...} under None), [] if absent
+def getSet(case, name):
+    if name not in case:
+        return []
+    return list(case[name][None])
@@ -6,6 +6,8 @@ Created in 2016
 Website: https://rpglab.github.io/resources/RT-SCED_Python/
 """
 
+import RawGenericModel
+
 class EMSMarketModel:
     ' Store all EMS-Market data'
     def __init__(self, buses, loads, gens, branches, flowgates, aolDFAX, \
@@ -21,6 +23,11 @@ class EMSMarketModel:
         self.hourlyData = hourlyData
         self.scheduleStatus = scheduleStatus
         self.costCurve = costCurve  # contains [energyOffers, multiRampRates, spinRampRate]
+        self.branchIdxOfKey = None  # (frmBusNumber, toBusNumber, brcID) -> branch index, built on the first findIdxBranch
+    def findIdxBranch(self, frmBusNumber, toBusNumber, brcID):
+        if self.branchIdxOfKey is None:
+            self.branchIdxOfKey = RawGenericModel.buildBranchIndex(self.branches)
+        return self.branchIdxOfKey.get((frmBusNumber, toBusNumber, brcID), -1)
     def setUnits(self, units):
         self.units = units
     def setDate(self, date):   # date = GeneralClasses.Date(MM, DD, YY)
@@ -16,6 +16,23 @@ class GenericModel:
         self.gensCostCurveOutput = gensCostCurveOutput
         self.gensMultiRamp = gensMultiRamp  
         self.gensSpinRamp = gensSpinRamp
+        self.branchIdxOfKey = None  # built on the first findIdxBranch
+    def findIdxBranch(self, frmBusNumber, toBusNumber, brcID):
+        if self.branchIdxOfKey is None:
+            self.branchIdxOfKey = buildBranchIndex(self.branches)
+        return self.branchIdxOfKey.get((frmBusNumber, toBusNumber, brcID), -1)
+
+
+# //---  Read me  ---//
+# Index of branches: (frmBusNumber, toBusNumber, brcID) -> position of the
+# first branch with that key in branches, so that a (from, to, id) reference
+# is matched with one dict lookup instead of a scan of the branch list.
+def buildBranchIndex(branches):
+    idxBrcOfKey = {}
+    for idx, key in enumerate(recordRows(branches, ['frmBusNumber', 'toBusNumber', 'brcID'])):
+        if key not in idxBrcOfKey:
+            idxBrcOfKey[key] = idx
+    return idxBrcOfKey
 
 
 class Bus:
@@ -102,6 +119,79 @@ class Branch:
         self.pkInitMVA = pkInitMVA
     
 
+# //---  Read me  ---//
+# Object views of the rows of a structured array read by LoadInitFiles.readRawFile.
+# A view is created as e.g. GenView, holding only the array and the row index.
+# The first read of a column copies the row into the attributes of the view
+# and turns it into its rowClass (GenRow: the same class without __getattr__),
+# so every read after it is a plain attribute read. Views that are only
+# written through recordRows are never filled. A column set on the view before
+# its first read (setComment, ...) is kept.
+class RecordRow:
+    def __init__(self, records, idx):
+        self._records = records
+        self._idx = idx
+
+class RecordView(RecordRow):
+    def __getattr__(self, name):
+        records = self.__dict__.get('_records')
+        if records is None or name not in records.dtype.fields:
+            raise AttributeError(name)
+        for field, value in zip(records.dtype.names, records[self._idx].item()):
+            self.__dict__.setdefault(field, value)
+        self.__class__ = type(self).rowClass
+        return self.__dict__[name]
+
+class BusRow(RecordRow, Bus):
+    pass
+
+class LoadRow(RecordRow, Load):
+    pass
+
+class GenRow(RecordRow, Gen):
+    pass
+
+class BranchRow(RecordRow, Branch):
+    isXfm = 0
+    tap = 1
+    isPS = 0
+    alpha = 0
+
+class BusView(RecordView, BusRow):
+    rowClass = BusRow
+
+class LoadView(RecordView, LoadRow):
+    rowClass = LoadRow
+
+class GenView(RecordView, GenRow):
+    rowClass = GenRow
+
+class BranchView(RecordView, BranchRow):
+    rowClass = BranchRow
+
+def recordViews(records, viewClass):
+    return [viewClass(records, idx) for idx in range(0, len(records))]
+
+# //---  Read me  ---//
+# Tuples of the named attributes of a list of RAW records, one per record, as
+# a generator. If the list is the views of recordViews over a whole array,
+# the tuples are read from the array chunk rows at a time; for objects they
+# are read attribute by attribute. Used by the writers, which read every
+# field of every record, so that only one chunk of the records is turned
+# into Python objects at a time.
+def recordRows(items, names, chunk=10000):
+    if len(items) > 0 and isinstance(items[0], RecordRow):
+        records = items[0]._records
+        if len(records) == len(items) and items[-1]._idx == len(items) - 1:
+            fields = records[list(names)]
+            for start in range(0, len(records), chunk):
+                for row in fields[start:start+chunk].tolist():
+                    yield row
+            return
+    for item in items:
+        yield tuple(getattr(item, name) for name in names)
+
+
 class GenRamp:
     'Store data for generator multiple ramping'
     def __init__(self, busNumber, genID, rampMWs, rampRates):
@@ -54,6 +54,7 @@ myDiary.hotlineWithLogType(7, "The generic-case data file directory is: " + para
 
 ## Input pyomo file name
 DatafileED = paramManager.getPyomoDataFormatInputFileGC()
+DataED = None  # in-memory pyomo dict-data, used instead of DatafileED when it is set
 
 # determine whether generate pyomo-format based file
 isCodeWriteFiles = False
@@ -77,13 +78,7 @@ else:
 
 if isCodeWriteFiles == True:
     myDiary.hotline("Start to read needed data from raw file")
-    pf = open(paramManager.getPathToRawFileNameGC(), "r")
-    GeneralFunctions.skipNLines(pf, 3)
-    buses = LoadInitFiles.loadBuses(pf, myDiary)
-    loads = LoadInitFiles.loadLoads(pf, myDiary)
-    gens = LoadInitFiles.loadGens(pf, myDiary)
-    branches = LoadInitFiles.loadBranches(pf, myDiary)
-    pf.close()
+    buses, loads, gens, branches = LoadInitFiles.loadRawViews(paramManager.getPathToRawFileNameGC(), myDiary)
     myDiary.hotline("Finish reading needed data from raw file")
 
     myDiary.hotline("Ready for reading multiple-period energy ramp rate data")
@@ -112,31 +107,101 @@ if isCodeWriteFiles == True:
     dataWriter.setFileNamePyomoGC(paramManager.getPyomoDataFormatInputFileGC())
     dataWriter.setNeedHeading(paramManager.getNeedHeading())
     dataWriter.setIsPositivePgPmaxPminNeeded(paramManager.getIsPositivePgPmaxPminNeeded())
-    dataWriter.writeAllDataGC()
-    if isCodeGeneratePyomoFiles == True:
-        DatafileED = dataWriter.getFileNamePyomoGC()
+    if isRunSCED == True and paramManager.getBuildModelInMemory() == True:
+        DataED = dataWriter.getPyomoDataGC()
+        myDiary.hotlineWithLogType(5, "Case data have been formed in memory, no pyomo-format data file is written")
+    else:
+        dataWriter.writeAllDataGC()
+        if isCodeGeneratePyomoFiles == True:
+            DatafileED = dataWriter.getFileNamePyomoGC()
 
 if isRunSCED == True:
-    myDiary.hotlineWithLogType(7, "The name of the case data file loaded is: " + DatafileED)
+    if DataED is None:
+        myDiary.hotlineWithLogType(7, "The name of the case data file loaded is: " + DatafileED)
+    else:
+        myDiary.hotlineWithLogType(7, "The case data are loaded from memory")
     myDiary.hotlineWithLogType(5, "Start to load input data for pyomo simulation")
     print("Start to load original input data for pyomo simulation")
     # Read scenario-specific generators
-# Load scenario-specific generators (solar and wind)
-new_generators = []
-with open(scenario_file, "r") as sf:
-    for line in sf:
-        # For solar and wind generation, extract the relevant data
-        if "SOLAR_GEN" in line or "WIND_GEN" in line:
-            parts = line.split()
-            new_generators.append({
-                "bus": int(parts[0]),           # Bus number
-                "type": parts[1],               # Type (SOLAR_GEN or WIND_GEN)
-                "pgMax": float(parts[3]),       # Maximum generation
-                "pgMin": float(parts[4]),       # Minimum generation
-                "pg_init": float(parts[10])     # Initial generation
-            })
-
-instanceSCED = SCEDModel.create_instance(DatafileED)
+# Load scenario-specific generators (solar and wind); they are units of
+# SOLAR_GEN/WIND_GEN, with the scenario output as their available output
+import ScenarioRunner
+scenarioUnits = ScenarioRunner.readScenarioRenewables(scenario_file)
+
+# Solve the case with the matrix-form LP engine, no pyomo instance is built
+if isRunSCED == True and paramManager.getUseMatrixLPEngine() == True:
+    import PyomoCaseData
+    import SCEDGenericCaseMatrixModel
+    if DataED is None:
+        DataED = PyomoCaseData.loadPyomoDataFile(DatafileED)
+    caseData = SCEDGenericCaseMatrixModel.prepareCaseData(DataED, paramManager, myDiary)
+    caseData = ScenarioRunner.applyScenarioRenewables(caseData, scenarioUnits)
+    myDiary.hotlineWithLogType(5, "Start to assemble and solve the matrix-form SCED case")
+    matrixModel = SCEDGenericCaseMatrixModel.MatrixSCEDModel(caseData, DataED)
+    solutionSCED = matrixModel.solve(myDiary, paramManager.getSolverTimLimit())
+    myDiary.hotlineWithLogType(5, "Finish solving the matrix-form SCED case")
+    print("Objective value is: " + str(solutionSCED.minimizeCost))
+
+    import WriteResults
+    WriteResults.Write_GenInfo(solutionSCED, "resultsGC", False, myDiary, scenario_name)
+    myDiary.close()
+    sys.exit(0)
+
+# Solve the case by Benders decomposition: base case master, one subproblem per contingency
+if isRunSCED == True and paramManager.getUseBendersDecomposition() == True:
+    import PyomoCaseData
+    import SCEDGenericCaseMatrixModel
+    import BendersDecomposition
+    if DataED is None:
+        DataED = PyomoCaseData.loadPyomoDataFile(DatafileED)
+    caseData = SCEDGenericCaseMatrixModel.prepareCaseData(DataED, paramManager, myDiary)
+    caseData = ScenarioRunner.applyScenarioRenewables(caseData, scenarioUnits)
+    if paramManager.getUseCompactContingency() == True:
+        caseData[None]['useCompactContingency'] = {None: 1}
+    if paramManager.getUseContingencyScreening() == True:
+        myDiary.hotlineWithLogType(7, "Contingency screening is not used by the Benders decomposition")
+    benders = BendersDecomposition.BendersDecomposition(caseData, paramManager, myDiary)
+    benders.run(paramManager.getNumDecompositionJobs())
+    print("Objective value is: " + str(value(benders.master.bendersObjective)))
+
+    import WriteResults
+    WriteResults.Write_GenInfo(benders.master, "resultsGC", False, myDiary, scenario_name)
+    myDiary.close()
+    sys.exit(0)
+
+# Data check, auto fix and per-unit scaling of the case data, the same steps
+# as for the matrix-form and Benders solves; the instance is created from the
+# prepared dict-data
+if DataED is None:
+    import PyomoCaseData
+    DataED = PyomoCaseData.loadPyomoDataFile(DatafileED)
+import SCEDGenericCaseMatrixModel
+DataED = SCEDGenericCaseMatrixModel.prepareCaseData(DataED, paramManager, myDiary)
+print ("Finish input data auto-adjustment process for pyomo simulation")
+
+# The compact (PTDF/LODF) contingency formulation is switched on through the model data
+if paramManager.getUseCompactContingency() == True or paramManager.getUseContingencyScreening() == True:
+    DataED[None]['useCompactContingency'] = {None: 1}
+    myDiary.hotlineWithLogType(0, "Contingencies are modeled with PTDF/LODF based post-contingency flows")
+    if paramManager.getUseContingencyScreening() == True:
+        DataED[None]['useContingencyScreening'] = {None: 1}
+        myDiary.hotlineWithLogType(0, "Post-contingency flow limits are added by iterative contingency screening")
+
+# Create the instance of the model; the scenario units are put in
+# SOLAR_GEN/WIND_GEN with no available output, and the scenario overlay sets
+# their output (as ScenarioRunner does to re-solve one instance for many
+# scenarios)
+DataED = ScenarioRunner.applyScenarioRenewables(DataED, [dict(unit, isInSvc=0) for unit in scenarioUnits])
+instanceSCED = SCEDModel.create_instance(data=DataED)
+baseMVA = value(instanceSCED.BaseMVA)
+for c in instanceSCED.islandingCtgcys:
+    myDiary.hotlineWithLogType(1, "Contingency " + str(c) + " islands the network, its branch flow limits are not modeled")
+if len(scenarioUnits) > 0:
+    scenarioOverlay = ScenarioRunner.getScenarioOverlay(scenario_file)
+    scenarioOverlay.apply(instanceSCED)
+for unit in scenarioUnits:
+    myDiary.hotlineWithLogType(0, "Scenario unit " + str(unit["index"]) + " (" + unit["type"] + ") at bus " + str(unit["bus"])
+                               + " has an available output of " + str(ScenarioRunner.getAvailableMW(unit)) + " MW")
 
 # Ensure the "Gen_type" and "Gen_costCurveFlag" parameters exist
 if not hasattr(instanceSCED, "Gen_type"):
@@ -144,70 +209,6 @@ if not hasattr(instanceSCED, "Gen_type"):
 if not hasattr(instanceSCED, "Gen_costCurveFlag"):
     instanceSCED.add_component("Gen_costCurveFlag", Param(instanceSCED.GEN, mutable=True, default=0))
 
-# Load scenario-specific generators (solar and wind)
-new_generators = []
-with open(scenario_file, "r") as sf:
-    for line in sf:
-        # For solar and wind generation, extract the relevant data
-        if "SOLAR_GEN" in line or "WIND_GEN" in line:
-            parts = line.split()
-            new_generators.append({
-                "bus": int(parts[0]),           # Bus number
-                "type": parts[1],               # Type (SOLAR_GEN or WIND_GEN)
-                "pgMax": float(parts[3]),       # Maximum generation
-                "pgMin": float(parts[4]),       # Minimum generation
-                "pg_init": float(parts[10])     # Initial generation
-            })
-
-# Create the instance of the model with the given data file
-instanceSCED = SCEDModel.create_instance(DatafileED)
-
-# Add new generators (solar and wind) to the model
-for gen in new_generators:
-    gen_bus = gen["bus"]
-    gen_type = gen["type"]
-    pg_max = gen["pgMax"]
-    pg_min = gen["pgMin"]
-    pg_init = gen["pg_init"]
-    
-    # Add generator to the model
-    instanceSCED.GEN.add(gen_bus)
-    instanceSCED.Gen_isInSvc[gen_bus] = 1  # Set in-service status
-
-    # Initialize parameters for this generator
-    instanceSCED.Gen_pgMax[gen_bus] = pg_max
-    instanceSCED.Gen_pgInit[gen_bus] = pg_init
-    instanceSCED.Gen_pgMin[gen_bus] = pg_min
-    instanceSCED.Gen_type[gen_bus] = gen_type
-    instanceSCED.Gen_costCurveFlag[gen_bus] = 0  # Set to 0 by default
-
-    # Add to Solar or Wind generators
-    if gen_type == 'SOLAR_GEN':
-        instanceSCED.SOLAR_GEN.add(gen_bus)
-        instanceSCED.Solar_pgMax[gen_bus] = pg_max  # Solar pgMax
-        instanceSCED.Solar_pgMin[gen_bus] = pg_min  # Solar pgMin
-        instanceSCED.Solar_pg[gen_bus] = pg_init    # Initialize solar generation
-    elif gen_type == 'WIND_GEN':
-        instanceSCED.WIND_GEN.add(gen_bus)
-        instanceSCED.Wind_pgMax[gen_bus] = pg_max  # Wind pgMax
-        instanceSCED.Wind_pgMin[gen_bus] = pg_min  # Wind pgMin
-        instanceSCED.Wind_pg[gen_bus] = pg_init    # Initialize wind generation
-
-# **Explicitly initialize the renewable generation values**
-# Ensure solar generation is initialized
-if hasattr(instanceSCED, "Solar_pg"):
-    for s in instanceSCED.SOLAR_GEN:
-        # Initialize with the pg_init value for solar generation
-        if instanceSCED.Solar_pg[s].value is None:  # Check if it's uninitialized
-            instanceSCED.Solar_pg[s] = pg_init  # Assign initial value if uninitialized
-
-# Ensure wind generation is initialized
-if hasattr(instanceSCED, "Wind_pg"):
-    for w in instanceSCED.WIND_GEN:
-        # Initialize with the pg_init value for wind generation
-        if instanceSCED.Wind_pg[w].value is None:  # Check if it's uninitialized
-            instanceSCED.Wind_pg[w] = pg_init  # Assign initial value if uninitialized
-
 # Ensure conventional generators (pg) are initialized with pg_init
 for g in instanceSCED.GEN:
     if instanceSCED.pg[g].value is None:  # Check if it's uninitialized
@@ -224,13 +225,13 @@ for g in instanceSCED.GEN:
 # Print solar generation output
 if hasattr(instanceSCED, "Solar_pg"):
     for s in instanceSCED.SOLAR_GEN:
-        solar_pg_value = value(instanceSCED.Solar_pg[s])  # Get the value of solar generation
+        solar_pg_value = instanceSCED.Solar_pg[s].value  # Get the value of solar generation (None before solving)
         print(f"Solar Generator {s} Output (Solar_pg): {solar_pg_value} MW")
 
 # Print wind generation output
 if hasattr(instanceSCED, "Wind_pg"):
     for w in instanceSCED.WIND_GEN:
-        wind_pg_value = value(instanceSCED.Wind_pg[w])  # Get the value of wind generation
+        wind_pg_value = instanceSCED.Wind_pg[w].value  # Get the value of wind generation (None before solving)
         print(f"Wind Generator {w} Output (Wind_pg): {wind_pg_value} MW")
 
 print("New generators have been successfully added and initialized.")
@@ -243,144 +244,50 @@ instanceSCED.preprocess()  # Preprocess the model before solving
 myDiary.hotlineWithLogType(5, "Finish loading input data for pyomo simulation - an instance has been created")
 print("Finish loading original input data for pyomo simulation")
 
-# Auto-fix data if required
-autoFixData = True
-if autoFixData:
-    for idx in instanceSCED.GenCost_segmentBreadth.index_set():
-        if value(instanceSCED.GenCost_segmentBreadth[idx]) < 0:
-            instanceSCED.GenCost_segmentBreadth[idx] = 0
-            myDiary.hotlineWithLogType(1, f"For GenCost segment input data item with index of {idx}, the segment breadth is negative, so it is set to 0")
-
-
-    handle_CostCurveSegment_Pgmin = paramManager.getHandle_CostCurveSegment_Pgmin()
-    if handle_CostCurveSegment_Pgmin == True:
-        PgmaxTemp_fromCostCurve = {}
-        for idx in instanceSCED.GenCost_genIdx.index_set():
-            idxGen = value(instanceSCED.GenCost_genIdx[idx])
-            if idxGen in PgmaxTemp_fromCostCurve:
-
-                PgmaxTemp_fromCostCurve[idxGen] = PgmaxTemp_fromCostCurve[idxGen] + value(instanceSCED.GenCost_segmentBreadth[idx])
-            else:
-                PgmaxTemp_fromCostCurve[idxGen] = value(instanceSCED.GenCost_segmentBreadth[idx])
-        for idxGen, Pgmax_fromCostCurve in PgmaxTemp_fromCostCurve.items():
-            if value(instanceSCED.Gen_pgMin[idxGen]) > Pgmax_fromCostCurve:
-                instanceSCED.Gen_pgMin[idxGen] = Pgmax_fromCostCurve
-                myDiary.hotlineWithLogType(1, "The Pgmin of generator with index "+str(idxGen)+ " is inconsistent with the cost curve, so it is set to " + str(Pgmax_fromCostCurve))
-
-    if autoFixData == True:
-        isPositivePgPmaxPminNeeded = paramManager.getIsPositivePgPmaxPminNeeded()
-        for idx in instanceSCED.Gen_pgInit.index_set():
-            if value(instanceSCED.Gen_isInSvc[idx]) == 0:
-                instanceSCED.Gen_pgInit[idx] = 0
-            elif value(instanceSCED.Gen_pgMax[idx]) < value(instanceSCED.Gen_pgMin[idx]):
-                instanceSCED.Gen_pgInit[idx] = (value(instanceSCED.Gen_pgMin[idx]) + value(instanceSCED.Gen_pgMax[idx]))/2
-                instanceSCED.Gen_pgMin[idx] = value(instanceSCED.Gen_pgInit[idx])
-                instanceSCED.Gen_pgMax[idx] = value(instanceSCED.Gen_pgInit[idx])
-                myDiary.hotlineWithLogType(1, "For online generator "+str(idx)+" Pgmax < Pgmin, thus, they are set to (Pgmax+Pgmin)/2, as well as Pginit")
-            elif value(instanceSCED.Gen_pgInit[idx]) < value(instanceSCED.Gen_pgMin[idx]):
-                instanceSCED.Gen_pgInit[idx] = value(instanceSCED.Gen_pgMin[idx])
-                myDiary.hotlineWithLogType(1, "For online generator "+str(idx)+" Gen_pgInit < Pgmin, thus, Gen_pgInit = Pgmin")
-            elif value(instanceSCED.Gen_pgInit[idx]) > value(instanceSCED.Gen_pgMax[idx]):
-                instanceSCED.Gen_pgInit[idx] = value(instanceSCED.Gen_pgMax[idx])
-                myDiary.hotlineWithLogType(1, "For online generator "+str(idx)+" Gen_pgInit > Pgmax, thus, Gen_pgInit = Pgmax")
-            if value(instanceSCED.Gen_energyRamp[idx]) < 0:
-                instanceSCED.Gen_energyRamp[idx] = 0
-                myDiary.hotlineWithLogType(1, "For generator "+str(idx)+" Gen_energyRamp is negative, thus, Gen_energyRamp = 0")
-            if value(instanceSCED.Gen_spinRamp[idx]) < 0:
-                instanceSCED.Gen_spinRamp[idx] = 0
-                myDiary.hotlineWithLogType(1, "For generator "+str(idx)+" Gen_spinRamp is negative, thus, Gen_spinRamp = 0")
-            if isPositivePgPmaxPminNeeded == True:
-                if value(instanceSCED.Gen_pgMax[idx]) < 0:
-                    instanceSCED.Gen_pgMax[idx] = 0
-                    myDiary.hotlineWithLogType(1, "For generator "+str(idx)+" Gen_pgMax is negative, thus, Gen_pgMax = 0")
-                if value(instanceSCED.Gen_pgMin[idx]) < 0:
-                    instanceSCED.Gen_pgMin[idx] = 0
-                    myDiary.hotlineWithLogType(1, "For generator "+str(idx)+" Gen_pgMin is negative, thus, Gen_pgMin = 0")
-                if value(instanceSCED.Gen_pgInit[idx]) < 0:
-                    instanceSCED.Gen_pgInit[idx] = 0
-                    myDiary.hotlineWithLogType(1, "For generator "+str(idx)+" Gen_pgInit is negative, thus, Gen_pgMin = 0")
-
-    baseMVA = 100  # in the objective function in the model.py code, manual change is needed if this number is not 100.
-    for idx in instanceSCED.Load_pd.index_set():
-        instanceSCED.Load_pd[idx] = value(instanceSCED.Load_pd[idx])/baseMVA
-    for idx in instanceSCED.Gen_pgInit.index_set():
-        instanceSCED.Gen_pgInit[idx] = value(instanceSCED.Gen_pgInit[idx])/baseMVA
-        instanceSCED.Gen_pgMax[idx] = value(instanceSCED.Gen_pgMax[idx])/baseMVA
-        instanceSCED.Gen_pgMin[idx] = value(instanceSCED.Gen_pgMin[idx])/baseMVA
-        instanceSCED.Gen_energyRamp[idx] = value(instanceSCED.Gen_energyRamp[idx])/baseMVA
-        instanceSCED.Gen_spinRamp[idx] = value(instanceSCED.Gen_spinRamp[idx])/baseMVA
-    for idx in instanceSCED.GenCost_segmentBreadth.index_set():
-        instanceSCED.GenCost_segmentBreadth[idx] = value(instanceSCED.GenCost_segmentBreadth[idx])/baseMVA
-    for idx in instanceSCED.Branch_pkInit.index_set():
-        instanceSCED.Branch_pkInit[idx] = value(instanceSCED.Branch_pkInit[idx])/baseMVA
-        instanceSCED.Branch_rateA[idx] = value(instanceSCED.Branch_rateA[idx])/baseMVA
-        instanceSCED.Branch_rateB[idx] = value(instanceSCED.Branch_rateB[idx])/baseMVA
-        instanceSCED.Branch_rateC[idx] = value(instanceSCED.Branch_rateC[idx])/baseMVA
-    for idx in instanceSCED.Interface_totalLimit.index_set():
-        instanceSCED.Interface_totalLimit[idx] = value(instanceSCED.Interface_totalLimit[idx])/baseMVA
-
-    TotalLoad = 0
-    for idx in instanceSCED.Load_pd.index_set():
-        if value(instanceSCED.Load_isInSvc[idx]) == 1:
-            TotalLoad = TotalLoad + value(instanceSCED.Load_pd[idx])
-    myDiary.hotlineWithLogType(6, "The total load for this case is: " + str(TotalLoad*baseMVA) + " MW")
-    
-    TotalGenInit = 0
-    for idx in instanceSCED.Gen_pgInit.index_set():
-        if value(instanceSCED.Gen_isInSvc[idx]) == 1:
-            TotalGenInit = TotalGenInit + value(instanceSCED.Gen_pgInit[idx])
-    myDiary.hotlineWithLogType(6, "The total generation for this case is: " + str(TotalGenInit*baseMVA) + " MW")
-
-    TotalGenMax = 0
-    for idx in instanceSCED.Gen_pgMax.index_set():
-        if value(instanceSCED.Gen_isInSvc[idx]) == 1:
-            TotalGenMax = TotalGenMax + value(instanceSCED.Gen_pgMax[idx])
-    myDiary.hotlineWithLogType(6, "The total online generation capacity for this case is: " + str(TotalGenMax*baseMVA) + " MW")
-
-    # the following adjustment may be needed for a lossy power flow model
-    ratioGenLoad = TotalGenInit/TotalLoad
-    for idx in instanceSCED.Load_pd.index_set():
-        instanceSCED.Load_pd[idx] = value(instanceSCED.Load_pd[idx])*ratioGenLoad
-    myDiary.hotlineWithLogType(6, "To consider loss, each load is increased by : " + str(ratioGenLoad*100-100) + "%")
-    
-    
-    print ("Finish input data auto-adjustment process for pyomo simulation")
-    instanceSCED.preprocess()
-    #instanceSCED.pprint()   # will print all original data/constraints before opt-run
-    
+#instanceSCED.pprint()   # will print all original data/constraints before opt-run
+
+if paramManager.getUsePersistentSolver() == True:
+    import PersistentSolver
+    opt = PersistentSolver.PersistentSCEDSession(instanceSCED, paramManager.getSolverName(), myDiary,
+                                                 paramManager.getSolverTimLimit(), paramManager.getSolverOptGap())
+else:
     opt = SolverFactory(paramManager.getSolverName())
     opt.options.tmlim = paramManager.getSolverTimLimit() # tmlim is for glpk
     opt.options.mipgap = paramManager.getSolverOptGap()
-    myDiary.hotlineWithLogType(0, "The solver used is: " + paramManager.getSolverName())
-    myDiary.hotlineWithLogType(0, "The solver time limit is: " + paramManager.getSolverTimLimit() + " seconds")
-    myDiary.hotlineWithLogType(0, "The solver optimization gap is: " + paramManager.getSolverOptGap())
-
-    myDiary.hotlineWithLogType(5, "Start to solve pyomo case")
+myDiary.hotlineWithLogType(0, "The solver used is: " + paramManager.getSolverName())
+myDiary.hotlineWithLogType(0, "The solver time limit is: " + paramManager.getSolverTimLimit() + " seconds")
+myDiary.hotlineWithLogType(0, "The solver optimization gap is: " + paramManager.getSolverOptGap())
+
+myDiary.hotlineWithLogType(5, "Start to solve pyomo case")
+if paramManager.getUseContingencyScreening() == True:
+    import ContingencyScreening
+    results = ContingencyScreening.solveWithScreening(instanceSCED, opt, myDiary, suffixes=['rc','dual'], tee=True)
+else:
     results = opt.solve(instanceSCED, suffixes=['rc','dual'],tee=True)
-    
-    myDiary.hotlineWithLogType(5, "Finish solving pyomo case")
 
-    myDiary.hotlineWithLogType(6, "results.Solution.Status: " + str(results.Solution.Status))
-    myDiary.hotlineWithLogType(6, "results.solver.status: " + str(results.solver.status))
-    myDiary.hotlineWithLogType(6, "results.solver.termination_condition: " + str(results.solver.termination_condition))
-    myDiary.hotlineWithLogType(6, "results.solver.termination_message: " + str(results.solver.termination_message))
+myDiary.hotlineWithLogType(5, "Finish solving pyomo case")
+
+myDiary.hotlineWithLogType(6, "results.Solution.Status: " + str(results.Solution.Status))
+myDiary.hotlineWithLogType(6, "results.solver.status: " + str(results.solver.status))
+myDiary.hotlineWithLogType(6, "results.solver.termination_condition: " + str(results.solver.termination_condition))
+myDiary.hotlineWithLogType(6, "results.solver.termination_message: " + str(results.solver.termination_message))
 
-    print ("\nresults.Solution.Status: "), results.Solution.Status
-    print ("Solver status:"), results.solver.status
-    print ("Solver Termination Condition:"), results.solver.termination_condition
-    print ("Solver Termination message :"), results.solver.termination_message
-    #instanceSCED.display()  # all results will be shown, if we need all of them, we'd better redirect them to a file.
+print ("\nresults.Solution.Status: "), results.Solution.Status
+print ("Solver status:"), results.solver.status
+print ("Solver Termination Condition:"), results.solver.termination_condition
+print ("Solver Termination message :"), results.solver.termination_message
+#instanceSCED.display()  # all results will be shown, if we need all of them, we'd better redirect them to a file.
 
-    # After the solver runs, print the values of renewable generation (Solar and Wind)
+# After the solver runs, print the values of renewable generation (Solar and Wind)
 print("\nRenewable Generation After Solver:\n")
 
 # Print Solar generation values after the solver
-solar_gen_value = value(instanceSCED.pg[8])
-print(f"Solar Generator 8 Output (Solar_pg) After Solver: {solar_gen_value} MW")
+for s in instanceSCED.SOLAR_GEN:
+    print(f"Solar Generator {s} Output (Solar_pg) After Solver: {value(instanceSCED.Solar_pg[s])*baseMVA} MW")
 
 # Print Wind generation values after the solver
-wind_gen_value = value(instanceSCED.pg[9])
-print(f"Wind Generator 9 Output (Wind_pg) After Solver: {wind_gen_value} MW")
+for w in instanceSCED.WIND_GEN:
+    print(f"Wind Generator {w} Output (Wind_pg) After Solver: {value(instanceSCED.Wind_pg[w])*baseMVA} MW")
 
 # File writing for generator data
 import os
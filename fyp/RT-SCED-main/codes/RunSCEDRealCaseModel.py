@@ -37,6 +37,7 @@ myDiary.hotlineWithLogType(7, "The real-case data file directory is: " + paramMa
 
 ## Input pyomo file name
 DatafileED = paramManager.getPyomoDataFormatInputFileRC()
+DataED = None  # in-memory pyomo dict-data, used instead of DatafileED when it is set
 
 isCodeWriteFiles = False
 isCodeGeneratePyomoFiles = False
@@ -59,13 +60,7 @@ else:
 
 if isCodeWriteFiles == True:
     myDiary.hotline("Start to read needed data from raw file")
-    pf = open(paramManager.getPathToRawFileNameRC(), "r")
-    GeneralFunctions.skipNLines(pf, 3)
-    buses = LoadInitFiles.loadBuses(pf, myDiary)
-    loads = LoadInitFiles.loadLoads(pf, myDiary)
-    gens = LoadInitFiles.loadGens(pf, myDiary)
-    branches = LoadInitFiles.loadBranches(pf, myDiary)
-    pf.close()
+    buses, loads, gens, branches = LoadInitFiles.loadRawViews(paramManager.getPathToRawFileNameRC(), myDiary)
     myDiary.hotline("Finish reading needed data from raw file")
 
     fileFlowgate = open(paramManager.getPathToInterfaceFileNameRC(), "r")
@@ -124,15 +119,25 @@ if isCodeWriteFiles == True:
     dataWriter.setNeedHeading(paramManager.getNeedHeading())
     dataWriter.setIsPositivePgPmaxPminNeeded(paramManager.getIsPositivePgPmaxPminNeeded())
     dataWriter.setBlockPrice(paramManager.getBlockPrice())
-    dataWriter.writeAllDataRC()
-    if isCodeGeneratePyomoFiles == True:
-        DatafileED = dataWriter.getFileNamePyomoRC()
+    if isRunSCED == True and paramManager.getBuildModelInMemory() == True:
+        DataED = dataWriter.getPyomoDataRC()
+        myDiary.hotlineWithLogType(5, "Case data have been formed in memory, no pyomo-format data file is written")
+    else:
+        dataWriter.writeAllDataRC()
+        if isCodeGeneratePyomoFiles == True:
+            DatafileED = dataWriter.getFileNamePyomoRC()
 
 if isRunSCED == True:
-    myDiary.hotlineWithLogType(7, "The name of the case data file loaded is: " + DatafileED)
+    if DataED is None:
+        myDiary.hotlineWithLogType(7, "The name of the case data file loaded is: " + DatafileED)
+    else:
+        myDiary.hotlineWithLogType(7, "The case data are loaded from memory")
     myDiary.hotlineWithLogType(5, "Start to load input data for pyomo simulation")
     print ("Start to load original input data for pyomo simulation")
-    instanceSCED = SCEDModel.create_instance(DatafileED)
+    if DataED is None:
+        instanceSCED = SCEDModel.create_instance(DatafileED)
+    else:
+        instanceSCED = SCEDModel.create_instance(data=DataED)
     myDiary.hotlineWithLogType(5, "Finish loading input data for pyomo simulation - an instance has been created")
     print ("Finished loading original input data for pyomo simulation")
     
@@ -0,0 +1,581 @@
+"""
+Matrix-form assembly of the generic-case SCED model.
+
+The formulation is the one in SCEDGenericCaseModel.py; here it is assembled
+directly as SciPy sparse A_ub/A_eq matrices, b/c vectors and variable bounds
+(no Pyomo expression trees, no LP file) and solved in-process by HiGHS
+through scipy.optimize.linprog. The solution object exposes the same
+GEN/LOAD/BRANCH/... sets, parameters and variables that
+WriteResults.Write_GenInfo reads from a solved Pyomo instance.
+
+Website: https://rpglab.github.io/resources/RT-SCED_Python/
+"""
+
+import copy
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+
+from PyomoCaseData import setNames, getSet
+
+
+# default values of the scalar params of SCEDGenericCaseModel
+defaultScalars = {
+    "BaseMVA": 100, "T_ED": 15, "T_RR": 5, "T_SR": 10, "T_PR": 10,
+    "SR_price": 6.99, "PgMax_penalty": 850.0, "PgMin_penalty": 850.0, "SR_penalty": 850.0,
+    "energyRampUp_penalty": 850.0, "energyRampDown_penalty": 850.0, "spinRamp_penalty": 850.0,
+    "BrcFlowLimit_penalty": 950.0, "LoadShed_penalty": 5000.0, "LoadShed_c_penalty": 5000.0,
+    "InterfaceLimit_penalty": 950.0,
+}
+# default values of the indexed params of SCEDGenericCaseModel
+defaultParams = {
+    "Gen_isInSvc": 1, "Gen_energyRamp": 0, "Gen_spinRamp": 0, "Gen_costCurveFlag": 0,
+}
+solarCost = 2.0   # $/MWh, as in SCEDGenericCaseModel.costObj
+windCost = 1.5    # $/MWh, as in SCEDGenericCaseModel.costObj
+
+# Data check, auto fix and per-unit scaling of the case data; the same steps
+# RunSCEDGenericCaseModel.py applies to a Pyomo instance before solving.
+# A modified copy is returned, the input data is left untouched.
+def prepareCaseData(data, paramManager, myDiary):
+    data = copy.deepcopy(data)
+    case = data[None]
+    gens = getSet(case, "GEN")
+    genCosts = getSet(case, "GENCOST")
+    for name in defaultParams:
+        case.setdefault(name, {})
+        for g in gens:
+            case[name].setdefault(g, defaultParams[name])
+
+    for idx in genCosts:
+        if case["GenCost_segmentBreadth"][idx] < 0:
+            case["GenCost_segmentBreadth"][idx] = 0
+            myDiary.hotlineWithLogType(1, "For GenCost segment input data item with index of "+str(idx)+ ", the segment breadth is negative, so it is set to 0")
+
+    if paramManager.getHandle_CostCurveSegment_Pgmin() == True:
+        PgmaxTemp_fromCostCurve = {}
+        for idx in genCosts:
+            idxGen = case["GenCost_genIdx"][idx]
+            PgmaxTemp_fromCostCurve[idxGen] = PgmaxTemp_fromCostCurve.get(idxGen, 0) + case["GenCost_segmentBreadth"][idx]
+        for idxGen, Pgmax_fromCostCurve in PgmaxTemp_fromCostCurve.items():
+            if case["Gen_pgMin"][idxGen] > Pgmax_fromCostCurve:
+                case["Gen_pgMin"][idxGen] = Pgmax_fromCostCurve
+                myDiary.hotlineWithLogType(1, "The Pgmin of generator with index "+str(idxGen)+ " is inconsistent with the cost curve, so it is set to " + str(Pgmax_fromCostCurve))
+
+    isPositivePgPmaxPminNeeded = paramManager.getIsPositivePgPmaxPminNeeded()
+    for idx in gens:
+        if case["Gen_isInSvc"][idx] == 0:
+            case["Gen_pgInit"][idx] = 0
+        elif case["Gen_pgMax"][idx] < case["Gen_pgMin"][idx]:
+            case["Gen_pgInit"][idx] = (case["Gen_pgMin"][idx] + case["Gen_pgMax"][idx])/2
+            case["Gen_pgMin"][idx] = case["Gen_pgInit"][idx]
+            case["Gen_pgMax"][idx] = case["Gen_pgInit"][idx]
+            myDiary.hotlineWithLogType(1, "For online generator "+str(idx)+" Pgmax < Pgmin, thus, they are set to (Pgmax+Pgmin)/2, as well as Pginit")
+        elif case["Gen_pgInit"][idx] < case["Gen_pgMin"][idx]:
+            case["Gen_pgInit"][idx] = case["Gen_pgMin"][idx]
+            myDiary.hotlineWithLogType(1, "For online generator "+str(idx)+" Gen_pgInit < Pgmin, thus, Gen_pgInit = Pgmin")
+        elif case["Gen_pgInit"][idx] > case["Gen_pgMax"][idx]:
+            case["Gen_pgInit"][idx] = case["Gen_pgMax"][idx]
+            myDiary.hotlineWithLogType(1, "For online generator "+str(idx)+" Gen_pgInit > Pgmax, thus, Gen_pgInit = Pgmax")
+        if case["Gen_energyRamp"][idx] < 0:
+            case["Gen_energyRamp"][idx] = 0
+            myDiary.hotlineWithLogType(1, "For generator "+str(idx)+" Gen_energyRamp is negative, thus, Gen_energyRamp = 0")
+        if case["Gen_spinRamp"][idx] < 0:
+            case["Gen_spinRamp"][idx] = 0
+            myDiary.hotlineWithLogType(1, "For generator "+str(idx)+" Gen_spinRamp is negative, thus, Gen_spinRamp = 0")
+        if isPositivePgPmaxPminNeeded == True:
+            for name in ["Gen_pgMax", "Gen_pgMin", "Gen_pgInit"]:
+                if case[name][idx] < 0:
+                    case[name][idx] = 0
+                    myDiary.hotlineWithLogType(1, "For generator "+str(idx)+" "+name+" is negative, thus, "+name+" = 0")
+
+    baseMVA = getScalar(case, "BaseMVA")
+    for name in ["Load_pd", "Gen_pgInit", "Gen_pgMax", "Gen_pgMin", "Gen_energyRamp", "Gen_spinRamp",
+                 "GenCost_segmentBreadth", "Branch_pkInit", "Branch_rateA", "Branch_rateB", "Branch_rateC",
+                 "Interface_totalLimit"]:
+        if name in case:
+            for idx in case[name]:
+                case[name][idx] = case[name][idx]/baseMVA
+
+    TotalLoad = sum(case["Load_pd"][d] for d in getSet(case, "LOAD") if case["Load_isInSvc"][d] == 1)
+    myDiary.hotlineWithLogType(6, "The total load for this case is: " + str(TotalLoad*baseMVA) + " MW")
+    TotalGenInit = sum(case["Gen_pgInit"][g] for g in gens if case["Gen_isInSvc"][g] == 1)
+    myDiary.hotlineWithLogType(6, "The total generation for this case is: " + str(TotalGenInit*baseMVA) + " MW")
+    TotalGenMax = sum(case["Gen_pgMax"][g] for g in gens if case["Gen_isInSvc"][g] == 1)
+    myDiary.hotlineWithLogType(6, "The total online generation capacity for this case is: " + str(TotalGenMax*baseMVA) + " MW")
+
+    # the following adjustment may be needed for a lossy power flow model
+    ratioGenLoad = TotalGenInit/TotalLoad
+    for d in getSet(case, "LOAD"):
+        case["Load_pd"][d] = case["Load_pd"][d]*ratioGenLoad
+    myDiary.hotlineWithLogType(6, "To consider loss, each load is increased by : " + str(ratioGenLoad*100-100) + "%")
+    return data
+
+
+def getScalar(case, name):
+    if name in case:
+        return case[name][None]
+    return defaultScalars[name]
+
+def getParam(case, name, indices):
+    values = case.get(name, {})
+    default = defaultParams.get(name)
+    return np.array([values.get(i, default) for i in indices], dtype=float)
+
+def getIndexParam(case, name, indices):
+    values = case.get(name, {})
+    return [values.get(i) for i in indices]
+
+
+# A solved variable value; it is a float that also has the .value attribute of
+# a Pyomo variable so that the result writers can treat both alike.
+class solvedValue(float):
+    @property
+    def value(self):
+        return float(self)
+
+try:
+    from pyomo.common.numeric_types import RegisterNumericType
+    RegisterNumericType(solvedValue)
+except ImportError:
+    pass
+
+
+# Sets, params and solved variable values of one generic-case SCED run
+class MatrixSCEDSolution:
+    def __init__(self, case):
+        for name in setNames:
+            setattr(self, name, getSet(case, name))
+        for name, values in case.items():
+            if name not in setNames:
+                if None in values:
+                    setattr(self, name, values[None])
+                else:
+                    setattr(self, name, dict(values))
+        for name in defaultScalars:
+            if not hasattr(self, name):
+                setattr(self, name, defaultScalars[name])
+        for name in defaultParams:
+            values = getattr(self, name, {})
+            for g in self.GEN:
+                values.setdefault(g, defaultParams[name])
+            setattr(self, name, values)
+
+
+# Variable layout of the LP: each variable block is a contiguous range of columns
+class lpColumns:
+    def __init__(self):
+        self.numCol = 0
+        self.blocks = {}
+        self.lower = []
+        self.upper = []
+
+    def addBlock(self, name, indices, lower, upper):
+        offset = self.numCol
+        num = len(indices)
+        self.blocks[name] = [offset, list(indices)]
+        self.lower.append(np.broadcast_to(np.asarray(lower, dtype=float), (num,)))
+        self.upper.append(np.broadcast_to(np.asarray(upper, dtype=float), (num,)))
+        self.numCol = self.numCol + num
+        return offset
+
+    def getBounds(self):
+        if self.numCol == 0:
+            return np.zeros((0, 2))
+        return np.column_stack([np.concatenate(self.lower), np.concatenate(self.upper)])
+
+
+# Rows of the LP, collected as COO triplets; lower == upper for equality rows
+class lpRows:
+    def __init__(self):
+        self.numRow = 0
+        self.rowIdx = []
+        self.colIdx = []
+        self.coefs = []
+        self.lower = []
+        self.upper = []
+
+    # add numNew rows; terms is a list of (rowOffsets, columns, coefficients)
+    # with rowOffsets counted from the first new row
+    def addRows(self, numNew, terms, lower, upper):
+        if numNew == 0:
+            return
+        for rows, cols, vals in terms:
+            rows = np.asarray(rows, dtype=np.int64)
+            self.rowIdx.append(rows + self.numRow)
+            self.colIdx.append(np.broadcast_to(np.asarray(cols, dtype=np.int64), rows.shape))
+            self.coefs.append(np.broadcast_to(np.asarray(vals, dtype=float), rows.shape))
+        self.lower.append(np.broadcast_to(np.asarray(lower, dtype=float), (numNew,)))
+        self.upper.append(np.broadcast_to(np.asarray(upper, dtype=float), (numNew,)))
+        self.numRow = self.numRow + numNew
+
+    def getMatrix(self, numCol):
+        if len(self.rowIdx) == 0:
+            return sp.csr_matrix((self.numRow, numCol))
+        return sp.csr_matrix((np.concatenate(self.coefs), (np.concatenate(self.rowIdx), np.concatenate(self.colIdx))),
+                             shape=(self.numRow, numCol))
+
+
+# Generic-case SCED assembled in matrix form.
+# data is the pyomo dict-data of the case. Like Pyomo, the model decides which
+# form of each constraint is built (fixed to zero, skipped, ...) from the
+# param values at construction time, i.e. before the runner's auto fix and
+# per-unit scaling; pass those original values as structureData when data has
+# been modified by prepareCaseData. The numbers in the rows come from data.
+class MatrixSCEDModel:
+    def __init__(self, data, structureData=None):
+        self.case = data[None]
+        if structureData is None:
+            structureData = data
+        self.structure = structureData[None]
+        self.columns = lpColumns()
+        self.rows = lpRows()
+        self.buildTime = 0
+        self.solveTime = 0
+
+    def buildLP(self):
+        t0 = time.time()
+        case = self.case
+        structure = self.structure
+        cols = self.columns
+        rows = self.rows
+
+        BUS = getSet(case, "BUS")
+        LOAD = getSet(case, "LOAD")
+        GEN = getSet(case, "GEN")
+        GENCOST = getSet(case, "GENCOST")
+        BRANCH = getSet(case, "BRANCH")
+        SOLAR = getSet(case, "SOLAR_GEN")
+        WIND = getSet(case, "WIND_GEN")
+        INTERFACE = getSet(case, "INTERFACE")
+        INTERFACELINE = getSet(case, "INTERFACELINE")
+        CONTINGENCY = getSet(case, "CONTINGENCY")
+        CONTINGENCYLINE = getSet(case, "CONTINGENCYLINE")
+        nB, nD, nG, nGC, nK = len(BUS), len(LOAD), len(GEN), len(GENCOST), len(BRANCH)
+        nS, nW, nI, nC = len(SOLAR), len(WIND), len(INTERFACE), len(CONTINGENCY)
+
+        busPos = dict((n, i) for i, n in enumerate(BUS))
+        genPos = dict((g, i) for i, g in enumerate(GEN))
+        branchPos = dict((k, i) for i, k in enumerate(BRANCH))
+        interfacePos = dict((n, i) for i, n in enumerate(INTERFACE))
+        contingencyPos = dict((c, i) for i, c in enumerate(CONTINGENCY))
+
+        T_ED = getScalar(case, "T_ED")
+        T_SR = getScalar(case, "T_SR")
+
+        ## -------------------------------- Params --------------------------------
+        loadPd = getParam(case, "Load_pd", LOAD)
+        loadInSvc = getParam(case, "Load_isInSvc", LOAD)
+        genInSvc = getParam(case, "Gen_isInSvc", GEN)
+        genPgInit = getParam(case, "Gen_pgInit", GEN)
+        genPgMax = getParam(case, "Gen_pgMax", GEN)
+        genPgMin = getParam(case, "Gen_pgMin", GEN)
+        genEnergyRamp = getParam(case, "Gen_energyRamp", GEN)
+        genSpinRamp = getParam(case, "Gen_spinRamp", GEN)
+        segBreadth = getParam(case, "GenCost_segmentBreadth", GENCOST)
+        segPrice = getParam(case, "GenCost_segmentPrice", GENCOST)
+        brcX = getParam(case, "Branch_x", BRANCH)
+        brcAngle = getParam(case, "Branch_angle", BRANCH)
+        brcRateA = getParam(case, "Branch_rateA", BRANCH)
+        brcRateC = getParam(case, "Branch_rateC", BRANCH)
+        solarPgMax = getParam(case, "Solar_pgMax", SOLAR)
+        windPgMax = getParam(case, "Wind_pgMax", WIND)
+        interfaceLimit = getParam(case, "Interface_totalLimit", INTERFACE)
+
+        loadOnline = getParam(structure, "Load_isInSvc", LOAD) != 0
+        loadFixShed = np.logical_or(np.logical_not(loadOnline), getParam(structure, "Load_pd", LOAD) < 0)
+        genOnline = getParam(structure, "Gen_isInSvc", GEN) != 0
+        genPositiveInit = getParam(structure, "Gen_pgInit", GEN) > 0
+        genHasCostCurve = getParam(structure, "Gen_costCurveFlag", GEN) != 0
+        brcOnline = getParam(structure, "Branch_isInSvc", BRANCH) != 0
+        interfaceEnabled = getParam(structure, "Interface_isEnabled", INTERFACE) == 1
+        contingencyEnabled = getParam(structure, "Contingency_isEnabled", CONTINGENCY) != 0
+
+        genBusRow = np.array([busPos.get(n, -1) for n in getIndexParam(case, "Gen_busNumber", GEN)], dtype=np.int64)
+        solarBusRow = np.array([busPos.get(n, -1) for n in getIndexParam(case, "Solar_busNumber", SOLAR)], dtype=np.int64)
+        windBusRow = np.array([busPos.get(n, -1) for n in getIndexParam(case, "Wind_busNumber", WIND)], dtype=np.int64)
+        loadBusRow = np.array([busPos.get(n, -1) for n in getIndexParam(case, "Load_busNumber", LOAD)], dtype=np.int64)
+        frmBusRow = np.array([busPos.get(n, -1) for n in getIndexParam(case, "Branch_frmBusNumber", BRANCH)], dtype=np.int64)
+        toBusRow = np.array([busPos.get(n, -1) for n in getIndexParam(case, "Branch_toBusNumber", BRANCH)], dtype=np.int64)
+        segGenPos = np.array([genPos[g] for g in getIndexParam(case, "GenCost_genIdx", GENCOST)], dtype=np.int64)
+
+        ## -------------------------------- Variables -----------------------------
+        inf = np.inf
+        pg = cols.addBlock("pg", GEN, -inf, inf)
+        solarPg = cols.addBlock("Solar_pg", SOLAR, 0, inf)
+        windPg = cols.addBlock("Wind_pg", WIND, 0, inf)
+        sr = cols.addBlock("sr", GEN, 0, inf)
+        theta = cols.addBlock("theta", BUS, -inf, inf)
+        loadServed = cols.addBlock("loadServed", LOAD, -inf, inf)
+        loadShed = cols.addBlock("loadShed", LOAD, 0, inf)
+        pgi = cols.addBlock("pgi", GENCOST, 0, segBreadth)
+        pk = cols.addBlock("pk", BRANCH, -inf, inf)
+        totalFlow = cols.addBlock("totalFlowForInterface", INTERFACE, -inf, inf)
+        pgc = cols.addBlock("pgc", [(g, c) for c in CONTINGENCY for g in GEN], -inf, inf)   # column of (g, c): pgc + c*nG + g
+        thetaC = cols.addBlock("theta_c", [(c, n) for c in CONTINGENCY for n in BUS], -inf, inf)
+        pkc = cols.addBlock("pkc", [(c, k) for c in CONTINGENCY for k in BRANCH], -inf, inf)
+        loadServedC = cols.addBlock("loadServed_c", [(c, d) for c in CONTINGENCY for d in LOAD], -inf, inf)
+        loadShedC = cols.addBlock("loadShed_c", [(c, d) for c in CONTINGENCY for d in LOAD], 0, inf)
+        totalFlowC = cols.addBlock("totalFlowForInterface_c", [(c, i) for c in CONTINGENCY for i in INTERFACE], -inf, inf)
+        pgmaxSlack = cols.addBlock("pgmaxSlackVar", GEN, 0, inf)
+        pgminSlack = cols.addBlock("pgminSlackVar", GEN, 0, inf)
+        spinRampSlack = cols.addBlock("spinRampSlackVar", GEN, 0, inf)
+        rampUpSlack = cols.addBlock("energyRampUpSlackVar", GEN, 0, inf)
+        rampDownSlack = cols.addBlock("energyRampDownSlackVar", GEN, 0, inf)
+        srReqSlack = cols.addBlock("srReqSlackVar", GEN, 0, inf)
+        brcSlack = cols.addBlock("brcFlowLimitSlackVar", BRANCH, 0, inf)
+        interfaceSlack = cols.addBlock("interfaceLimiteSlackVar", INTERFACE, 0, inf)
+        # total spinning reserve, so that the largest-gen-contingency rows stay sparse
+        totalSR = cols.addBlock("totalSR", [None], -inf, inf)
+
+        arG = np.arange(nG)
+        arD = np.arange(nD)
+        arK = np.arange(nK)
+        arS = np.arange(nS)
+        arW = np.arange(nW)
+        arI = np.arange(nI)
+
+        ## -------------------------------- Renewable limits ----------------------
+        # const_SolarGenLimit/const_SolarMax and const_WindGenLimit/const_WindMax
+        for k in range(2):
+            rows.addRows(nS, [(arS, solarPg + arS, 1.0)], -inf, solarPgMax)
+            rows.addRows(nW, [(arW, windPg + arW, 1.0)], -inf, windPgMax)
+
+        ## -------------------------------- Nodal balance -------------------------
+        gMask = genBusRow >= 0
+        sMask = solarBusRow >= 0
+        wMask = windBusRow >= 0
+        dMask = loadBusRow >= 0
+        fMask = frmBusRow >= 0
+        tMask = toBusRow >= 0
+        rows.addRows(nB, [(genBusRow[gMask], pg + arG[gMask], 1.0),
+                          (solarBusRow[sMask], solarPg + arS[sMask], 1.0),
+                          (windBusRow[wMask], windPg + arW[wMask], 1.0),
+                          (loadBusRow[dMask], loadServed + arD[dMask], -1.0),
+                          (frmBusRow[fMask], pk + arK[fMask], -1.0),
+                          (toBusRow[tMask], pk + arK[tMask], 1.0)], 0, 0)
+
+        # const_GenMax
+        rows.addRows(nG, [(arG, pg + arG, 1.0)], -inf, genPgMax)
+
+        ## -------------------------------- Load shed calculation -----------------
+        rows.addRows(nD, [(arD, loadShed + arD, 1.0), (arD, loadServed + arD, 1.0)], loadPd*loadInSvc, loadPd*loadInSvc)
+        # loadShed == 0 for offline/negative loads, otherwise loadServed >= 0
+        rows.addRows(nD, [(arD, np.where(loadFixShed, loadShed, loadServed) + arD, 1.0)], 0, np.where(loadFixShed, 0, inf))
+
+        ## -------------------------------- Branch flow ---------------------------
+        onK = arK[brcOnline]
+        rows.addRows(nK, [(arK, pk + arK, 1.0),
+                          (onK, theta + frmBusRow[onK], -1.0/brcX[onK]),
+                          (onK, theta + toBusRow[onK], 1.0/brcX[onK])],
+                     np.where(brcOnline, -brcAngle/brcX, 0), np.where(brcOnline, -brcAngle/brcX, 0))
+        numOn = len(onK)
+        rows.addRows(numOn, [(np.arange(numOn), pk + onK, 1.0), (np.arange(numOn), brcSlack + onK, -1.0)], -inf, brcRateA[onK])
+        rows.addRows(numOn, [(np.arange(numOn), pk + onK, 1.0), (np.arange(numOn), brcSlack + onK, 1.0)], -brcRateA[onK], inf)
+
+        ## -------------------------------- Gen cost curve ------------------------
+        offG = arG[np.logical_not(genOnline)]
+        rows.addRows(len(offG), [(np.arange(len(offG)), pg + offG, 1.0)], 0, 0)
+        segCount = np.bincount(segGenPos, minlength=nG)
+        sumG = arG[genOnline & genPositiveInit & (segCount > 0)]
+        sumRow = -np.ones(nG, dtype=np.int64)
+        sumRow[sumG] = np.arange(len(sumG))
+        segInSum = sumRow[segGenPos] >= 0
+        rows.addRows(len(sumG), [(np.arange(len(sumG)), pg + sumG, -1.0),
+                                 (sumRow[segGenPos[segInSum]], pgi + np.arange(nGC)[segInSum], 1.0)], 0, 0)
+        # const_GenCostFixed
+        fixSeg = np.arange(nGC)[np.logical_not(genOnline[segGenPos] & genPositiveInit[segGenPos])]
+        rows.addRows(len(fixSeg), [(np.arange(len(fixSeg)), pgi + fixSeg, 1.0)], 0, 0)
+        # const_GenCostCurveFlag
+        flagG = arG[np.logical_not(genHasCostCurve)]
+        rows.addRows(len(flagG), [(np.arange(len(flagG)), pg + flagG, 1.0)],
+                     genPgInit[flagG]*genInSvc[flagG], genPgInit[flagG]*genInSvc[flagG])
+
+        ## -------------------------------- Gen limits, ramping and reserve -------
+        # for an offline unit every one of these rows fixes its slack (or sr) to 0
+        off = np.logical_not(genOnline)
+        rows.addRows(nG, [(arG, pg + arG, np.where(off, 0, 1.0)), (arG, rampUpSlack + arG, np.where(off, 1.0, -1.0))],
+                     np.where(off, 0, -inf), np.where(off, 0, genPgInit + genEnergyRamp*T_ED))
+        rows.addRows(nG, [(arG, pg + arG, np.where(off, 0, 1.0)), (arG, rampDownSlack + arG, np.where(off, 1.0, T_ED))],
+                     np.where(off, 0, genPgInit - genEnergyRamp*T_ED), np.where(off, 0, inf))
+        rows.addRows(nG, [(arG, sr + arG, np.where(off, 0, 1.0)), (arG, spinRampSlack + arG, np.where(off, 1.0, -1.0))],
+                     np.where(off, 0, -inf), np.where(off, 0, genSpinRamp*T_SR))
+        rows.addRows(nG, [(arG, pg + arG, np.where(off, 0, 1.0)), (arG, pgmaxSlack + arG, np.where(off, 1.0, -1.0))],
+                     np.where(off, 0, -inf), np.where(off, 0, genPgMax))
+        rows.addRows(nG, [(arG, pg + arG, np.where(off, 0, 1.0)), (arG, pgminSlack + arG, 1.0)],
+                     np.where(off, 0, genPgMin), np.where(off, 0, inf))
+        rows.addRows(nG, [(arG, sr + arG, 1.0), (arG, pg + arG, np.where(off, 0, 1.0)), (arG, pgmaxSlack + arG, np.where(off, 0, -1.0))],
+                     np.where(off, 0, -inf), np.where(off, 0, genPgMax))
+        # const_SpinReserveForLargestGenCntgy: totalSR - sr[g] - pg[g] + srReqSlack[g] >= 0
+        rows.addRows(1, [(np.zeros(nG, dtype=np.int64), sr + arG, 1.0), ([0], [totalSR], -1.0)], 0, 0)
+        rows.addRows(nG, [(arG, totalSR, np.where(off, 0, 1.0)), (arG, sr + arG, np.where(off, 0, -1.0)),
+                          (arG, pg + arG, np.where(off, 0, -1.0)), (arG, srReqSlack + arG, 1.0)],
+                     0, np.where(off, 0, inf))
+
+        ## -------------------------------- Interface limit -----------------------
+        lineInterfaceRow = np.array([interfacePos[i] for i in getIndexParam(case, "Interfaceline_interfaceIdx", INTERFACELINE)], dtype=np.int64)
+        lineBranchPos = np.array([branchPos[k] for k in getIndexParam(case, "Interfaceline_branchIdx", INTERFACELINE)], dtype=np.int64)
+        onI = arI[interfaceEnabled]
+        rows.addRows(len(onI), [(np.arange(len(onI)), totalFlow + onI, 1.0), (np.arange(len(onI)), interfaceSlack + onI, -1.0)],
+                     -inf, interfaceLimit[onI])
+        rows.addRows(nI, [(lineInterfaceRow, pk + lineBranchPos, 1.0), (arI, totalFlow + arI, -1.0)], 0, 0)
+
+        ## -------------------------------- Contingency ---------------------------
+        onC = np.arange(nC)[contingencyEnabled]
+        nOnC = len(onC)
+        # nodal balance, one block of nB rows per enabled contingency
+        rowBase = np.arange(nOnC)*nB
+        gc = (rowBase[:, None] + genBusRow[gMask][None, :]).ravel()
+        rows.addRows(nOnC*nB, [(gc, (pgc + onC[:, None]*nG + arG[gMask][None, :]).ravel(), 1.0),
+                               ((rowBase[:, None] + loadBusRow[dMask][None, :]).ravel(),
+                                (loadServedC + onC[:, None]*nD + arD[dMask][None, :]).ravel(), -1.0),
+                               ((rowBase[:, None] + frmBusRow[fMask][None, :]).ravel(),
+                                (pkc + onC[:, None]*nK + arK[fMask][None, :]).ravel(), -1.0),
+                               ((rowBase[:, None] + toBusRow[tMask][None, :]).ravel(),
+                                (pkc + onC[:, None]*nK + arK[tMask][None, :]).ravel(), 1.0)], 0, 0)
+        # load shed calculation
+        cd = (np.arange(nOnC)[:, None]*nD + arD[None, :]).ravel()
+        cdCol = (onC[:, None]*nD + arD[None, :]).ravel()
+        pdC = np.tile(loadPd*loadInSvc, nOnC)
+        rows.addRows(nOnC*nD, [(cd, loadShedC + cdCol, 1.0), (cd, loadServedC + cdCol, 1.0)], pdC, pdC)
+        fixC = np.tile(loadFixShed, nOnC)
+        rows.addRows(nOnC*nD, [(cd, loadShedC + cdCol, 1.0)], 0, np.where(fixC, 0, inf))
+
+        # branch flow, one block of nK rows per contingency line (same c may repeat)
+        lineC = np.array([contingencyPos[c] for c in getIndexParam(case, "Contingency_index", CONTINGENCYLINE)], dtype=np.int64)
+        lineOutBranch = getIndexParam(case, "Contingency_branchIdx", CONTINGENCYLINE)
+        lineOutPos = np.array([branchPos.get(k, -1) for k in lineOutBranch], dtype=np.int64)
+        nL = len(CONTINGENCYLINE)
+        flowMask = (contingencyEnabled[lineC][:, None] & brcOnline[None, :]
+                    & (arK[None, :] != lineOutPos[:, None]))
+        lk = (np.arange(nL)[:, None]*nK + arK[None, :])
+        lkCol = pkc + lineC[:, None]*nK + arK[None, :]
+        frmCol = thetaC + lineC[:, None]*nB + frmBusRow[None, :]
+        toCol = thetaC + lineC[:, None]*nB + toBusRow[None, :]
+        invX = np.broadcast_to(1.0/brcX, (nL, nK))
+        rhs = np.where(flowMask, np.broadcast_to(-brcAngle/brcX, (nL, nK)), 0)
+        rows.addRows(nL*nK, [(lk.ravel(), lkCol.ravel(), 1.0),
+                             (lk[flowMask], frmCol[flowMask], -invX[flowMask]),
+                             (lk[flowMask], toCol[flowMask], invX[flowMask])], rhs.ravel(), rhs.ravel())
+
+        # branch flow limit, on every online branch but the outage branches of the contingency
+        outage = np.zeros((nC, nK), dtype=bool)
+        lineOut = lineOutPos >= 0
+        outage[lineC[lineOut], lineOutPos[lineOut]] = True
+        limMask = contingencyEnabled[:, None] & brcOnline[None, :] & np.logical_not(outage)
+        ckCol = pkc + np.arange(nC)[:, None]*nK + arK[None, :]
+        slackCol = np.broadcast_to(brcSlack + arK, (nC, nK))
+        rateC = np.broadcast_to(brcRateC, (nC, nK))
+        numLim = int(limMask.sum())
+        rows.addRows(numLim, [(np.arange(numLim), ckCol[limMask], 1.0), (np.arange(numLim), slackCol[limMask], -1.0)], -inf, rateC[limMask])
+        rows.addRows(numLim, [(np.arange(numLim), ckCol[limMask], 1.0), (np.arange(numLim), slackCol[limMask], 1.0)], -rateC[limMask], inf)
+
+        # unit limits
+        cgCol = pgc + np.arange(nC)[:, None]*nG + arG[None, :]
+        fixPgc = np.logical_not(contingencyEnabled[:, None] & genOnline[None, :])
+        cg = np.arange(nC*nG).reshape(nC, nG)
+        slackMax = np.broadcast_to(pgmaxSlack + arG, (nC, nG))
+        pgMaxC = np.broadcast_to(genPgMax, (nC, nG))
+        rows.addRows(nC*nG, [(cg.ravel(), cgCol.ravel(), 1.0),
+                             (cg[~fixPgc], slackMax[~fixPgc], -1.0)],
+                     np.where(fixPgc, 0, -inf).ravel(), np.where(fixPgc, 0, pgMaxC).ravel())
+        onCG = ~fixPgc
+        numCG = int(onCG.sum())
+        arCG = np.arange(numCG)
+        rows.addRows(numCG, [(arCG, cgCol[onCG], 1.0), (arCG, np.broadcast_to(pgminSlack + arG, (nC, nG))[onCG], 1.0)],
+                     np.broadcast_to(genPgMin, (nC, nG))[onCG], inf)
+        flagCG = contingencyEnabled[:, None] & np.logical_not(genHasCostCurve)[None, :]
+        numFlag = int(flagCG.sum())
+        pgFixed = np.broadcast_to(genPgInit*genInSvc, (nC, nG))[flagCG]
+        rows.addRows(numFlag, [(np.arange(numFlag), cgCol[flagCG], 1.0)], pgFixed, pgFixed)
+        # spin ramp limit
+        pgCol = np.broadcast_to(pg + arG, (nC, nG))[onCG]
+        spinCol = np.broadcast_to(spinRampSlack + arG, (nC, nG))[onCG]
+        spinLim = np.broadcast_to(genSpinRamp*T_SR, (nC, nG))[onCG]
+        rows.addRows(numCG, [(arCG, cgCol[onCG], 1.0), (arCG, pgCol, -1.0), (arCG, spinCol, -1.0)], -inf, spinLim)
+        rows.addRows(numCG, [(arCG, cgCol[onCG], 1.0), (arCG, pgCol, -1.0), (arCG, spinCol, 1.0)], -spinLim, inf)
+
+        # interface limit
+        ciMask = contingencyEnabled[:, None] & interfaceEnabled[None, :]
+        ciCol = totalFlowC + np.arange(nC)[:, None]*nI + arI[None, :]
+        numCI = int(ciMask.sum())
+        rows.addRows(numCI, [(np.arange(numCI), ciCol[ciMask], 1.0),
+                             (np.arange(numCI), np.broadcast_to(interfaceSlack + arI, (nC, nI))[ciMask], -1.0)],
+                     -inf, np.broadcast_to(interfaceLimit, (nC, nI))[ciMask])
+        rowBase = np.arange(nOnC)*nI
+        rows.addRows(nOnC*nI, [((rowBase[:, None] + lineInterfaceRow[None, :]).ravel(),
+                                (pkc + onC[:, None]*nK + lineBranchPos[None, :]).ravel(), 1.0),
+                               ((rowBase[:, None] + arI[None, :]).ravel(), (totalFlowC + onC[:, None]*nI + arI[None, :]).ravel(), -1.0)], 0, 0)
+
+        ## -------------------------------- Objective -----------------------------
+        c = np.zeros(cols.numCol)
+        c[pgi:pgi+nGC] = segPrice
+        c[solarPg:solarPg+nS] = solarCost
+        c[windPg:windPg+nW] = windCost
+        c[sr:sr+nG] = getScalar(case, "SR_price")
+        c[srReqSlack:srReqSlack+nG] = getScalar(case, "SR_penalty")
+        c[brcSlack:brcSlack+nK] = getScalar(case, "BrcFlowLimit_penalty")
+        c[loadShed:loadShed+nD] = getScalar(case, "LoadShed_penalty")
+        c[rampUpSlack:rampUpSlack+nG] = getScalar(case, "energyRampUp_penalty")
+        c[rampDownSlack:rampDownSlack+nG] = getScalar(case, "energyRampDown_penalty")
+        c[spinRampSlack:spinRampSlack+nG] = getScalar(case, "spinRamp_penalty")
+        c[interfaceSlack:interfaceSlack+nI] = getScalar(case, "InterfaceLimit_penalty")
+        c[loadShedC:loadShedC+nC*nD] = getScalar(case, "LoadShed_c_penalty")
+        self.c = c*getScalar(case, "BaseMVA")
+
+        ## -------------------------------- Split into A_ub / A_eq ----------------
+        A = rows.getMatrix(cols.numCol)
+        lower = np.concatenate(rows.lower) if rows.numRow > 0 else np.zeros(0)
+        upper = np.concatenate(rows.upper) if rows.numRow > 0 else np.zeros(0)
+        isEq = lower == upper
+        hasUpper = np.logical_and(np.logical_not(isEq), np.isfinite(upper))
+        hasLower = np.logical_and(np.logical_not(isEq), np.isfinite(lower))
+        self.A_eq = A[isEq]
+        self.b_eq = lower[isEq]
+        self.A_ub = sp.vstack([A[hasUpper], -A[hasLower]], format="csr")
+        self.b_ub = np.concatenate([upper[hasUpper], -lower[hasLower]])
+        self.bounds = cols.getBounds()
+        self.buildTime = time.time() - t0
+        return self
+
+    def getNumRows(self):
+        return self.A_eq.shape[0] + self.A_ub.shape[0]
+
+    def getNumCols(self):
+        return self.columns.numCol
+
+    # solve the LP with HiGHS and return a MatrixSCEDSolution
+    def solve(self, myDiary=None, timeLimit=None):
+        if not hasattr(self, "c"):
+            self.buildLP()
+        options = {}
+        if timeLimit is not None:
+            options["time_limit"] = float(timeLimit)
+        t0 = time.time()
+        result = linprog(self.c, A_ub=self.A_ub, b_ub=self.b_ub, A_eq=self.A_eq, b_eq=self.b_eq,
+                         bounds=self.bounds, method="highs", options=options)
+        self.solveTime = time.time() - t0
+        if myDiary is not None:
+            myDiary.hotlineWithLogType(6, "Matrix-form SCED: " + str(self.getNumRows()) + " rows, " + str(self.getNumCols())
+                                       + " columns, built in " + str(self.buildTime) + " s, solved in " + str(self.solveTime) + " s")
+            myDiary.hotlineWithLogType(6, "linprog status: " + str(result.status) + ", message: " + str(result.message))
+
+        solution = MatrixSCEDSolution(self.case)
+        solution.status = result.status
+        solution.message = result.message
+        x = result.x
+        if x is None:
+            x = np.full(self.columns.numCol, np.nan)
+            objective = np.nan
+        else:
+            objective = result.fun
+        solution.minimizeCost = solvedValue(objective)
+        for name, block in self.columns.blocks.items():
+            offset = block[0]
+            values = {}
+            for i, index in enumerate(block[1]):
+                values[index] = solvedValue(x[offset + i])
+            setattr(solution, name, values)
+        return solution
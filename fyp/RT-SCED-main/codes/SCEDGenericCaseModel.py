@@ -8,6 +8,7 @@ Website: https://rpglab.github.io/resources/RT-SCED_Python/
 
 from __future__ import division
 from pyomo.environ import *
+from pyomo.core.expr import LinearExpression
 
 model = AbstractModel()
 
@@ -66,8 +67,8 @@ model.Gen_type = Param(model.GEN, mutable=True)
   # New parameter to classify generators
 
 # Solar and Wind Generators
-model.Solar_pgMax = Param(model.SOLAR_GEN, within=NonNegativeReals)
-model.Wind_pgMax = Param(model.WIND_GEN, within=NonNegativeReals)
+model.Solar_pgMax = Param(model.SOLAR_GEN, within=NonNegativeReals, mutable=True)
+model.Wind_pgMax = Param(model.WIND_GEN, within=NonNegativeReals, mutable=True)
 
 
 
@@ -113,6 +114,134 @@ model.Contingency_isEnabled = Param (model.CONTINGENCY)
 model.CONTINGENCYLINE = Set()
 model.Contingency_index = Param (model.CONTINGENCYLINE)
 model.Contingency_branchIdx = Param (model.CONTINGENCYLINE)
+model.useCompactContingency = Param (default=0)  # 1: post-contingency flows from PTDF/LODF instead of theta_c/pkc
+model.useContingencyScreening = Param (default=0)  # 1: compact flow limits start empty and are added by ContingencyScreening
+
+## -------------------------------- Index maps --------------------------------
+# The maps below are built once per instance (BuildAction), so that each rule
+# only visits its own members instead of scanning a whole set.
+
+# Generator -> list of its GENCOST segment indices, for the cost-curve rules
+def build_GenCostSegments(model):
+    model.segmentIdxOfGen = {}
+    for i in model.GENCOST:
+        model.segmentIdxOfGen.setdefault(model.GenCost_genIdx[i], []).append(i)
+model.genCostSegments = BuildAction(rule=build_GenCostSegments)
+
+# Interface -> list of its INTERFACELINE indices, for the interface flow rules
+def build_InterfaceLines(model):
+    model.lineIdxOfInterface = {}
+    for k in model.INTERFACELINE:
+        model.lineIdxOfInterface.setdefault(model.Interfaceline_interfaceIdx[k], []).append(k)
+model.interfaceLines = BuildAction(rule=build_InterfaceLines)
+
+# Bus -> gens, renewables, loads and branches connected to it, for the nodal balances
+def build_BusIncidence(model):
+    model.genIdxAtBus = {}
+    model.solarIdxAtBus = {}
+    model.windIdxAtBus = {}
+    model.loadIdxAtBus = {}
+    model.frmBranchIdxAtBus = {}
+    model.toBranchIdxAtBus = {}
+    for g in model.GEN:
+        model.genIdxAtBus.setdefault(model.Gen_busNumber[g], []).append(g)
+    for s in model.SOLAR_GEN:
+        model.solarIdxAtBus.setdefault(model.Solar_busNumber[s], []).append(s)
+    for w in model.WIND_GEN:
+        model.windIdxAtBus.setdefault(model.Wind_busNumber[w], []).append(w)
+    for d in model.LOAD:
+        model.loadIdxAtBus.setdefault(model.Load_busNumber[d], []).append(d)
+    for k in model.BRANCH:
+        model.frmBranchIdxAtBus.setdefault(model.Branch_frmBusNumber[k], []).append(k)
+        model.toBranchIdxAtBus.setdefault(model.Branch_toBusNumber[k], []).append(k)
+model.busIncidence = BuildAction(rule=build_BusIncidence)
+
+## -------------------------------- Compact contingency formulation -----------
+# With useCompactContingency = 1 the network is not copied for every
+# contingency: the post-contingency flow of branch k is the base-case flow plus
+# the LODF-weighted base-case flows of the outaged branches,
+# pk[k] + LODF_c[k,:]*pk[outaged], so only the K x |outaged| LODF columns of
+# each contingency are kept. This is a preventive model, as the dFax limits of
+# the real case: there is no corrective redispatch or post-contingency load
+# shed, and pgc, loadServed_c, loadShed_c, theta_c, pkc and their constraints
+# are only created for the full formulation (the *_FULL sets below are empty).
+def build_CompactContingency(model):
+    model.outageBranchesOfCtgcy = {}
+    model.ctgcyFlowFactors = {}
+    model.islandingCtgcys = []  # contingencies that island the network, without post-contingency flow limits
+    for cL in model.CONTINGENCYLINE:
+        model.outageBranchesOfCtgcy.setdefault(model.Contingency_index[cL], []).append(model.Contingency_branchIdx[cL])
+    if value(model.useCompactContingency) == 0:
+        return
+    import SensitivityFactors
+    busPos = dict((n, i) for i, n in enumerate(model.BUS))
+    branches = list(model.BRANCH)
+    brcPos = dict((k, i) for i, k in enumerate(branches))
+    frmPos = [busPos[model.Branch_frmBusNumber[k]] for k in branches]
+    toPos = [busPos[model.Branch_toBusNumber[k]] for k in branches]
+    x = [model.Branch_x[k] for k in branches]
+    isInSvc = [model.Branch_isInSvc[k] for k in branches]
+    ptdf = SensitivityFactors.calcPTDF(len(busPos), frmPos, toPos, x, isInSvc)
+    for c in model.CONTINGENCY:
+        if value(model.Contingency_isEnabled[c]) == 0:
+            continue
+        outaged = [k for k in model.outageBranchesOfCtgcy.get(c, []) if model.Branch_isInSvc[k] != 0]
+        lodf = SensitivityFactors.calcLODF(ptdf, frmPos, toPos, [brcPos[k] for k in outaged])
+        if lodf is None:
+            model.islandingCtgcys.append(c)  # logged by the runner
+            continue
+        model.ctgcyFlowFactors[c] = [lodf, outaged, brcPos]
+model.compactContingency = BuildAction(rule=build_CompactContingency)
+
+def init_ContingencyFull(model):
+    if value(model.useCompactContingency) == 0:
+        return list(model.CONTINGENCY)
+    return []
+model.CONTINGENCY_FULL = Set(initialize=init_ContingencyFull)
+
+def init_ContingencyLineFull(model):
+    if value(model.useCompactContingency) == 0:
+        return list(model.CONTINGENCYLINE)
+    return []
+model.CONTINGENCYLINE_FULL = Set(initialize=init_ContingencyLineFull)
+
+def init_ContingencyCompact(model):
+    if value(model.useCompactContingency) == 0:
+        return []
+    return [c for c in model.CONTINGENCY if value(model.Contingency_isEnabled[c]) == 1]
+model.CONTINGENCY_COMPACT = Set(initialize=init_ContingencyCompact)
+
+# (contingency, branch) pairs with a post-contingency flow limit: the
+# in-service, non-outaged branches. With useContingencyScreening = 1 it starts
+# empty and the violated pairs are added between solves.
+def init_CtgcyMonitor(model):
+    pairs = []
+    if value(model.useContingencyScreening) == 1:
+        return pairs
+    for c in model.CONTINGENCY_COMPACT:
+        if c not in model.ctgcyFlowFactors:
+            continue
+        outaged = model.outageBranchesOfCtgcy.get(c, [])
+        for k in model.BRANCH:
+            if model.Branch_isInSvc[k] != 0 and k not in outaged:
+                pairs.append((c, k))
+    return pairs
+model.CTGCY_MONITOR = Set(dimen=2, initialize=init_CtgcyMonitor)
+
+# (contingency, branch) pairs with a post-contingency flow expression: the
+# monitored pairs and every interface line.
+def init_CtgcyFlow(model):
+    pairs = list(model.CTGCY_MONITOR)
+    interfaceBranches = set(model.Interfaceline_branchIdx[k] for k in model.INTERFACELINE)
+    for c in model.CONTINGENCY_COMPACT:
+        if c not in model.ctgcyFlowFactors:
+            continue
+        for k in model.BRANCH:
+            if k in interfaceBranches and (c, k) not in model.CTGCY_MONITOR:
+                pairs.append((c, k))
+    return pairs
+model.CTGCY_FLOW = Set(dimen=2, initialize=init_CtgcyFlow)
+
 
 ## ****************************************************************************
 ##						  Variables
@@ -136,13 +265,24 @@ model.pk = Var(model.BRANCH) # branch line flow
 model.totalFlowForInterface = Var(model.INTERFACE, initialize = 0) # total line flow for an interface
 
 ## --------------- Contingency-related variables ------------------------------
-model.pgc = Var(model.GEN, model.CONTINGENCY)   # note the set order 
-model.theta_c = Var(model.CONTINGENCY, model.BUS)
-model.pkc = Var(model.CONTINGENCY, model.BRANCH)
-model.loadServed_c = Var(model.CONTINGENCY, model.LOAD, initialize = 0)
-model.loadShed_c = Var(model.CONTINGENCY, model.LOAD, within=NonNegativeReals, initialize = 0)
+model.pgc = Var(model.GEN, model.CONTINGENCY_FULL)   # note the set order 
+model.theta_c = Var(model.CONTINGENCY_FULL, model.BUS)
+model.pkc = Var(model.CONTINGENCY_FULL, model.BRANCH)
+model.loadServed_c = Var(model.CONTINGENCY_FULL, model.LOAD, initialize = 0)
+model.loadShed_c = Var(model.CONTINGENCY_FULL, model.LOAD, within=NonNegativeReals, initialize = 0)
 model.totalFlowForInterface_c = Var(model.CONTINGENCY, model.INTERFACE, initialize = 0)
 
+# post-contingency branch flow of the compact formulation, only LODF above
+# 1e-10 are kept
+def expr_CtgcyFlow(model, c, k):
+    lodf, outaged, brcPos = model.ctgcyFlowFactors[c]
+    row = lodf[brcPos[k]]
+    nz = (abs(row) > 1e-10).nonzero()[0]
+    coefs = [1.0] + row[nz].tolist()
+    linearVars = [model.pk[k]] + [model.pk[outaged[i]] for i in nz]
+    return LinearExpression(constant=0.0, linear_coefs=coefs, linear_vars=linearVars)
+model.ctgcyFlow = Expression(model.CTGCY_FLOW, rule=expr_CtgcyFlow)
+
 ## ------------------------------ Slack variable for some constraints ---------
 model.pgmaxSlackVar = Var(model.GEN, within=NonNegativeReals, initialize = 0)
 model.pgminSlackVar = Var(model.GEN, within=NonNegativeReals, initialize = 0)
@@ -170,12 +310,12 @@ model.windGenLimitConst = Constraint(model.WIND_GEN, rule=const_WindGenLimit)
 
 ## -------------------------------- System power balance equation -------------
 def const_NodeBal(model, n):
-    expr = sum(model.pg[g] for g in model.GEN if model.Gen_busNumber[g] == n)
-    expr += sum(model.Solar_pg[s] for s in model.SOLAR_GEN if model.Solar_busNumber[s] == n)
-    expr += sum(model.Wind_pg[w] for w in model.WIND_GEN if model.Wind_busNumber[w] == n)
-    expr -= sum(model.loadServed[d] for d in model.LOAD if model.Load_busNumber[d] == n)
-    expr -= sum(model.pk[k] for k in model.BRANCH if model.Branch_frmBusNumber[k] == n)
-    expr += sum(model.pk[k] for k in model.BRANCH if model.Branch_toBusNumber[k] == n)
+    expr = sum(model.pg[g] for g in model.genIdxAtBus.get(n, []))
+    expr += sum(model.Solar_pg[s] for s in model.solarIdxAtBus.get(n, []))
+    expr += sum(model.Wind_pg[w] for w in model.windIdxAtBus.get(n, []))
+    expr -= sum(model.loadServed[d] for d in model.loadIdxAtBus.get(n, []))
+    expr -= sum(model.pk[k] for k in model.frmBranchIdxAtBus.get(n, []))
+    expr += sum(model.pk[k] for k in model.toBranchIdxAtBus.get(n, []))
     return expr == 0
 model.nodeBalConst = Constraint(model.BUS, rule=const_NodeBal)
 
@@ -243,24 +383,17 @@ def const_BrcFlowLimit_2(model, k):
 model.brcFlowLimit_2 = Constraint(model.BRANCH, rule = const_BrcFlowLimit_2)
 
 ## -------------------------------- Gen cost curve limit ----------------------
-# Consider to use Dictionary to speed up the process of adding const_GenSegmentSum
 def const_GenSegmentSum(model, g):
     if value(model.Gen_isInSvc[g]) == 0:
         return model.pg[g] == 0
     elif value(model.Gen_pgInit[g]) <= 0:
         return Constraint.Skip
     else:
-        expr = 0
-        idx = 0
-        for i in model.GENCOST:
-            unit = model.GenCost_genIdx[i]
-            if g == unit:
-                idx = idx + 1
-                expr = expr + model.pgi[i]
-        if idx == 0:
+        segments = model.segmentIdxOfGen.get(g, [])
+        if len(segments) == 0:
             return Constraint.Skip
         else:
-            expr = expr - model.pg[g]
+            expr = sum(model.pgi[i] for i in segments) - model.pg[g]
             return expr == 0
 model.genSegmentSumConst = Constraint(model.GEN, rule=const_GenSegmentSum)
 
@@ -360,10 +493,7 @@ model.interfaceLimitConst = Constraint(model.INTERFACE, rule=const_InterfaceLimi
 
 
 def const_CalcInterfaceTotalFlow(model, i):
-    expr = 0
-    for k in model.INTERFACELINE:
-        if model.Interfaceline_interfaceIdx[k] == i:
-            expr = expr + model.pk[model.Interfaceline_branchIdx[k]]
+    expr = sum(model.pk[model.Interfaceline_branchIdx[k]] for k in model.lineIdxOfInterface.get(i, []))
     return expr == model.totalFlowForInterface[i]
 model.calcInterfaceTotalFlowConst = Constraint(model.INTERFACE, rule = const_CalcInterfaceTotalFlow)
 
@@ -373,12 +503,12 @@ def const_NodeBal_Ctgcy(model, c, n):
     if value(model.Contingency_isEnabled[c]) == 0:
         return Constraint.Skip
     else:
-        expr = sum(model.pgc[g, c] for g in model.GEN if model.Gen_busNumber[g] == n)
-        expr -= sum(model.loadServed_c[c, d] for d in model.LOAD if model.Load_busNumber[d] == n)
-        expr -= sum(model.pkc[c, k] for k in model.BRANCH if model.Branch_frmBusNumber[k] == n)
-        expr += sum(model.pkc[c, k] for k in model.BRANCH if model.Branch_toBusNumber[k] == n)
+        expr = sum(model.pgc[g, c] for g in model.genIdxAtBus.get(n, []))
+        expr -= sum(model.loadServed_c[c, d] for d in model.loadIdxAtBus.get(n, []))
+        expr -= sum(model.pkc[c, k] for k in model.frmBranchIdxAtBus.get(n, []))
+        expr += sum(model.pkc[c, k] for k in model.toBranchIdxAtBus.get(n, []))
         return expr == 0
-model.nodeBalConst_Ctgcy = Constraint(model.CONTINGENCY, model.BUS, rule=const_NodeBal_Ctgcy)
+model.nodeBalConst_Ctgcy = Constraint(model.CONTINGENCY_FULL, model.BUS, rule=const_NodeBal_Ctgcy)
 
 
 def const_LoadTotalLimit_Ctgcy(model, c, d):
@@ -388,7 +518,7 @@ def const_LoadTotalLimit_Ctgcy(model, c, d):
         expr = model.loadShed_c[c, d] + model.loadServed_c[c, d]
         expr -= model.Load_pd[d] * model.Load_isInSvc[d]
         return expr == 0
-model.loadTotalConst_Ctgcy = Constraint(model.CONTINGENCY, model.LOAD, rule=const_LoadTotalLimit_Ctgcy)
+model.loadTotalConst_Ctgcy = Constraint(model.CONTINGENCY_FULL, model.LOAD, rule=const_LoadTotalLimit_Ctgcy)
 
 
 def const_FixOfflineAndNegativeLoad_Ctgcy(model, c, d):
@@ -400,7 +530,7 @@ def const_FixOfflineAndNegativeLoad_Ctgcy(model, c, d):
         return model.loadShed_c[c, d] == 0
     else:
         return model.loadShed_c[c, d] >= 0
-model.fixOfflineAndNegativeLoad_Ctgcy = Constraint(model.CONTINGENCY, model.LOAD, rule = const_FixOfflineAndNegativeLoad_Ctgcy)
+model.fixOfflineAndNegativeLoad_Ctgcy = Constraint(model.CONTINGENCY_FULL, model.LOAD, rule = const_FixOfflineAndNegativeLoad_Ctgcy)
 
 ## Branch flow calculation
 def const_CalcFlow_Ctgcy(model, cL, k):
@@ -414,32 +544,42 @@ def const_CalcFlow_Ctgcy(model, cL, k):
     else:
         expr = model.pkc[c, k] - (model.theta_c[c, model.Branch_frmBusNumber[k]] - model.theta_c[c, model.Branch_toBusNumber[k]] - model.Branch_angle[k]) / model.Branch_x[k]
         return expr == 0
-model.brcFlowCalcConst_Ctgcy = Constraint(model.CONTINGENCYLINE, model.BRANCH, rule = const_CalcFlow_Ctgcy)
+model.brcFlowCalcConst_Ctgcy = Constraint(model.CONTINGENCYLINE_FULL, model.BRANCH, rule = const_CalcFlow_Ctgcy)
 
 ##  Branch flow limit 
 def const_BrcFlowLimit_Ctgcy(model, c, k):
     if value(model.Contingency_isEnabled[c]) == 0:
         return Constraint.Skip
-    elif model.Contingency_branchIdx[c] == k:
+    elif k in model.outageBranchesOfCtgcy.get(c, []):
         return Constraint.Skip
     elif model.Branch_isInSvc[k] == 0:
         return Constraint.Skip
     else:
         expr = model.pkc[c, k] - model.brcFlowLimitSlackVar[k]
         return expr <= model.Branch_rateC[k]
-model.brcFlowLimit_Ctgcy = Constraint(model.CONTINGENCY, model.BRANCH, rule = const_BrcFlowLimit_Ctgcy)
+model.brcFlowLimit_Ctgcy = Constraint(model.CONTINGENCY_FULL, model.BRANCH, rule = const_BrcFlowLimit_Ctgcy)
 
 def const_BrcFlowLimit_2_Ctgcy(model, c, k):
     if value(model.Contingency_isEnabled[c]) == 0:
         return Constraint.Skip
-    elif model.Contingency_branchIdx[c] == 0:
+    elif k in model.outageBranchesOfCtgcy.get(c, []):
         return Constraint.Skip
     elif model.Branch_isInSvc[k] == 0:
         return Constraint.Skip
     else:
         expr = model.pkc[c, k] + model.brcFlowLimitSlackVar[k]
         return expr >= -model.Branch_rateC[k]
-model.brcFlowLimit_2_Ctgcy = Constraint(model.CONTINGENCY, model.BRANCH, rule = const_BrcFlowLimit_2_Ctgcy)
+model.brcFlowLimit_2_Ctgcy = Constraint(model.CONTINGENCY_FULL, model.BRANCH, rule = const_BrcFlowLimit_2_Ctgcy)
+
+def const_BrcFlowLimit_Compact(model, c, k):
+    expr = model.ctgcyFlow[c, k] - model.brcFlowLimitSlackVar[k]
+    return expr <= model.Branch_rateC[k]
+model.brcFlowLimit_Compact = Constraint(model.CTGCY_MONITOR, rule = const_BrcFlowLimit_Compact)
+
+def const_BrcFlowLimit_2_Compact(model, c, k):
+    expr = model.ctgcyFlow[c, k] + model.brcFlowLimitSlackVar[k]
+    return expr >= -model.Branch_rateC[k]
+model.brcFlowLimit_2_Compact = Constraint(model.CTGCY_MONITOR, rule = const_BrcFlowLimit_2_Compact)
 
 ##  Unit limit 
 def const_GenMaxLimit_Ctgcy(model, c, g):
@@ -449,7 +589,7 @@ def const_GenMaxLimit_Ctgcy(model, c, g):
         return model.pgc[g, c] == 0
     else:
         return model.pgc[g, c] - model.pgmaxSlackVar[g] <= model.Gen_pgMax[g]
-model.genMaxLimitConst_Ctgcy = Constraint(model.CONTINGENCY, model.GEN, rule=const_GenMaxLimit_Ctgcy)
+model.genMaxLimitConst_Ctgcy = Constraint(model.CONTINGENCY_FULL, model.GEN, rule=const_GenMaxLimit_Ctgcy)
 
 
 def const_GenMinLimit_Ctgcy(model, c, g):
@@ -459,7 +599,7 @@ def const_GenMinLimit_Ctgcy(model, c, g):
         return Constraint.Skip
     else:
         return model.pgc[g, c] + model.pgminSlackVar[g] >= model.Gen_pgMin[g]
-model.genMinLimitConst_Ctgcy = Constraint(model.CONTINGENCY, model.GEN, rule=const_GenMinLimit_Ctgcy)
+model.genMinLimitConst_Ctgcy = Constraint(model.CONTINGENCY_FULL, model.GEN, rule=const_GenMinLimit_Ctgcy)
 
 
 def const_GenCostCurveFlag_Ctgcy(model, c, g):
@@ -469,7 +609,7 @@ def const_GenCostCurveFlag_Ctgcy(model, c, g):
         return model.pgc[g, c] == model.Gen_pgInit[g] * model.Gen_isInSvc[g]
     else:
         return Constraint.Skip
-model.genCostCurveFlagConst_Ctgcy = Constraint(model.CONTINGENCY, model.GEN, rule=const_GenCostCurveFlag_Ctgcy)
+model.genCostCurveFlagConst_Ctgcy = Constraint(model.CONTINGENCY_FULL, model.GEN, rule=const_GenCostCurveFlag_Ctgcy)
 
 
 ## Spin ramp limit
@@ -481,7 +621,7 @@ def const_SpinRampLimit_Ctgcy(model, c, g):
     else:
         expr = model.pgc[g, c] - model.pg[g]
         return expr <= model.Gen_spinRamp[g] * model.T_SR + model.spinRampSlackVar[g]
-model.spinRampLimit_Ctgcy = Constraint(model.CONTINGENCY, model.GEN, rule=const_SpinRampLimit_Ctgcy)
+model.spinRampLimit_Ctgcy = Constraint(model.CONTINGENCY_FULL, model.GEN, rule=const_SpinRampLimit_Ctgcy)
 
 
 def const_SpinRampLimit_2_Ctgcy(model, c, g):
@@ -492,7 +632,7 @@ def const_SpinRampLimit_2_Ctgcy(model, c, g):
     else:
         expr = model.pgc[g, c] - model.pg[g]
         return expr >= -model.Gen_spinRamp[g]*model.T_SR - model.spinRampSlackVar[g]
-model.spinRampLimit_2_Ctgcy = Constraint(model.CONTINGENCY, model.GEN, rule = const_SpinRampLimit_2_Ctgcy)
+model.spinRampLimit_2_Ctgcy = Constraint(model.CONTINGENCY_FULL, model.GEN, rule = const_SpinRampLimit_2_Ctgcy)
 
 ## Interface limit
 def const_InterfaceLimit_Ctgcy(model, c, i):
@@ -509,11 +649,12 @@ model.interfaceLimitConst_Ctgcy = Constraint(model.CONTINGENCY, model.INTERFACE,
 def const_CalcInterfaceTotalFlow_Ctgcy(model, c, i):
     if value(model.Contingency_isEnabled[c]) == 0:  # Use value() for evaluation
         return Constraint.Skip
+    elif value(model.useCompactContingency) == 1:
+        expr = sum(model.ctgcyFlow[c, model.Interfaceline_branchIdx[k]] for k in model.lineIdxOfInterface.get(i, [])
+                   if (c, model.Interfaceline_branchIdx[k]) in model.CTGCY_FLOW)
+        return expr == model.totalFlowForInterface_c[c, i]
     else:
-        expr = 0
-        for k in model.INTERFACELINE:
-            if value(model.Interfaceline_interfaceIdx[k]) == i:  # Use value() for comparison
-                expr += model.pkc[c, model.Interfaceline_branchIdx[k]]
+        expr = sum(model.pkc[c, model.Interfaceline_branchIdx[k]] for k in model.lineIdxOfInterface.get(i, []))
         return expr == model.totalFlowForInterface_c[c, i]
 model.calcInterfaceTotalFlowConst_Ctgcy = Constraint(model.CONTINGENCY, model.INTERFACE, rule=const_CalcInterfaceTotalFlow_Ctgcy)
 
@@ -552,7 +693,7 @@ def costObj(model):
     ramp_down_penalty = model.energyRampDown_penalty * sum(model.energyRampDownSlackVar[g] for g in model.GEN)
     interface_limit_penalty = model.InterfaceLimit_penalty * sum(model.interfaceLimiteSlackVar[k] for k in model.INTERFACE)
     contingency_penalty = model.LoadShed_c_penalty * sum(
-        model.loadShed_c[c, d] for c in model.CONTINGENCY for d in model.LOAD
+        model.loadShed_c[c, d] for c in model.CONTINGENCY_FULL for d in model.LOAD
     )
 
     # Spinning reserves and slack variables
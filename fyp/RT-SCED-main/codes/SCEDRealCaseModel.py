@@ -109,7 +109,11 @@ model.Constraint_monitorBranchIdx = Param (model.CONSTRAINT) # Monitored Branch
 model.Constraint_monitorBranchLimit = Param (model.CONSTRAINT, mutable=True) # Monitored Branch thermal limit
 
 ## -------------------------------- DFAX Data ---------------------------------
-model.dFax = Param (model.GEN, model.CONSTRAINT) # Monitored Branch thermal limit
+# only the nonzero distribution factors are given, one (gen, constraint, value) per DFAX index
+model.DFAX = Set()
+model.DFax_genIdx = Param (model.DFAX) # Gen index
+model.DFax_constraintIdx = Param (model.DFAX) # Constraint index
+model.DFax_value = Param (model.DFAX) # distribution factor of the gen on the monitored branch of the constraint
 
 ## -------------------------------- Auxiliary Data ----------------------------
 model.BaseMVA = Param (default=100)  # look-ahead time for single period RT SCED
@@ -130,6 +134,32 @@ model.Interfaceline_branchIdx = Param (model.INTERFACELINE)
 model.dFaxForInterface = Param (model.GEN, model.INTERFACELINE) # Monitored Branch thermal limit
 
 
+## -------------------------------- Index maps --------------------------------
+# Built once per instance, as in SCEDGenericCaseModel.
+
+# Interface -> list of its INTERFACELINE indices, for the interface total flow rule
+def build_InterfaceLines(model):
+    model.lineIdxOfInterface = {}
+    for k in model.INTERFACELINE:
+        model.lineIdxOfInterface.setdefault(model.Interfaceline_interfaceIdx[k], []).append(k)
+model.interfaceLines = BuildAction(rule=build_InterfaceLines)
+
+# Constraint -> list of (gen index, dFax) of its nonzero distribution factors,
+# for the branch flow calculation
+def build_DFaxOfConstraint(model):
+    model.dFaxOfConstraint = {}
+    for i in model.DFAX:
+        model.dFaxOfConstraint.setdefault(model.DFax_constraintIdx[i], []).append((model.DFax_genIdx[i], model.DFax_value[i]))
+model.dFaxMap = BuildAction(rule=build_DFaxOfConstraint)
+
+# Generator -> list of its GENCOST segment indices, for the cost-curve rules
+def build_GenCostSegments(model):
+    model.segmentIdxOfGen = {}
+    for i in model.GENCOST:
+        model.segmentIdxOfGen.setdefault(model.GenCost_genIdx[i], []).append(i)
+model.genCostSegments = BuildAction(rule=build_GenCostSegments)
+
+
 ## ****************************************************************************
 ##						  Variables
 ## ****************************************************************************
@@ -210,21 +240,20 @@ def const_CalcFlow(model, k):
     idxCntcy = model.Constraint_contingencyIdx[k]  # should be an index that is also contained with Scenario IndexSet
     expr = model.Branch_pkInit[idxBrc]
     if model.Contingency_branchIdx[idxCntcy] == -2:
-        for g in model.GEN:
+        for g, dFax in model.dFaxOfConstraint.get(k, []):
             if model.Gen_isInSvc[g] == 1:
-                expr = expr + model.dFax[g, k]*(model.pg[g] - model.Gen_pgInit[g])
+                expr = expr + dFax*(model.pg[g] - model.Gen_pgInit[g])
         expr = expr - model.pk[k]
         return expr == 0
     else:
-        for g in model.GEN:
+        for g, dFax in model.dFaxOfConstraint.get(k, []):
             if model.Gen_isInSvc[g] == 1:
-                expr = expr + model.dFax[g, k]*(model.pgc[g, idxCntcy] - model.Gen_pgInit[g])
+                expr = expr + dFax*(model.pgc[g, idxCntcy] - model.Gen_pgInit[g])
         expr = expr - model.pk[k]
         return expr == 0
 model.brcFlowCalcConst = Constraint(model.CONSTRAINT, rule = const_CalcFlow)
 
 ## -------------------------------- Gen segment output sum --------------------
-# Consider to use Dictionary to speed up the process of adding const_GenSegmentSum
 def const_GenSegmentSum(model, g):
     if model.Gen_isInSvc[g] == 0:
         return model.pg[g] == 0
@@ -233,18 +262,12 @@ def const_GenSegmentSum(model, g):
     elif value(model.Gen_pgInit[g]) <= 0:
         return Constraint.Skip
     else:
-        expr = 0
-        idx = 0
-        for i in model.GENCOST:
-            unit = model.GenCost_genIdx[i]
-            if g == unit:
-                idx = idx + 1
-                expr = expr + model.pgi[i]
-        if idx == 0:
+        segments = model.segmentIdxOfGen.get(g, [])
+        if len(segments) == 0:
             print ("Something wrong: no cost segment found for generator ", str(g))
             return Constraint.Skip
         else:
-            expr = expr - model.pg[g]
+            expr = sum(model.pgi[i] for i in segments) - model.pg[g]
             return expr == 0
 model.genSegmentSumConst = Constraint(model.GEN, rule = const_GenSegmentSum)
 
@@ -474,10 +497,7 @@ def const_InterfaceLimit(model, i):
 model.interfaceLimitConst = Constraint(model.INTERFACE, rule = const_InterfaceLimit)
 
 def const_CalcInterfaceTotalFlow(model, i):
-    expr = 0
-    for k in model.INTERFACELINE:
-        if model.Interfaceline_interfaceIdx[k] == i:
-            expr = expr + model.pkForInterfaceLine[k]
+    expr = sum(model.pkForInterfaceLine[k] for k in model.lineIdxOfInterface.get(i, []))
     return expr == model.totalFlowForInterface[i]
 model.calcInterfaceTotalFlowConst = Constraint(model.INTERFACE, rule = const_CalcInterfaceTotalFlow)
 
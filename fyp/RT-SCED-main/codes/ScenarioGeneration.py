@@ -1,35 +1,85 @@
+"""
+Generate solar/wind scenarios with a Wasserstein GAN trained on the Austrian
+renewable data, then reduce them to 25 scenarios (KMeans by default, see
+ScenarioReduction.py for the other methods). With --trajectories, a second
+GAN generates whole-day trajectories (288 five-minute periods by default)
+that are streamed to a .npy file of shape [N, periods, 2].
+
+How to run: go to the program directory, and type down the below command
+    python ScenarioGeneration.py [--date 2017-06-15] [--epochs 5000] [--batch-size 64] [--threads N]
+    python ScenarioGeneration.py --start 2017-01-01 --end 2017-12-31 [--patience 200]
+    python ScenarioGeneration.py --sample-only [--num-scenarios N] [--checkpoint file.pt]
+    python ScenarioGeneration.py --reduction forward [--num-reduced 25]
+    python ScenarioGeneration.py --format store [--store-folder scenario_store]
+    python ScenarioGeneration.py --trajectories 100000 --start 2017-01-01 --end 2017-12-31 [--time-frame 5] [--chunk-size 10000]
+The trained networks and the data scaler are saved in gan_checkpoints/, keyed
+by the hash of the data file and the training dates, and reused by the next
+runs on the same data (--retrain to train again).
+"""
+
+import argparse
+import hashlib
+import os
+import time
 import pandas as pd
 import numpy as np
 import torch
 from torch import nn, optim
+from torch.utils.data import TensorDataset, DataLoader
 from sklearn.preprocessing import MinMaxScaler
-from sklearn.cluster import KMeans
 
-# Load the dataset
-data = pd.read_csv("Austria_data_2016-2019.csv")
+import ScenarioReduction
+import ScenarioStore
+
+
+# Renewable units of the generated scenarios (same as in the .dat files)
+scenario_units = [{"index": 8, "type": "SOLAR_GEN", "bus": 10},
+                  {"index": 9, "type": "WIND_GEN", "bus": 3}]
+
+# Write (solar, wind) scenarios [S, 2] with their probabilities to a ScenarioStore folder
+def write_scenario_store(folder, ids, scenarios, probabilities, pg_max=(50.0, 70.0)):
+    num = len(scenarios)
+    columns = {'pgInit': scenarios,
+               'pgMax': np.tile(np.asarray(pg_max), (num, 1)),
+               'pgMin': np.zeros((num, 2)),
+               'isInSvc': np.ones((num, 2))}
+    ScenarioStore.writeScenarioStoreArrays(folder, ids, probabilities, scenario_units, columns)
+
+
+# Load the solar and wind columns of the dataset between startDate and endDate
+# (both included, "YYYY-MM-DD")
+def load_renewable_data(fileName, startDate, endDate):
+    data = pd.read_csv(fileName)
+    data['utc_timestamp'] = pd.to_datetime(data['utc_timestamp'])
+    dates = data['utc_timestamp'].dt.date
+    period_data = data[(dates >= pd.to_datetime(startDate).date()) & (dates <= pd.to_datetime(endDate).date())]
+
+    # Validate solar and wind column names
+    if 'solar' not in period_data.columns or 'wind' not in period_data.columns:
+        raise KeyError("The columns 'solar' and 'wind' do not exist in the dataset. Check the column names.")
+    period_data = period_data[['solar', 'wind']].dropna()
+    if len(period_data) == 0:
+        raise ValueError(f"No solar and wind data between {startDate} and {endDate}")
+    return period_data.values
+
+
+# Whole-day (solar, wind) profiles between startDate and endDate, resampled
+# (linear interpolation) to num_periods periods per day: array [days, num_periods, 2].
+# Days without data for every period are left out.
+def load_daily_profiles(fileName, startDate, endDate, num_periods):
+    data = pd.read_csv(fileName)
+    data['utc_timestamp'] = pd.to_datetime(data['utc_timestamp'])
+    if 'solar' not in data.columns or 'wind' not in data.columns:
+        raise KeyError("The columns 'solar' and 'wind' do not exist in the dataset. Check the column names.")
+    series = data.set_index('utc_timestamp')[['solar', 'wind']].sort_index()
+    series = series.resample(f"{24*60//num_periods}min").mean().interpolate(limit_area='inside')
+    dates = series.index.date
+    series = series[(dates >= pd.to_datetime(startDate).date()) & (dates <= pd.to_datetime(endDate).date())]
+    days = [day.values for _, day in series.groupby(series.index.date) if len(day) == num_periods and not day.isna().values.any()]
+    if len(days) == 0:
+        raise ValueError(f"No complete day of solar and wind data between {startDate} and {endDate}")
+    return np.stack(days)
 
-# Preprocess the data for one particular day (e.g., "2017-06-15")
-fixed_date = '2017-06-15'
-data['utc_timestamp'] = pd.to_datetime(data['utc_timestamp'])
-day_data = data[data['utc_timestamp'].dt.date == pd.to_datetime(fixed_date).date()]
-
-# Validate solar and wind column names
-if 'solar' not in day_data.columns or 'wind' not in day_data.columns:
-    raise KeyError("The columns 'solar' and 'wind' do not exist in the dataset. Check the column names.")
-
-solar_data = day_data['solar'].values
-wind_data = day_data['wind'].values
-
-# Normalize the solar and wind data (for GAN)
-scaler = MinMaxScaler()
-solar_data_scaled = scaler.fit_transform(solar_data.reshape(-1, 1)).flatten()
-wind_data_scaled = scaler.fit_transform(wind_data.reshape(-1, 1)).flatten()
-
-# Combine solar and wind data into a single array
-input_data = np.stack((solar_data_scaled, wind_data_scaled), axis=1)
-
-# Convert to PyTorch tensors
-input_tensor = torch.tensor(input_data, dtype=torch.float32)
 
 # Define the Generator (G) and Discriminator (D) for CIWGAN
 
@@ -57,111 +107,372 @@ class Discriminator(nn.Module):
         x = torch.relu(self.fc2(x))
         return self.fc3(x)
 
-# Initialize the generator and discriminator
-generator = Generator(input_dim=2, output_dim=2)  # 2 for solar and wind
-discriminator = Discriminator(input_dim=2)
+# Generator and discriminator of whole-day trajectories: the generator maps
+# noise_dim noise to [num_periods, 2] (solar, wind) trajectories, so that the
+# periods of a trajectory are correlated
+
+class TrajectoryGenerator(nn.Module):
+    def __init__(self, noise_dim, num_periods):
+        super(TrajectoryGenerator, self).__init__()
+        self.num_periods = num_periods
+        self.fc1 = nn.Linear(noise_dim, 256)
+        self.fc2 = nn.Linear(256, 512)
+        self.fc3 = nn.Linear(512, num_periods*2)
 
-# Wasserstein GAN Loss and Optimizers
+    def forward(self, x):
+        x = torch.relu(self.fc1(x))
+        x = torch.relu(self.fc2(x))
+        return self.fc3(x).view(-1, self.num_periods, 2)
+
+class TrajectoryDiscriminator(nn.Module):
+    def __init__(self, num_periods):
+        super(TrajectoryDiscriminator, self).__init__()
+        self.fc1 = nn.Linear(num_periods*2, 256)
+        self.fc2 = nn.Linear(256, 64)
+        self.fc3 = nn.Linear(64, 1)
+
+    def forward(self, x):
+        x = torch.relu(self.fc1(x.flatten(start_dim=1)))
+        x = torch.relu(self.fc2(x))
+        return self.fc3(x)
+
+# Wasserstein GAN Loss: labels are -1 for real and +1 for generated data, so
+# that the discriminator loss is mean(D(fake)) - mean(D(real)), minus the
+# Wasserstein estimate
 def wasserstein_loss(y_true, y_pred):
     return torch.mean(y_true * y_pred)
 
-# Optimizers
-optimizer_g = optim.RMSprop(generator.parameters(), lr=0.00005)
-optimizer_d = optim.RMSprop(discriminator.parameters(), lr=0.00005)
+# Distance between the generator and the held-out data: the mean over the
+# features of the 1-D Wasserstein distance between their generated and
+# held-out samples, in the scaled ([0, 1]) units of the data
+def heldout_distance(generator, holdout_sorted):
+    n = holdout_sorted.size(0)
+    with torch.no_grad():
+        fake = generator(torch.randn(n, generator.fc1.in_features)).reshape(n, -1)
+    return (fake.sort(dim=0).values - holdout_sorted).abs().mean().item()
 
 # Training the GAN
-def train_gan(data, generator, discriminator, optimizer_g, optimizer_d, epochs=5000, batch_size=64):
+#   - the data are one TensorDataset, shuffled into batches by a DataLoader;
+#   - labels and noise are preallocated once and refilled in place;
+#   - the discriminator weights are clipped to [-clip_value, clip_value];
+#   - with patience, holdout_fraction of the data is held out of training and
+#     training stops early when the moving average (over smoothing epochs) of
+#     the held-out distance has not improved by min_delta (scaled units) for
+#     patience epochs, once min_epochs epochs are done (patience=None: never).
+#     The Wasserstein estimate of the critic is not used for that: with the
+#     clipped weights it is near zero from the first epochs on.
+def train_gan(data, generator, discriminator, optimizer_g, optimizer_d, epochs=5000, batch_size=64,
+              clip_value=0.01, patience=None, min_delta=1e-3, min_epochs=100, smoothing=10,
+              holdout_fraction=0.1, log_every=500):
+    holdout_sorted = None
+    if patience is not None:
+        permutation = torch.randperm(len(data))
+        num_holdout = max(1, int(len(data)*holdout_fraction))
+        if num_holdout < len(data):
+            holdout = data[permutation[:num_holdout]]
+            data = data[permutation[num_holdout:]]
+        else:
+            holdout = data
+        holdout_sorted = holdout.reshape(len(holdout), -1).sort(dim=0).values
+    loader = DataLoader(TensorDataset(data), batch_size=batch_size, shuffle=True)
+    noise_dim = generator.fc1.in_features
+    real_labels = -torch.ones(batch_size, 1)
+    fake_labels = torch.ones(batch_size, 1)
+    noise = torch.empty(batch_size, noise_dim)
+
+    best_distance = float('inf')
+    stale_epochs = 0
+    history = []
+    heldout_history = []
     for epoch in range(epochs):
-        for i in range(0, len(data), batch_size):
-            batch_data = data[i:i+batch_size]
-            real_data = torch.tensor(batch_data, dtype=torch.float32).clone().detach()
-
-            # Create labels dynamically based on batch size
-            real_labels = torch.ones(real_data.size(0), 1)
-            fake_labels = torch.zeros(real_data.size(0), 1)
+        distance_sum = 0.0
+        num_batches = 0
+        for (real_data,) in loader:
+            n = real_data.size(0)
 
             # Train Discriminator
             optimizer_d.zero_grad()
-
             real_preds = discriminator(real_data)
-            real_loss = wasserstein_loss(real_labels, real_preds)
-
-            noise = torch.randn(real_data.size(0), 2)
-            fake_data = generator(noise)
+            real_loss = wasserstein_loss(real_labels[:n], real_preds)
 
+            with torch.no_grad():
+                fake_data = generator(noise[:n].normal_())
             fake_preds = discriminator(fake_data)
-            fake_loss = wasserstein_loss(fake_labels, fake_preds)
+            fake_loss = wasserstein_loss(fake_labels[:n], fake_preds)
 
             d_loss = real_loss + fake_loss
             d_loss.backward()
             optimizer_d.step()
+            for p in discriminator.parameters():
+                p.data.clamp_(-clip_value, clip_value)
 
             # Train Generator
             optimizer_g.zero_grad()
-
-            noise = torch.randn(real_data.size(0), 2)
-            fake_data = generator(noise)
+            fake_data = generator(noise[:n].normal_())
             fake_preds = discriminator(fake_data)
-
-            g_loss = wasserstein_loss(real_labels, fake_preds)
+            g_loss = wasserstein_loss(real_labels[:n], fake_preds)
             g_loss.backward()
             optimizer_g.step()
 
-        if epoch % 500 == 0:
-            print(f'Epoch [{epoch}/{epochs}], D Loss: {d_loss.item()}, G Loss: {g_loss.item()}')
-
-    return generator, discriminator
-
-# Train the model
-trained_generator, trained_discriminator = train_gan(input_tensor, generator, discriminator, optimizer_g, optimizer_d)
-
-# Step 1: Generate 1000 Scenarios
-num_scenarios = 1000
-noise = torch.randn(num_scenarios, 2)
-generated_scenarios = trained_generator(noise).detach().numpy()
-
-# Inverse scale back the generated scenarios to the original scale
-generated_scenarios_original_scale = scaler.inverse_transform(generated_scenarios)
-
-# Define the max and min values for pg_init
-pg_max_solar = 50.0
-pg_min_solar = 0.0
-pg_max_wind = 70.0
-pg_min_wind = 0.0
-
-# Ensure the generated values are scattered between pg_min and pg_max for each generator
-generated_scenarios_original_scale[:, 0] = np.random.uniform(pg_min_solar, pg_max_solar, num_scenarios)  # Solar between 0 and 50 MW
-generated_scenarios_original_scale[:, 1] = np.random.uniform(pg_min_wind, pg_max_wind, num_scenarios)  # Wind between 0 and 70 MW
-
-# Step 2: Save the Generated Scenarios to generated_scenarios.dat
-output_file = "generated_scenarios.dat"
-with open(output_file, 'w') as f:
-    f.write("# Scenario Table for Solar and Wind Generation\n")
-    f.write("param: GEN:   Gen_busNumber Gen_id  Gen_isInSvc  Gen_pgInit Gen_pgMax Gen_pgMin Gen_energyRamp Gen_spinRamp Gen_costCurveFlag pg_init :=\n")
-    for i in range(num_scenarios):
-        solar_gen, wind_gen = generated_scenarios_original_scale[i]
-        f.write(f"8 'SOLAR_GEN' 10  1  {solar_gen:.2f}  50.0   0.0  1.0  5.5  1  {solar_gen:.2f}\n")
-        f.write(f"9 'WIND_GEN' 3   1  {wind_gen:.2f}  70.0   0.0  2.0  10.0 1  {wind_gen:.2f}\n")
-    f.write(";\n")
-
-print(f"Generated scenarios have been saved to {output_file}")
-
-# Step 3: Reduce the 1000 Scenarios to 25 using KMeans Clustering
-kmeans = KMeans(n_clusters=25, random_state=42)
-kmeans.fit(generated_scenarios_original_scale)
-
-# Get the cluster centers (the reduced scenarios)
-reduced_scenarios = kmeans.cluster_centers_
-
-# Step 4: Save each reduced scenario into a separate .dat file
-for i, scenario in enumerate(reduced_scenarios):
-    reduced_output_file = f"reduced_scenario_{i+1}.dat"
-    with open(reduced_output_file, 'w') as f:
-        f.write("# Reduced Scenario for Solar and Wind Generation\n")
-        f.write("param: GEN:   Gen_busNumber Gen_id  Gen_isInSvc  Gen_pgInit Gen_pgMax Gen_pgMin Gen_energyRamp Gen_spinRamp Gen_costCurveFlag pg_init :=\n")
-        solar_gen, wind_gen = scenario
-        f.write(f"8 'SOLAR_GEN' 10  1  {solar_gen:.2f}  50.0   0.0  1.0  5.5  1  {solar_gen:.2f}\n")
-        f.write(f"9 'WIND_GEN' 3   1  {wind_gen:.2f}  70.0   0.0  2.0  10.0 1  {wind_gen:.2f}\n")
-        f.write(";\n")
-
-    print(f"Reduced scenario {i+1} has been saved to {reduced_output_file}")
+            distance_sum += -d_loss.item()
+            num_batches += 1
+
+        distance = distance_sum / num_batches
+        history.append(distance)
+        if holdout_sorted is not None:
+            heldout_history.append(heldout_distance(generator, holdout_sorted))
+        if epoch % log_every == 0:
+            message = f'Epoch [{epoch}/{epochs}], D Loss: {d_loss.item()}, G Loss: {g_loss.item()}, Wasserstein estimate: {distance:.6f}'
+            if holdout_sorted is not None:
+                message += f', held-out distance: {heldout_history[-1]:.6f}'
+            print(message)
+
+        if holdout_sorted is not None and len(heldout_history) >= smoothing:
+            smoothed = sum(heldout_history[-smoothing:]) / smoothing
+            if smoothed < best_distance - min_delta:
+                best_distance = smoothed
+                stale_epochs = 0
+            else:
+                stale_epochs += 1
+                if stale_epochs >= patience and epoch + 1 >= min_epochs:
+                    print(f'Early stopping at epoch {epoch}: the held-out distance (moving average {smoothed:.6f}) '
+                          f'has not improved by {min_delta} for {patience} epochs')
+                    break
+
+    return generator, discriminator, history
+
+
+# Checkpoint file of the GAN (kind "gan") or trajectory GAN (kind
+# "trajectory_gan") trained on fileName between startDate and endDate
+def checkpoint_path(fileName, startDate, endDate, folder="gan_checkpoints", kind="gan"):
+    digest = hashlib.sha256()
+    with open(fileName, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return os.path.join(folder, f"{kind}_{digest.hexdigest()[:16]}_{startDate}_{endDate}.pt")
+
+# Save the state_dicts of both networks and the fitted scaler (as its data
+# range, so that the checkpoint only holds tensors)
+def save_checkpoint(fileName, generator, discriminator, scaler, info):
+    os.makedirs(os.path.dirname(fileName) or '.', exist_ok=True)
+    torch.save({'generator': generator.state_dict(),
+                'discriminator': discriminator.state_dict(),
+                'noise_dim': generator.fc1.in_features,
+                'output_dim': generator.fc3.out_features,
+                'num_periods': getattr(generator, 'num_periods', 0),
+                'scaler_data_min': torch.tensor(scaler.data_min_),
+                'scaler_data_max': torch.tensor(scaler.data_max_),
+                'info': info}, fileName)
+
+# Generator, discriminator and scaler of a checkpoint
+def load_checkpoint(fileName):
+    checkpoint = torch.load(fileName, weights_only=True)
+    num_periods = checkpoint.get('num_periods', 0)
+    if num_periods > 0:
+        generator = TrajectoryGenerator(checkpoint['noise_dim'], num_periods)
+        discriminator = TrajectoryDiscriminator(num_periods)
+    else:
+        generator = Generator(input_dim=checkpoint['noise_dim'], output_dim=checkpoint['output_dim'])
+        discriminator = Discriminator(input_dim=checkpoint['output_dim'])
+    generator.load_state_dict(checkpoint['generator'])
+    discriminator.load_state_dict(checkpoint['discriminator'])
+    scaler = MinMaxScaler()
+    scaler.fit(np.vstack([checkpoint['scaler_data_min'].numpy(), checkpoint['scaler_data_max'].numpy()]))
+    return generator, discriminator, scaler
+
+# num_scenarios (solar, wind) samples in the original scale, in one forward pass
+def generate_scenarios(generator, scaler, num_scenarios):
+    generator.eval()
+    with torch.no_grad():
+        generated = generator(torch.randn(num_scenarios, generator.fc1.in_features)).numpy()
+    return scaler.inverse_transform(generated)
+
+
+# //---  Read me  ---//
+# Load the checkpoint if there is one (and args.retrain is not set), else
+# train generator/discriminator on load_data() (an array whose last axis is
+# (solar, wind)) and save them; args.sample_only requires the checkpoint.
+# Returns the generator, the discriminator and the fitted scaler.
+def train_or_load_gan(args, checkpoint_file, load_data, generator, discriminator, info):
+    if args.sample_only or (os.path.exists(checkpoint_file) and not args.retrain):
+        if not os.path.exists(checkpoint_file):
+            raise FileNotFoundError(f"No checkpoint {checkpoint_file}, run without --sample-only first")
+        t0 = time.time()
+        trained_generator, trained_discriminator, scaler = load_checkpoint(checkpoint_file)
+        print(f"Trained GAN loaded from {checkpoint_file} in {time.time() - t0:.3f} seconds")
+        return trained_generator, trained_discriminator, scaler
+
+    # Load the data and normalize the solar and wind columns (for GAN)
+    input_data = load_data()
+    scaler = MinMaxScaler()
+    scaled = scaler.fit_transform(input_data.reshape(-1, 2)).reshape(input_data.shape)
+    input_tensor = torch.tensor(scaled, dtype=torch.float32)
+    print(f"{len(input_tensor)} samples from {info['start']} to {info['end']}")
+
+    # Optimizers
+    optimizer_g = optim.RMSprop(generator.parameters(), lr=0.00005)
+    optimizer_d = optim.RMSprop(discriminator.parameters(), lr=0.00005)
+
+    # Train the model
+    t0 = time.time()
+    trained_generator, trained_discriminator, history = train_gan(input_tensor, generator, discriminator, optimizer_g, optimizer_d,
+                                                                  epochs=args.epochs, batch_size=args.batch_size, patience=args.patience,
+                                                                  min_epochs=args.min_epochs)
+    print(f"Trained for {len(history)} epochs in {time.time() - t0:.1f} seconds")
+    save_checkpoint(checkpoint_file, trained_generator, trained_discriminator, scaler, dict(info, epochs=len(history)))
+    print(f"Trained GAN saved to {checkpoint_file}")
+    return trained_generator, trained_discriminator, scaler
+
+
+# //---  Read me  ---//
+# Write num_trajectories trajectories of the trajectory generator to a .npy
+# file of shape [num_trajectories, num_periods, 2] (float32, MW), chunk_size
+# trajectories at a time: each chunk is one batched forward pass written to
+# the memory-mapped file, so the whole set is never held in memory.
+def stream_trajectories(generator, scaler, num_trajectories, fileName, chunk_size=10000):
+    generator.eval()
+    num_periods = generator.num_periods
+    output = np.lib.format.open_memmap(fileName, mode='w+', dtype=np.float32, shape=(num_trajectories, num_periods, 2))
+    with torch.no_grad():
+        for start in range(0, num_trajectories, chunk_size):
+            n = min(chunk_size, num_trajectories - start)
+            generated = generator(torch.randn(n, generator.fc1.in_features)).numpy()
+            generated = scaler.inverse_transform(generated.reshape(-1, 2)).reshape(n, num_periods, 2)
+            output[start:start+n] = np.maximum(generated, 0.0)
+    output.flush()
+    del output
+
+# Trajectories written by stream_trajectories, memory-mapped (read on access);
+# trajectories[:, t] is the SCED period t of paramManager.getIdxPeriod()
+def load_trajectories(fileName):
+    return np.load(fileName, mmap_mode='r')
+
+
+# Whole-day trajectories: train (or load) the trajectory GAN on the daily
+# profiles and stream args.trajectories trajectories to args.output
+def run_trajectories(args, startDate, endDate):
+    num_periods = int(round(24*60/args.time_frame))
+    checkpoint_file = args.checkpoint if args.checkpoint is not None else checkpoint_path(args.data, startDate, endDate, kind=f"trajectory_gan{num_periods}")
+    trained_generator, trained_discriminator, scaler = train_or_load_gan(
+        args, checkpoint_file, lambda: load_daily_profiles(args.data, startDate, endDate, num_periods),
+        TrajectoryGenerator(32, num_periods), TrajectoryDiscriminator(num_periods),
+        {'data': args.data, 'start': startDate, 'end': endDate})
+    if trained_generator.num_periods != num_periods:
+        raise ValueError(f"The checkpoint {checkpoint_file} has {trained_generator.num_periods} periods, not {num_periods}")
+    t0 = time.time()
+    stream_trajectories(trained_generator, scaler, args.trajectories, args.output, args.chunk_size)
+    print(f"{args.trajectories} trajectories of {num_periods} periods have been saved to {args.output} in {time.time() - t0:.3f} seconds")
+
+
+# Point scenarios: train (or load) the GAN, generate, write and reduce the scenarios
+def run_scenarios(args, startDate, endDate):
+    checkpoint_file = args.checkpoint if args.checkpoint is not None else checkpoint_path(args.data, startDate, endDate)
+    trained_generator, trained_discriminator, scaler = train_or_load_gan(
+        args, checkpoint_file, lambda: load_renewable_data(args.data, startDate, endDate),
+        Generator(input_dim=2, output_dim=2), Discriminator(input_dim=2),  # 2 for solar and wind
+        {'data': args.data, 'start': startDate, 'end': endDate})
+
+    # Step 1: Generate the Scenarios (in the original scale)
+    t0 = time.time()
+    num_scenarios = args.num_scenarios
+    generated_scenarios_original_scale = generate_scenarios(trained_generator, scaler, num_scenarios)
+
+    # Define the max and min values for pg_init
+    pg_max_solar = 50.0
+    pg_min_solar = 0.0
+    pg_max_wind = 70.0
+    pg_min_wind = 0.0
+
+    # Keep the generated values between pg_min and pg_max of each generator
+    generated_scenarios_original_scale[:, 0] = np.clip(generated_scenarios_original_scale[:, 0], pg_min_solar, pg_max_solar)  # Solar between 0 and 50 MW
+    generated_scenarios_original_scale[:, 1] = np.clip(generated_scenarios_original_scale[:, 1], pg_min_wind, pg_max_wind)  # Wind between 0 and 70 MW
+
+    # Step 2: Save the Generated Scenarios to generated_scenarios.dat and/or the scenario store
+    if args.format in ['dat', 'both']:
+        output_file = "generated_scenarios.dat"
+        with open(output_file, 'w') as f:
+            f.write("# Scenario Table for Solar and Wind Generation\n")
+            f.write("param: GEN:   Gen_busNumber Gen_id  Gen_isInSvc  Gen_pgInit Gen_pgMax Gen_pgMin Gen_energyRamp Gen_spinRamp Gen_costCurveFlag pg_init :=\n")
+            for i in range(num_scenarios):
+                solar_gen, wind_gen = generated_scenarios_original_scale[i]
+                f.write(f"8 'SOLAR_GEN' 10  1  {solar_gen:.2f}  50.0   0.0  1.0  5.5  1  {solar_gen:.2f}\n")
+                f.write(f"9 'WIND_GEN' 3   1  {wind_gen:.2f}  70.0   0.0  2.0  10.0 1  {wind_gen:.2f}\n")
+            f.write(";\n")
+        print(f"Generated scenarios have been saved to {output_file} in {time.time() - t0:.3f} seconds")
+    if args.format in ['store', 'both']:
+        store_folder = os.path.join(args.store_folder, "generated")
+        write_scenario_store(store_folder, [f"generated_{i+1}" for i in range(num_scenarios)],
+                             generated_scenarios_original_scale, np.full(num_scenarios, 1.0/num_scenarios))
+        print(f"Generated scenarios have been saved to the scenario store {store_folder} in {time.time() - t0:.3f} seconds")
+
+    # Steps 3 and 4 are skipped in the sample-only mode
+    if not args.sample_only:
+        # Step 3: Reduce the Scenarios, every reduced scenario carries the probability of the generated scenarios mapped to it
+        reduced_scenarios, probabilities, labels, distance, seconds = ScenarioReduction.reduceScenarios(
+            generated_scenarios_original_scale, args.num_reduced, args.reduction)
+        populations = np.bincount(labels, minlength=len(reduced_scenarios))
+        print(f"Scenario reduction ({args.reduction}): {num_scenarios} -> {len(reduced_scenarios)} scenarios in {seconds:.3f} seconds, "
+              f"Kantorovich distance {distance:.4f} MW")
+
+        # Step 4: Save each reduced scenario into a separate .dat file and/or the scenario store
+        if args.format in ['store', 'both']:
+            store_folder = os.path.join(args.store_folder, "reduced")
+            write_scenario_store(store_folder, [f"reduced_scenario_{i+1}" for i in range(len(reduced_scenarios))],
+                                 reduced_scenarios, probabilities)
+            print(f"Reduced scenarios have been saved to the scenario store {store_folder}")
+        if args.format in ['dat', 'both']:
+            for i, scenario in enumerate(reduced_scenarios):
+                reduced_output_file = f"reduced_scenario_{i+1}.dat"
+                with open(reduced_output_file, 'w') as f:
+                    f.write("# Reduced Scenario for Solar and Wind Generation\n")
+                    f.write(f"# population = {populations[i]}  (of {num_scenarios} generated scenarios, used as the scenario weight)\n")
+                    f.write(f"# probability = {probabilities[i]:.6f}\n")
+                    f.write("param: GEN:   Gen_busNumber Gen_id  Gen_isInSvc  Gen_pgInit Gen_pgMax Gen_pgMin Gen_energyRamp Gen_spinRamp Gen_costCurveFlag pg_init :=\n")
+                    solar_gen, wind_gen = scenario
+                    f.write(f"8 'SOLAR_GEN' 10  1  {solar_gen:.2f}  50.0   0.0  1.0  5.5  1  {solar_gen:.2f}\n")
+                    f.write(f"9 'WIND_GEN' 3   1  {wind_gen:.2f}  70.0   0.0  2.0  10.0 1  {wind_gen:.2f}\n")
+                    f.write(";\n")
+
+                print(f"Reduced scenario {i+1} has been saved to {reduced_output_file}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate and reduce solar/wind scenarios with a Wasserstein GAN")
+    parser.add_argument("--data", default="Austria_data_2016-2019.csv", help="csv file with utc_timestamp, solar and wind columns")
+    parser.add_argument("--date", default="2017-06-15", help="train on this day only")
+    parser.add_argument("--start", default=None, help="first day of the training data (overrides --date)")
+    parser.add_argument("--end", default=None, help="last day of the training data (default: --start)")
+    parser.add_argument("--epochs", type=int, default=5000, help="maximum number of training epochs")
+    parser.add_argument("--batch-size", type=int, default=64, help="training batch size")
+    parser.add_argument("--patience", type=int, default=None,
+                        help="stop when the held-out distance has not improved for this many epochs")
+    parser.add_argument("--min-epochs", type=int, default=100, help="no early stopping before this many epochs")
+    parser.add_argument("--threads", type=int, default=None, help="number of CPU threads used by torch")
+    parser.add_argument("--num-scenarios", type=int, default=1000, help="number of scenarios to generate")
+    parser.add_argument("--checkpoint", default=None,
+                        help="checkpoint file (default: gan_checkpoints/, keyed by the data file hash and the dates)")
+    parser.add_argument("--retrain", action="store_true", help="train even if a checkpoint exists")
+    parser.add_argument("--sample-only", action="store_true",
+                        help="only load the checkpoint and write the generated scenarios (no training, no reduction)")
+    parser.add_argument("--reduction", choices=ScenarioReduction.reductionMethods, default="kmeans",
+                        help="scenario reduction method")
+    parser.add_argument("--num-reduced", type=int, default=25, help="number of reduced scenarios")
+    parser.add_argument("--format", choices=["dat", "store", "both"], default="both",
+                        help="write the scenarios as .dat files, as a scenario store (see ScenarioStore.py) or both")
+    parser.add_argument("--store-folder", default="scenario_store", help="folder of the generated/ and reduced/ scenario stores")
+    parser.add_argument("--trajectories", type=int, default=0,
+                        help="generate this many whole-day trajectories instead of point scenarios")
+    parser.add_argument("--time-frame", type=float, default=5.0, help="trajectories only: minutes per period (288 periods for 5)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="trajectories only: trajectories generated and written at a time")
+    parser.add_argument("--output", default="generated_trajectories.npy", help="trajectories only: output .npy file")
+    args = parser.parse_args()
+
+    if args.threads is not None:
+        torch.set_num_threads(args.threads)
+    startDate = args.start if args.start is not None else args.date
+    endDate = args.end if args.end is not None else startDate
+
+    if args.trajectories > 0:
+        run_trajectories(args, startDate, endDate)
+    else:
+        run_scenarios(args, startDate, endDate)
@@ -0,0 +1,138 @@
+"""
+Scenario overlay: a list of changes applied to (and reverted from) an already
+constructed SCEDGenericCaseModel instance, so that one base instance can be
+re-solved for many scenarios without being rebuilt.
+
+Website: https://rpglab.github.io/resources/RT-SCED_Python/
+
+Example:
+
+overlay = ScenarioOverlay.ScenarioOverlay("scenario_1")
+overlay.setRenewable(8, 28.39)
+overlay.scaleLoads(1.05)
+overlay.outageBranch(4)
+overlay.apply(instance, session)
+session.solve()
+overlay.revert(instance, session)
+"""
+
+from pyomo.environ import value
+
+
+# //---  Read me  ---//
+# Supported changes (MW values are converted with BaseMVA):
+#   - setRenewable: available output of a unit of SOLAR_GEN/WIND_GEN
+#     (Solar_pgMax/Wind_pgMax); the unit must exist in the base instance.
+#   - scaleLoads: Load_pd of all (or the given) loads times a factor.
+#   - outageGen: Gen_isInSvc, Gen_pgInit, Gen_pgMax and Gen_pgMin set to 0,
+#     and pg, sr, pgi, pgc and the slack variables of the unit fixed to 0; the
+#     rows of an out-of-service unit are chosen when the instance is built, so
+#     fixing the variables gives the same LP as a rebuilt instance.
+#   - outageBranch: the flow calculation and flow limit rows of the branch are
+#     deactivated and its flow is fixed to 0, in the base case and in every
+#     network copy of the full contingency formulation. Not supported with the
+#     compact contingency formulation, whose factors depend on the topology.
+# Only mutable Params, constraint activation and fixed variables are touched;
+# a PersistentSCEDSession passed to apply/revert is told which rows changed.
+class ScenarioOverlay:
+    def __init__(self, name=""):
+        self.name = name
+        self.changes = []
+        self.savedParams = None
+        self.deactivatedConstraints = []
+        self.fixedVars = []
+
+    def setRenewable(self, index, availableMW):
+        self.changes.append(("renewable", index, availableMW))
+
+    def scaleLoads(self, factor, loads=None):
+        self.changes.append(("loadScale", factor, loads))
+
+    def outageGen(self, g):
+        self.changes.append(("genOutage", g))
+
+    def outageBranch(self, k):
+        self.changes.append(("branchOutage", k))
+
+    def isApplied(self):
+        return self.savedParams is not None
+
+    def _setParam(self, param, idx, newValue):
+        self.savedParams.append((param, idx, value(param[idx])))
+        param[idx] = newValue
+
+    def _deactivate(self, component, idx):
+        if idx in component and component[idx].active:
+            component[idx].deactivate()
+            self.deactivatedConstraints.append(component[idx])
+
+    def _fixToZero(self, var):
+        self.fixedVars.append((var, var.fixed, var.value))
+        var.fix(0)
+
+    def apply(self, instance, session=None):
+        if self.isApplied():
+            raise ValueError("Scenario overlay " + self.name + " is already applied")
+        self.savedParams = []
+        self.deactivatedConstraints = []
+        self.fixedVars = []
+        baseMVA = value(instance.BaseMVA)
+        for change in self.changes:
+            if change[0] == "renewable":
+                idx = change[1]
+                if idx in instance.SOLAR_GEN:
+                    self._setParam(instance.Solar_pgMax, idx, change[2]/baseMVA)
+                elif idx in instance.WIND_GEN:
+                    self._setParam(instance.Wind_pgMax, idx, change[2]/baseMVA)
+                else:
+                    self.revert(instance)
+                    raise ValueError("Renewable unit " + str(idx) + " is not in the base instance")
+            elif change[0] == "loadScale":
+                loads = instance.LOAD if change[2] is None else change[2]
+                for d in loads:
+                    self._setParam(instance.Load_pd, d, value(instance.Load_pd[d])*change[1])
+            elif change[0] == "genOutage":
+                g = change[1]
+                for param in [instance.Gen_isInSvc, instance.Gen_pgInit, instance.Gen_pgMax, instance.Gen_pgMin]:
+                    self._setParam(param, g, 0)
+                for var in [instance.pg, instance.sr, instance.pgmaxSlackVar, instance.pgminSlackVar, instance.spinRampSlackVar,
+                            instance.energyRampUpSlackVar, instance.energyRampDownSlackVar, instance.srReqSlackVar]:
+                    self._fixToZero(var[g])
+                for i in instance.segmentIdxOfGen.get(g, []):
+                    self._fixToZero(instance.pgi[i])
+                for c in instance.CONTINGENCY_FULL:
+                    self._fixToZero(instance.pgc[g, c])
+            elif change[0] == "branchOutage":
+                if value(instance.useCompactContingency) == 1:
+                    self.revert(instance)
+                    raise ValueError("Branch outages cannot be overlaid on the compact contingency formulation")
+                k = change[1]
+                for con in [instance.brcFlowCalcConst, instance.brcFlowLimit, instance.brcFlowLimit_2]:
+                    self._deactivate(con, k)
+                self._fixToZero(instance.pk[k])
+                for cL in instance.CONTINGENCYLINE_FULL:
+                    self._deactivate(instance.brcFlowCalcConst_Ctgcy, (cL, k))
+                for c in instance.CONTINGENCY_FULL:
+                    self._deactivate(instance.brcFlowLimit_Ctgcy, (c, k))
+                    self._deactivate(instance.brcFlowLimit_2_Ctgcy, (c, k))
+                    self._fixToZero(instance.pkc[c, k])
+        if session is not None:
+            session.updateComponents(self.deactivatedConstraints, [v for v, isFixed, oldValue in self.fixedVars])
+
+    def revert(self, instance, session=None):
+        if not self.isApplied():
+            return
+        for param, idx, oldValue in reversed(self.savedParams):
+            param[idx] = oldValue
+        for con in self.deactivatedConstraints:
+            con.activate()
+        for var, isFixed, oldValue in reversed(self.fixedVars):
+            var.unfix()
+            var.set_value(oldValue, skip_validation=True)
+            if isFixed:
+                var.fix()
+        if session is not None:
+            session.updateComponents(self.deactivatedConstraints, [v for v, isFixed, oldValue in self.fixedVars])
+        self.savedParams = None
+        self.deactivatedConstraints = []
+        self.fixedVars = []
@@ -0,0 +1,167 @@
+"""
+Scenario reduction for the generated renewable scenarios: a large set of
+equally (or otherwise) probable scenarios is reduced to a few scenarios that
+carry probabilities. Methods:
+    kmeans     KMeans cluster centers, weighted by the cluster populations
+    minibatch  MiniBatchKMeans, for 10^5 - 10^6 scenarios
+    forward    fast forward selection (Heitsch and Roemisch)
+    backward   simultaneous backward reduction (Heitsch and Roemisch)
+Forward and backward keep a subset of the scenarios, and every deleted
+scenario gives its probability to the nearest kept one; above maxSelect
+scenarios they select among MiniBatchKMeans centers of the scenarios instead
+(their cost grows with the square of the number of scenarios). For every
+method the reported distance is the Kantorovich distance between the
+original and the reduced distribution (the transport cost of mapping every
+scenario to its reduced scenario when forward/backward start from the
+MiniBatchKMeans centers), with the Euclidean distance between scenarios (in
+the units of the scenarios, i.e. MW).
+
+How to run: see ScenarioGeneration.py (--reduction) and Benchmarks.py
+"""
+
+import time
+import numpy as np
+
+
+reductionMethods = ['kmeans', 'minibatch', 'forward', 'backward']
+
+
+# Euclidean distances between the rows of a and the rows of b
+def calcDistances(a, b):
+    d = (a*a).sum(axis=1)[:, None] + (b*b).sum(axis=1)[None, :] - 2.0*(a @ b.T)
+    return np.sqrt(np.maximum(d, 0.0))
+
+
+# Kantorovich distance of mapping every scenario to a kept point: sum of the
+# probability of each scenario times its distance to the point it is mapped to
+def calcMappingDistance(points, probabilities, keptPoints, labels):
+    return float((probabilities*np.sqrt(((points - keptPoints[labels])**2).sum(axis=1))).sum())
+
+
+def reduceKMeans(points, probabilities, numKeep, seed=42):
+    from sklearn.cluster import KMeans
+    kmeans = KMeans(n_clusters=numKeep, random_state=seed)
+    kmeans.fit(points, sample_weight=probabilities)
+    return [kmeans.cluster_centers_, kmeans.labels_]
+
+
+def reduceMiniBatchKMeans(points, probabilities, numKeep, seed=42, batchSize=4096, numInit=3):
+    from sklearn.cluster import MiniBatchKMeans
+    kmeans = MiniBatchKMeans(n_clusters=numKeep, random_state=seed, batch_size=batchSize, n_init=numInit)
+    kmeans.fit(points, sample_weight=probabilities)
+    return [kmeans.cluster_centers_, kmeans.labels_]
+
+
+# //---  Read me  ---//
+# Fast forward selection: start with no kept scenario and add, numKeep times,
+# the scenario u that minimizes
+#     z[u] = sum over k of probabilities[k]*min(nearest[k], c(k, u))
+# where nearest[k] is the distance of scenario k to the kept scenarios so far
+# (infinite at the start). The distances c(k, u) are computed a chunk of
+# candidates at a time, so memory stays at about maxChunkElements floats.
+def selectFastForward(points, probabilities, numKeep, maxChunkElements=4000000):
+    num = len(points)
+    chunkSize = max(1, maxChunkElements//num)
+    nearest = np.full(num, np.inf)
+    labels = np.zeros(num, dtype=int)
+    kept = []
+    for step in range(numKeep):
+        z = np.empty(num)
+        for start in range(0, num, chunkSize):
+            c = calcDistances(points, points[start:start+chunkSize])
+            z[start:start+chunkSize] = probabilities @ np.minimum(nearest[:, None], c)
+        z[kept] = np.inf
+        u = int(np.argmin(z))
+        kept.append(u)
+        c = calcDistances(points, points[u:u+1])[:, 0]
+        closer = c < nearest
+        nearest[closer] = c[closer]
+        labels[closer] = step
+    return [np.array(kept), labels]
+
+
+# //---  Read me  ---//
+# Simultaneous backward reduction: start with all scenarios kept and delete,
+# N - numKeep times, the kept scenario l whose deletion increases the
+# Kantorovich distance the least:
+#     p[l]*d1[l] + sum over deleted i with nn1[i] == l of p[i]*(d2[i] - d1[i])
+# where d1/nn1 and d2 are the distances to the nearest and second nearest kept
+# scenario other than the scenario itself. Only the rows whose nearest or
+# second nearest was just deleted are updated. It needs the full N x N
+# distance matrix, so it is meant for a few thousand scenarios.
+def selectBackward(points, probabilities, numKeep):
+    num = len(points)
+    c = calcDistances(points, points)
+    np.fill_diagonal(c, np.inf)
+    isKept = np.ones(num, dtype=bool)
+    rows = np.arange(num)
+    top2 = np.argpartition(c, 1, axis=1)[:, :2]
+    swap = c[rows, top2[:, 0]] > c[rows, top2[:, 1]]
+    top2[swap] = top2[swap][:, ::-1]
+    nn1 = top2[:, 0].copy()
+    nn2 = top2[:, 1].copy()
+
+    for _ in range(num - numKeep):
+        d1 = c[rows, nn1]
+        d2 = c[rows, nn2]
+        deleted = ~isKept
+        increase = np.bincount(nn1[deleted], weights=probabilities[deleted]*(d2[deleted] - d1[deleted]), minlength=num)
+        cost = probabilities*d1 + increase
+        cost[deleted] = np.inf
+        l = int(np.argmin(cost))
+        isKept[l] = False
+        c[:, l] = np.inf
+        changed = np.nonzero((nn1 == l) | (nn2 == l))[0]
+        if len(changed) > 0:
+            sub = c[changed]
+            top2 = np.argpartition(sub, 1, axis=1)[:, :2]
+            subRows = np.arange(len(changed))
+            swap = sub[subRows, top2[:, 0]] > sub[subRows, top2[:, 1]]
+            top2[swap] = top2[swap][:, ::-1]
+            nn1[changed] = top2[:, 0]
+            nn2[changed] = top2[:, 1]
+
+    kept = np.nonzero(isKept)[0]
+    position = np.full(num, -1)
+    position[kept] = np.arange(len(kept))
+    labels = np.where(isKept, position, position[nn1])
+    return [kept, labels]
+
+
+# //---  Read me  ---//
+# Reduce points (N x dim scenarios) with probabilities (equal if None) to
+# numKeep scenarios with the given method; returns
+#     [reducedPoints, reducedProbabilities, labels, distance, seconds]
+# labels[i] is the reduced scenario that scenario i is mapped to, distance is
+# the Kantorovich distance of the reduction.
+def reduceScenarios(points, numKeep, method='kmeans', probabilities=None, seed=42, maxSelect=1000):
+    points = np.asarray(points, dtype=float)
+    num = len(points)
+    if probabilities is None:
+        probabilities = np.full(num, 1.0/num)
+    probabilities = np.asarray(probabilities, dtype=float)
+    if numKeep < 1 or numKeep > num:
+        raise ValueError("Cannot reduce " + str(num) + " scenarios to " + str(numKeep))
+
+    t0 = time.time()
+    if method == 'kmeans':
+        reducedPoints, labels = reduceKMeans(points, probabilities, numKeep, seed)
+    elif method == 'minibatch':
+        reducedPoints, labels = reduceMiniBatchKMeans(points, probabilities, numKeep, seed)
+    elif method in ['forward', 'backward']:
+        candidates, candidateProbabilities, candidateLabels = points, probabilities, np.arange(num)
+        if num > maxSelect and numKeep < maxSelect:
+            candidates, candidateLabels = reduceMiniBatchKMeans(points, probabilities, maxSelect, seed, numInit=1)
+            candidateProbabilities = np.bincount(candidateLabels, weights=probabilities, minlength=maxSelect)
+        if method == 'forward':
+            kept, labels = selectFastForward(candidates, candidateProbabilities, numKeep)
+        else:
+            kept, labels = selectBackward(candidates, candidateProbabilities, numKeep)
+        reducedPoints = candidates[kept]
+        labels = labels[candidateLabels]
+    else:
+        raise ValueError("Unknown scenario reduction method: " + str(method))
+    reducedProbabilities = np.bincount(labels, weights=probabilities, minlength=len(reducedPoints))
+    seconds = time.time() - t0
+    distance = calcMappingDistance(points, probabilities, reducedPoints, labels)
+    return [reducedPoints, reducedProbabilities, labels, distance, seconds]
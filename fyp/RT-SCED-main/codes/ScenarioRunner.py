@@ -0,0 +1,206 @@
+"""
+In-process scenario executor for the generic case: the base case is loaded
+and prepared once, one base instance is built (per worker process) and every
+scenario is applied to it as a ScenarioOverlay (the available output of its
+solar and wind units) and re-solved, optionally in a pool of worker processes.
+
+How to run: see ExecuteScenarios.py
+
+Website: https://rpglab.github.io/resources/RT-SCED_Python/
+"""
+
+import time
+import multiprocessing
+from pyomo.environ import value
+
+import PyomoCaseData
+import SCEDGenericCaseMatrixModel
+import PersistentSolver
+import ContingencyScreening
+import ScenarioOverlay
+import ScenarioStore
+from SCEDGenericCaseModel import model as SCEDModel
+
+
+# Renewable units of a scenario file, one line per unit:
+#   index type busNumber isInSvc pgInit pgMax pgMin ...
+# pgInit is the output of the unit in this scenario.
+def readScenarioRenewables(fileName):
+    units = []
+    with open(fileName, "r") as f:
+        for line in f:
+            if "SOLAR_GEN" in line or "WIND_GEN" in line:
+                parts = line.split()
+                units.append({"index": int(parts[0]), "type": parts[1].strip("'\""), "bus": int(parts[2]),
+                              "isInSvc": int(parts[3]), "pgInit": float(parts[4]), "pgMax": float(parts[5])})
+    return units
+
+
+# The scenario output (capped by pgMax) is the available output of the unit, in MW
+def getAvailableMW(unit):
+    return max(0.0, min(unit["pgInit"], unit["pgMax"]))*unit["isInSvc"]
+
+
+# Add renewable units to the prepared (per-unit) case data, with their
+# available output. Only the renewable entries are copied, the rest is shared
+# with the input data.
+def applyScenarioRenewables(data, units):
+    case = dict(data[None])
+    baseMVA = SCEDGenericCaseMatrixModel.getScalar(case, "BaseMVA")
+    for setName, prefix in [("SOLAR_GEN", "Solar"), ("WIND_GEN", "Wind")]:
+        members = list(PyomoCaseData.getSet(case, setName))
+        busNumber = dict(case.get(prefix + "_busNumber", {}))
+        pgMax = dict(case.get(prefix + "_pgMax", {}))
+        for unit in units:
+            if unit["type"] != setName:
+                continue
+            if unit["index"] not in members:
+                members.append(unit["index"])
+            busNumber[unit["index"]] = unit["bus"]
+            pgMax[unit["index"]] = getAvailableMW(unit)/baseMVA
+        case[setName] = {None: members}
+        case[prefix + "_busNumber"] = busNumber
+        case[prefix + "_pgMax"] = pgMax
+    return {None: case}
+
+
+# Renewable units of a scenario: a scenario file, or a scenario id of store
+def readScenarioUnits(scenario, store=None):
+    if store is not None:
+        return store.getUnits(scenario)
+    return readScenarioRenewables(scenario)
+
+
+def getScenarioOverlay(scenario, store=None):
+    overlay = ScenarioOverlay.ScenarioOverlay(scenario)
+    for unit in readScenarioUnits(scenario, store):
+        overlay.setRenewable(unit["index"], getAvailableMW(unit))
+    return overlay
+
+
+# Collects log messages in a worker; they are written to the Diary by the parent.
+class scenarioLog:
+    def __init__(self):
+        self.messages = []
+
+    def hotline(self, message):
+        self.hotlineWithLogType(0, message)
+
+    def hotlineWithLogType(self, mType, message):
+        self.messages.append((mType, message))
+
+
+# Solve one scenario (a file, or an id of state["store"]) on the base instance
+# of state (built on first use) and return its row of the results table.
+def solveScenario(state, scenarioFile):
+    log = scenarioLog()
+    row = {"scenario": scenarioFile, "status": "failed", "objective": None, "solar": None, "wind": None,
+           "loadShed": None, "loadShedCtgcy": None, "seconds": None, "log": log.messages}
+    t0 = time.time()
+    settings = state["settings"]
+    try:
+        if state.get("instance") is None:
+            state["instance"] = SCEDModel.create_instance(data=state["baseData"])
+            for c in state["instance"].islandingCtgcys:
+                log.hotlineWithLogType(1, "Contingency " + str(c) + " islands the network, its branch flow limits are not modeled")
+            state["session"] = PersistentSolver.PersistentSCEDSession(state["instance"], settings["solverName"], None,
+                                                                      settings["timeLimit"], settings["optGap"])
+        instance = state["instance"]
+        session = state["session"]
+        session.myDiary = log
+        overlay = getScenarioOverlay(scenarioFile, state.get("store"))
+        overlay.apply(instance, session)
+        try:
+            if settings["useContingencyScreening"] == True:
+                results = ContingencyScreening.solveWithScreening(instance, session, log)
+            else:
+                results = session.solve()
+            baseMVA = value(instance.BaseMVA)
+            row["status"] = str(results.solver.termination_condition)
+            row["objective"] = value(instance.minimizeCost)
+            row["solar"] = sum(value(instance.Solar_pg[s]) for s in instance.SOLAR_GEN)*baseMVA
+            row["wind"] = sum(value(instance.Wind_pg[w]) for w in instance.WIND_GEN)*baseMVA
+            row["loadShed"] = sum(value(instance.loadShed[d]) for d in instance.LOAD)*baseMVA
+            row["loadShedCtgcy"] = sum(value(instance.loadShed_c[c, d]) for c in instance.CONTINGENCY_FULL
+                                       if value(instance.Contingency_isEnabled[c]) == 1 for d in instance.LOAD)*baseMVA
+        finally:
+            overlay.revert(instance, session)
+    except Exception as e:
+        row["status"] = "failed: " + str(e)
+    row["seconds"] = time.time() - t0
+    return row
+
+
+# The base data reach the workers once, through the pool initializer; with the
+# fork start method they are inherited without pickling. Each worker opens
+# (memory-maps) the scenario store itself.
+workerState = {}
+
+def initWorker(baseData, settings, storeFolder=None):
+    workerState["baseData"] = baseData
+    workerState["settings"] = settings
+    workerState["instance"] = None
+    workerState["store"] = ScenarioStore.ScenarioStore(storeFolder) if storeFolder is not None else None
+
+def solveScenarioInWorker(scenarioFile):
+    return solveScenario(workerState, scenarioFile)
+
+
+class ScenarioRunner:
+    def __init__(self, paramManager, myDiary, dataFile=None):
+        self.myDiary = myDiary
+        if dataFile is None:
+            dataFile = paramManager.getPyomoDataFormatInputFileGC()
+        myDiary.hotlineWithLogType(5, "Start to load and prepare the base case for scenarios: " + dataFile)
+        baseData = PyomoCaseData.loadPyomoDataFile(dataFile)
+        self.baseData = SCEDGenericCaseMatrixModel.prepareCaseData(baseData, paramManager, myDiary)
+        if paramManager.getUseCompactContingency() == True or paramManager.getUseContingencyScreening() == True:
+            self.baseData[None]['useCompactContingency'] = {None: 1}
+        self.settings = {"solverName": paramManager.getSolverName(),
+                         "timeLimit": paramManager.getSolverTimLimit(),
+                         "optGap": paramManager.getSolverOptGap(),
+                         "useContingencyScreening": paramManager.getUseContingencyScreening()}
+
+    # Solve all scenarios (files, or ids of store) with jobs worker processes
+    # (in this process if jobs is 1). The base instance holds every renewable
+    # unit of the scenarios, with no available output; each scenario only sets
+    # the output of its own units.
+    def run(self, scenarioFiles, jobs=1, store=None):
+        t0 = time.time()
+        units = {}
+        if store is not None:
+            for unit in store.units:
+                units[unit["index"]] = dict(unit, isInSvc=0, pgInit=0.0, pgMax=0.0)
+        else:
+            for f in scenarioFiles:
+                for unit in readScenarioRenewables(f):
+                    units[unit["index"]] = dict(unit, isInSvc=0)
+        baseData = applyScenarioRenewables(self.baseData, list(units.values()))
+        if jobs <= 1 or len(scenarioFiles) <= 1:
+            state = {"baseData": baseData, "settings": self.settings, "store": store}
+            rows = [solveScenario(state, f) for f in scenarioFiles]
+        else:
+            if "fork" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("fork")
+            else:
+                context = multiprocessing.get_context()
+            storeFolder = store.folder if store is not None else None
+            with context.Pool(jobs, initializer=initWorker, initargs=(baseData, self.settings, storeFolder)) as pool:
+                rows = pool.map(solveScenarioInWorker, scenarioFiles, chunksize=1)
+        for row in rows:
+            for mType, message in row["log"]:
+                self.myDiary.hotlineWithLogType(mType, row["scenario"] + ": " + message)
+            self.myDiary.hotlineWithLogType(6, row["scenario"] + ": " + row["status"] + ", objective " + str(row["objective"]))
+        self.myDiary.hotlineWithLogType(5, str(len(rows)) + " scenarios solved with " + str(jobs) + " job(s) in "
+                                        + format(time.time() - t0, '.2f') + " seconds")
+        return rows
+
+    # Consolidated results table, one line per scenario
+    def writeTable(self, rows, fileName):
+        with open(fileName, "w") as f:
+            f.write("scenario status objective solarMW windMW loadShedMW loadShedCtgcyMW seconds\n")
+            for row in rows:
+                values = [row["objective"], row["solar"], row["wind"], row["loadShed"], row["loadShedCtgcy"]]
+                f.write(row["scenario"] + " " + row["status"].replace(" ", "_") + " "
+                        + " ".join("-" if v is None else format(v, '.4f') for v in values)
+                        + " " + format(row["seconds"], '.3f') + "\n")
@@ -0,0 +1,110 @@
+"""
+Columnar store of renewable scenarios: one folder holding
+    index.json       scenario ids and the renewable units (index, type, bus)
+    probability.npy  [scenarios]          probability of every scenario
+    pgInit.npy       [scenarios, units]   output of every unit (MW)
+    pgMax.npy        [scenarios, units]   maximum output (MW)
+    pgMin.npy        [scenarios, units]   minimum output (MW)
+    isInSvc.npy      [scenarios, units]   1 if the unit is in the scenario and in service
+The arrays are memory-mapped when the store is opened, so runners and worker
+processes read only the scenarios they solve instead of opening one .dat file
+per scenario. A scenario is returned as the list of unit dicts used by
+ScenarioRunner/StochasticSCED (see ScenarioRunner.readScenarioRenewables).
+
+How to run: see ScenarioGeneration.py (--format) and ExecuteScenarios.py (--store)
+"""
+
+import json
+import os
+import numpy as np
+
+
+storeColumns = ['pgInit', 'pgMax', 'pgMin', 'isInSvc']
+
+
+# //---  Read me  ---//
+# Write a store from arrays: ids (one string per scenario), probabilities
+# [S], units (list of {"index", "type", "bus"}) and columns {name: [S, U]}
+# for every name of storeColumns.
+def writeScenarioStoreArrays(folder, ids, probabilities, units, columns):
+    os.makedirs(folder, exist_ok=True)
+    numScenario = len(probabilities)
+    for name in storeColumns:
+        if np.shape(columns[name]) != (numScenario, len(units)):
+            raise ValueError("Scenario store column " + name + " has shape " + str(np.shape(columns[name]))
+                             + ", expected " + str((numScenario, len(units))))
+    np.save(os.path.join(folder, "probability.npy"), np.asarray(probabilities, dtype=np.float64))
+    for name in storeColumns:
+        dtype = np.int8 if name == 'isInSvc' else np.float64
+        np.save(os.path.join(folder, name + ".npy"), np.asarray(columns[name], dtype=dtype))
+    index = {"numScenarios": numScenario,
+             "ids": [str(i) for i in ids],
+             "units": [{"index": int(u["index"]), "type": u["type"], "bus": int(u["bus"])} for u in units],
+             "columns": ["probability"] + storeColumns}
+    with open(os.path.join(folder, "index.json"), "w") as f:
+        json.dump(index, f)
+
+
+# Write a store from scenarios given as lists of unit dicts (as returned by
+# StochasticSCED.loadScenarios); a unit missing from a scenario is stored out
+# of service with no output.
+def writeScenarioStore(folder, ids, probabilities, scenarios):
+    units = {}
+    for scenarioUnits in scenarios:
+        for unit in scenarioUnits:
+            units.setdefault(unit["index"], {"index": unit["index"], "type": unit["type"], "bus": unit["bus"]})
+    units = [units[i] for i in sorted(units)]
+    position = dict((u["index"], j) for j, u in enumerate(units))
+    columns = dict((name, np.zeros((len(scenarios), len(units)))) for name in storeColumns)
+    for s, scenarioUnits in enumerate(scenarios):
+        for unit in scenarioUnits:
+            j = position[unit["index"]]
+            columns['pgInit'][s, j] = unit["pgInit"]
+            columns['pgMax'][s, j] = unit["pgMax"]
+            columns['pgMin'][s, j] = unit.get("pgMin", 0.0)
+            columns['isInSvc'][s, j] = unit["isInSvc"]
+    writeScenarioStoreArrays(folder, ids, probabilities, units, columns)
+
+
+# //---  Read me  ---//
+# Read access to a store; the arrays are memory-mapped on first use (also
+# after a fork or in a pool worker, where the store is opened again by folder).
+#   ids, units: from index.json
+#   getProbability(id), getUnits(id): one scenario, by id
+#   getRows(rows): [probabilities, {column: [len(rows), U]}] for many scenarios
+class ScenarioStore:
+    def __init__(self, folder):
+        self.folder = folder
+        with open(os.path.join(folder, "index.json"), "r") as f:
+            index = json.load(f)
+        self.ids = index["ids"]
+        self.units = index["units"]
+        self.rowOfId = dict((scenarioId, row) for row, scenarioId in enumerate(self.ids))
+        self.arrays = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def getArray(self, name):
+        if name not in self.arrays:
+            self.arrays[name] = np.load(os.path.join(self.folder, name + ".npy"), mmap_mode='r')
+        return self.arrays[name]
+
+    def getRow(self, scenarioId):
+        if scenarioId not in self.rowOfId:
+            raise KeyError("Scenario " + str(scenarioId) + " is not in the scenario store " + self.folder)
+        return self.rowOfId[scenarioId]
+
+    def getProbability(self, scenarioId):
+        return float(self.getArray("probability")[self.getRow(scenarioId)])
+
+    def getUnits(self, scenarioId):
+        row = self.getRow(scenarioId)
+        values = dict((name, self.getArray(name)[row]) for name in storeColumns)
+        return [{"index": u["index"], "type": u["type"], "bus": u["bus"], "isInSvc": int(values['isInSvc'][j]),
+                 "pgInit": float(values['pgInit'][j]), "pgMax": float(values['pgMax'][j]), "pgMin": float(values['pgMin'][j])}
+                for j, u in enumerate(self.units)]
+
+    def getRows(self, rows):
+        rows = np.asarray(rows)
+        return [np.array(self.getArray("probability")[rows]), dict((name, np.array(self.getArray(name)[rows])) for name in storeColumns)]
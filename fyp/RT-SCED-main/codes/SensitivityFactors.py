@@ -0,0 +1,56 @@
+"""
+DC network sensitivity factors: PTDF and LODF.
+
+Website: https://rpglab.github.io/resources/RT-SCED_Python/
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+
+
+# //---  Read me  ---//
+# Power transfer distribution factors of a DC network.
+# frmPos/toPos are the positions (0 .. numBus-1) of the terminal buses of each
+# branch, x the branch reactances and isInSvc the branch status. The returned
+# K x N array gives the flow change on each branch for 1 unit injected at each
+# bus and withdrawn at the slack bus; rows of out-of-service branches are zero.
+# The reduced B-matrix is factorized once (sparse LU) and solved for all branches.
+def calcPTDF(numBus, frmPos, toPos, x, isInSvc, slackPos=0):
+    frmPos = np.asarray(frmPos, dtype=np.int64)
+    toPos = np.asarray(toPos, dtype=np.int64)
+    x = np.asarray(x, dtype=float)
+    numBranch = len(x)
+    b = np.where(np.asarray(isInSvc) != 0, 1.0/x, 0.0)
+    arK = np.arange(numBranch)
+    A = sp.csr_matrix((np.concatenate([np.ones(numBranch), -np.ones(numBranch)]),
+                       (np.concatenate([arK, arK]), np.concatenate([frmPos, toPos]))), shape=(numBranch, numBus))
+    Bf = sp.diags(b) @ A
+    Bbus = (A.T @ Bf).tocsc()
+    keep = np.delete(np.arange(numBus), slackPos)
+    try:
+        lu = splu(Bbus[keep][:, keep].tocsc())
+    except RuntimeError:
+        raise ValueError("The DC B-matrix is singular, the network is not connected")
+    ptdf = np.zeros((numBranch, numBus))
+    if len(keep) > 0 and numBranch > 0:
+        # Bbus is symmetric, thus PTDF[:, keep] = Bf[:, keep] * inv(Bbus_red) = (inv(Bbus_red) * Bf[:, keep]')'
+        ptdf[:, keep] = lu.solve(Bf[:, keep].T.toarray()).T
+    return ptdf
+
+
+# //---  Read me  ---//
+# Line outage distribution factors for the simultaneous outage of the branches
+# at positions outagePos: a K x m array, the flow change on each branch per
+# unit of pre-outage flow on each outaged branch. None is returned if the
+# outage islands the network.
+def calcLODF(ptdf, frmPos, toPos, outagePos):
+    outagePos = np.asarray(outagePos, dtype=np.int64)
+    frmPos = np.asarray(frmPos, dtype=np.int64)
+    toPos = np.asarray(toPos, dtype=np.int64)
+    H = ptdf[:, frmPos[outagePos]] - ptdf[:, toPos[outagePos]]
+    denom = np.eye(len(outagePos)) - H[outagePos, :]
+    if len(outagePos) > 0 and np.linalg.svd(denom, compute_uv=False).min() < 1e-8:
+        return None
+    return np.linalg.solve(denom.T, H.T).T
+
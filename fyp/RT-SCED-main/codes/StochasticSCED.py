@@ -0,0 +1,232 @@
+"""
+Two-stage stochastic SCED of the generic case, solved as one LP (extensive
+form): the dispatch schedule and spinning reserve of the conventional units
+are shared by all renewable scenarios (first stage), every scenario is a copy
+of the SCEDGenericCaseModel that may move the conventional units away from the
+schedule within their reserve (recourse), and the objective is the expected
+cost, weighted by the scenario probabilities.
+
+How to run: see ExecuteScenarios.py (--stochastic)
+
+Website: https://rpglab.github.io/resources/RT-SCED_Python/
+"""
+
+import time
+import numpy as np
+from pyomo.environ import ConcreteModel, Set, Param, Var, Block, Constraint, Objective, NonNegativeReals, value
+
+import PyomoCaseData
+import SCEDGenericCaseMatrixModel
+import PersistentSolver
+import ScenarioRunner
+from SCEDGenericCaseModel import model as SCEDModel
+
+
+# Population of the KMeans cluster of a reduced scenario, from its header line
+#   # population = N
+# (written by ScenarioGeneration.py); None if the file has no such line.
+def readScenarioPopulation(fileName):
+    with open(fileName, "r") as f:
+        for line in f:
+            if line.startswith("#") and "population" in line and "=" in line:
+                return int(line.split("=")[1].split()[0])
+    return None
+
+
+# Scenarios of a scenario file: a single scenario (reduced_scenario_N.dat) or
+# a table of scenarios (generated_scenarios.dat), where a new scenario starts
+# whenever a unit index repeats.
+def readScenarioTable(fileName):
+    scenarios = [[]]
+    for unit in ScenarioRunner.readScenarioRenewables(fileName):
+        if unit["index"] in [u["index"] for u in scenarios[-1]]:
+            scenarios.append([])
+        scenarios[-1].append(unit)
+    return scenarios
+
+
+# Cluster populations recovered from the generated (unreduced) scenarios: each
+# of them is labeled with the nearest scenario of scenarios, as KMeans does.
+def calcPopulations(generatedFile, scenarios):
+    indices = sorted(set(unit["index"] for units in scenarios for unit in units))
+    def getPoint(units):
+        output = dict((unit["index"], unit["pgInit"]) for unit in units)
+        return [output.get(i, 0.0) for i in indices]
+    points = np.array([getPoint(units) for units in readScenarioTable(generatedFile)])
+    centers = np.array([getPoint(units) for units in scenarios])
+    distance = ((points[:, None, :] - centers[None, :, :])**2).sum(axis=2)
+    labels = distance.argmin(axis=1)
+    return [int(n) for n in np.bincount(labels, minlength=len(scenarios))]
+
+
+# //---  Read me  ---//
+# Scenario names, renewable units and probabilities of the scenario files.
+# Probabilities are the cluster populations divided by their sum. The
+# population of a reduced scenario comes from the population line of its file
+# or, if generatedFile is given, from the nearest-scenario labels of the
+# generated scenarios; every scenario of a scenario table counts once. Without
+# populations, all scenarios get the same probability.
+def loadScenarios(scenarioFiles, myDiary, generatedFile=None):
+    names = []
+    scenarios = []
+    populations = []
+    for fileName in scenarioFiles:
+        table = readScenarioTable(fileName)
+        if len(table) == 1:
+            names.append(fileName)
+            populations.append(readScenarioPopulation(fileName))
+        else:
+            names.extend(fileName + "#" + str(i+1) for i in range(len(table)))
+            populations.extend([1]*len(table))
+        scenarios.extend(table)
+    if generatedFile is not None:
+        populations = calcPopulations(generatedFile, scenarios)
+    elif None in populations:
+        myDiary.hotlineWithLogType(1, "Not every scenario file has a population line, all scenarios are equally probable")
+        populations = [1]*len(scenarios)
+    total = float(sum(populations))
+    if total <= 0:
+        raise ValueError("The scenario populations sum to zero")
+    myDiary.hotlineWithLogType(0, str(len(scenarios)) + " scenarios loaded from " + str(len(scenarioFiles)) + " file(s)")
+    return [names, scenarios, [n/total for n in populations]]
+
+
+# Scenario ids, renewable units and probabilities of the scenarios of a
+# ScenarioStore (all of them if ids is None); the probabilities are normalized.
+def loadScenariosFromStore(store, myDiary, ids=None):
+    if ids is None or len(ids) == 0:
+        ids = list(store.ids)
+    scenarios = [store.getUnits(i) for i in ids]
+    probabilities = [store.getProbability(i) for i in ids]
+    total = float(sum(probabilities))
+    if total <= 0:
+        raise ValueError("The scenario probabilities sum to zero")
+    myDiary.hotlineWithLogType(0, str(len(ids)) + " scenarios loaded from the scenario store " + store.folder)
+    return [list(ids), scenarios, [p/total for p in probabilities]]
+
+
+# Case data of every scenario. They all hold every renewable unit of the
+# scenarios (with no available output in the scenarios that do not have it),
+# so that the instances of all scenarios have the same sets.
+def getScenarioCaseData(baseData, scenarios):
+    offline = {}
+    for units in scenarios:
+        for unit in units:
+            offline[unit["index"]] = dict(unit, isInSvc=0)
+    caseData = []
+    for units in scenarios:
+        allUnits = dict(offline)
+        for unit in units:
+            allUnits[unit["index"]] = unit
+        caseData.append(ScenarioRunner.applyScenarioRenewables(baseData, list(allUnits.values())))
+    return caseData
+
+
+# Conventional units of an instance: the units of GEN that are not solar or
+# wind units; only they have a first-stage schedule.
+def getFirstStageGens(instance):
+    renewables = set(instance.SOLAR_GEN) | set(instance.WIND_GEN)
+    return [g for g in instance.GEN if g not in renewables]
+
+
+# //---  Read me  ---//
+# Extensive form of the two-stage problem:
+#   - first stage: the schedule pg[g] and spinning reserve sr[g] of the
+#     conventional units (getFirstStageGens), one value for all scenarios;
+#   - scenario[s]: one block per scenario holding a whole SCEDGenericCaseModel
+#     instance with the available solar/wind output of that scenario; its sr is
+#     the first-stage reserve (nonAnticipativitySr) and its pg is the recourse
+#     dispatch, deployed from the reserve:
+#         -sr[g] <= scenario[s].pg[g] - pg[g] <= sr[g]   (recourseUp/Down)
+#     besides its renewable output (or curtailment), load shedding, network
+#     flows, slacks and post-contingency redispatch;
+#   - objective: sum over s of probability[s] * cost of scenario[s].
+class StochasticSCED:
+    def __init__(self, paramManager, myDiary, dataFile=None):
+        self.myDiary = myDiary
+        if dataFile is None:
+            dataFile = paramManager.getPyomoDataFormatInputFileGC()
+        myDiary.hotlineWithLogType(5, "Start to load and prepare the base case for the stochastic SCED: " + dataFile)
+        baseData = PyomoCaseData.loadPyomoDataFile(dataFile)
+        self.baseData = SCEDGenericCaseMatrixModel.prepareCaseData(baseData, paramManager, myDiary)
+        if paramManager.getUseCompactContingency() == True or paramManager.getUseContingencyScreening() == True:
+            self.baseData[None]['useCompactContingency'] = {None: 1}
+        if paramManager.getUseContingencyScreening() == True:
+            myDiary.hotlineWithLogType(7, "Contingency screening is not used by the stochastic SCED, all post-contingency flow limits are in the model")
+        self.solverName = paramManager.getSolverName()
+        self.timeLimit = paramManager.getSolverTimLimit()
+        self.optGap = paramManager.getSolverOptGap()
+        self.instance = None
+        self.names = []
+
+    def build(self, names, scenarios, probabilities):
+        t0 = time.time()
+        self.names = list(names)
+        caseData = getScenarioCaseData(self.baseData, scenarios)
+
+        ef = ConcreteModel()
+        ef.SCENARIO = Set(initialize=range(1, len(scenarios)+1))
+        ef.probability = Param(ef.SCENARIO, initialize=dict((s, probabilities[s-1]) for s in ef.SCENARIO))
+        ef.scenario = Block(ef.SCENARIO)
+        for s in ef.SCENARIO:
+            ef.scenario[s].transfer_attributes_from(SCEDModel.create_instance(data=caseData[s-1]))
+            ef.scenario[s].minimizeCost.deactivate()
+
+        first = ef.scenario[ef.SCENARIO.first()]
+        ef.GEN = Set(initialize=getFirstStageGens(first))
+        ef.pg = Var(ef.GEN)
+        ef.sr = Var(ef.GEN, within=NonNegativeReals)
+
+        def const_NonAnticipativitySr(ef, s, g):
+            return ef.scenario[s].sr[g] == ef.sr[g]
+        ef.nonAnticipativitySr = Constraint(ef.SCENARIO, ef.GEN, rule=const_NonAnticipativitySr)
+
+        def const_RecourseUp(ef, s, g):
+            return ef.scenario[s].pg[g] - ef.pg[g] <= ef.sr[g]
+        ef.recourseUp = Constraint(ef.SCENARIO, ef.GEN, rule=const_RecourseUp)
+
+        def const_RecourseDown(ef, s, g):
+            return ef.scenario[s].pg[g] - ef.pg[g] >= -ef.sr[g]
+        ef.recourseDown = Constraint(ef.SCENARIO, ef.GEN, rule=const_RecourseDown)
+
+        def expectedCostObj(ef):
+            return sum(ef.probability[s]*ef.scenario[s].minimizeCost.expr for s in ef.SCENARIO)
+        ef.expectedCost = Objective(rule=expectedCostObj)
+
+        self.instance = ef
+        self.myDiary.hotlineWithLogType(5, "Stochastic SCED with " + str(len(ef.SCENARIO)) + " scenarios built in "
+                                        + format(time.time() - t0, '.2f') + " seconds")
+        return ef
+
+    def solve(self):
+        session = PersistentSolver.PersistentSCEDSession(self.instance, self.solverName, self.myDiary,
+                                                         self.timeLimit, self.optGap)
+        results = session.solve()
+        self.myDiary.hotlineWithLogType(6, "Stochastic SCED: " + str(results.solver.termination_condition)
+                                        + ", expected cost " + str(value(self.instance.expectedCost)))
+        return results
+
+    # First-stage schedule (MW) and the recourse of every scenario; deployedMW is
+    # the net reserve deployed by the conventional units in the scenario
+    def writeResults(self, fileName):
+        ef = self.instance
+        baseMVA = value(ef.scenario[ef.SCENARIO.first()].BaseMVA)
+        with open(fileName, "w") as f:
+            f.write("expectedCost " + format(value(ef.expectedCost), '.4f') + "\n")
+            f.write("gen pgMW srMW\n")
+            for g in ef.GEN:
+                f.write(str(g) + " " + format(value(ef.pg[g])*baseMVA, '.4f') + " " + format(value(ef.sr[g])*baseMVA, '.4f') + "\n")
+            f.write("scenario probability cost solarMW windMW curtailedMW loadShedMW loadShedCtgcyMW deployedMW\n")
+            for s in ef.SCENARIO:
+                b = ef.scenario[s]
+                solar = sum(value(b.Solar_pg[u]) for u in b.SOLAR_GEN)
+                wind = sum(value(b.Wind_pg[u]) for u in b.WIND_GEN)
+                available = sum(value(b.Solar_pgMax[u]) for u in b.SOLAR_GEN) + sum(value(b.Wind_pgMax[u]) for u in b.WIND_GEN)
+                loadShed = sum(value(b.loadShed[d]) for d in b.LOAD)
+                loadShedCtgcy = sum(value(b.loadShed_c[c, d]) for c in b.CONTINGENCY_FULL
+                                    if value(b.Contingency_isEnabled[c]) == 1 for d in b.LOAD)
+                deployed = sum(value(b.pg[g]) - value(ef.pg[g]) for g in ef.GEN)
+                values = [value(b.minimizeCost), solar*baseMVA, wind*baseMVA, (available - solar - wind)*baseMVA,
+                          loadShed*baseMVA, loadShedCtgcy*baseMVA, deployed*baseMVA]
+                f.write(self.names[s-1] + " " + format(value(ef.probability[s]), '.4f') + " "
+                        + " ".join(format(v, '.4f') for v in values) + "\n")
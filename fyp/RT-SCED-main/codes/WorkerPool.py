@@ -0,0 +1,97 @@
+"""
+Pool of worker processes that keep their own state (model instances and
+persistent solver sessions) across repeated solves, for the decomposition
+drivers (ProgressiveHedging, BendersDecomposition).
+
+Website: https://rpglab.github.io/resources/RT-SCED_Python/
+"""
+
+import multiprocessing
+import traceback
+
+
+# Worker process: builds solverClass(group, settings) once and answers
+# ("solve", args) messages with ["ok", solver.solve(*args)] until it receives
+# ("stop",). A failure to build the solver or to solve is answered with
+# ["error", traceback] instead, so that the parent can report it.
+def runWorker(conn, solverClass, group, settings):
+    solver = None
+    buildError = None
+    try:
+        solver = solverClass(group, settings)
+    except Exception:
+        buildError = traceback.format_exc()
+    while True:
+        message = conn.recv()
+        if message[0] == "stop":
+            break
+        if solver is None:
+            conn.send(["error", buildError])
+            continue
+        try:
+            reply = ["ok", solver.solve(*message[1])]
+        except Exception:
+            reply = ["error", traceback.format_exc()]
+        conn.send(reply)
+    conn.close()
+
+
+# //---  Read me  ---//
+# groups is a list of dicts {key: data}; worker j owns groups[j] for the whole
+# life of the pool, so its instances stay in its solver between solve() calls.
+# solverClass(group, settings).solve(*args) must return a dict keyed like the
+# group. With a single non-empty group everything runs in this process.
+# The fork start method is used where available, so the group data are
+# inherited by the workers instead of being pickled.
+class WorkerPool:
+    def __init__(self, solverClass, groups, settings):
+        self.groups = [group for group in groups if len(group) > 0]
+        self.workers = []
+        self.localSolver = None
+        if len(self.groups) <= 1:
+            group = self.groups[0] if len(self.groups) == 1 else {}
+            self.localSolver = solverClass(group, settings)
+            return
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+        else:
+            context = multiprocessing.get_context()
+        for group in self.groups:
+            conn, workerConn = context.Pipe()
+            process = context.Process(target=runWorker, args=(workerConn, solverClass, group, settings), daemon=True)
+            process.start()
+            workerConn.close()
+            self.workers.append([process, conn, group])
+
+    # getArgs(group) gives the arguments of solve() for the workers of group
+    def solve(self, getArgs):
+        results = {}
+        if self.localSolver is not None:
+            results.update(self.localSolver.solve(*getArgs(self.groups[0] if len(self.groups) > 0 else {})))
+            return results
+        for process, conn, group in self.workers:
+            conn.send(("solve", getArgs(group)))
+        errors = []
+        for process, conn, group in self.workers:
+            status, reply = conn.recv()
+            if status == "ok":
+                results.update(reply)
+            else:
+                errors.append(reply)
+        if len(errors) > 0:
+            raise RuntimeError("A worker process failed:\n" + errors[0])
+        return results
+
+    def close(self):
+        for process, conn, group in self.workers:
+            conn.send(("stop",))
+            conn.close()
+        for process, conn, group in self.workers:
+            process.join()
+        self.workers = []
+
+
+# Split the keys of data into jobs groups, round robin
+def splitIntoGroups(data, jobs):
+    keys = list(data)
+    return [dict((key, data[key]) for key in keys[j::max(1, jobs)]) for j in range(max(1, jobs))]
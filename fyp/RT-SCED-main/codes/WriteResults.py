@@ -1,5 +1,6 @@
 from pyomo.environ import *
 import os
+import ContingencyScreening
 
 def Write_GenInfo(instance, fileName, isDataForRC, myDiary, scenario_name):
     """
@@ -147,8 +148,22 @@ def Write_GenInfo(instance, fileName, isDataForRC, myDiary, scenario_name):
         for c in instance.CONTINGENCY:
             try:
                 if instance.Contingency_isEnabled[c] == 1:
+                    # compact formulation: the flows of the branches without a flow
+                    # expression (not screened in) follow from the contingency factors
+                    ctgcyFlows = None
+                    if hasattr(instance, "ctgcyFlowFactors") and c in instance.ctgcyFlowFactors:
+                        ctgcyFlows = ContingencyScreening.calcContingencyFlows(instance, c)
+                        brcPos = instance.ctgcyFlowFactors[c][2]
+                        outaged = instance.outageBranchesOfCtgcy.get(c, [])
                     for k in instance.BRANCH:
-                        pkc_value = value(instance.pkc[c, k]) * instance.BaseMVA
+                        if (c, k) in instance.pkc:
+                            pkc_value = value(instance.pkc[c, k]) * instance.BaseMVA
+                        elif hasattr(instance, "ctgcyFlow") and (c, k) in instance.ctgcyFlow:
+                            pkc_value = value(instance.ctgcyFlow[c, k]) * instance.BaseMVA
+                        elif ctgcyFlows is not None and instance.Branch_isInSvc[k] != 0 and k not in outaged:
+                            pkc_value = float(ctgcyFlows[brcPos[k]]) * instance.BaseMVA
+                        else:
+                            pkc_value = "-"  # not monitored: outaged branch, or a contingency that islands the network
                         rateC_value = value(instance.Branch_rateC[k]) * instance.BaseMVA
                         fileSummary.write(f"{c} {instance.Contingency_isEnabled[c]} {k} {instance.Branch_isInSvc[k]} "
                                           f"{pkc_value} {rateC_value}\n")
@@ -206,7 +221,9 @@ def Write_GenInfo(instance, fileName, isDataForRC, myDiary, scenario_name):
 
         # Contingency-specific results
         fileSummary.write("\n*************** Contingency Results ************\n")
-        for c in instance.CONTINGENCY:
+        # the compact formulation has no post-contingency load shed (no CONTINGENCY_FULL
+        # members); the matrix-form solution has no CONTINGENCY_FULL set at all
+        for c in getattr(instance, "CONTINGENCY_FULL", instance.CONTINGENCY):
             try:
                 if instance.Contingency_isEnabled[c] == 1:
                     totalLoadShed_c = sum(value(instance.loadShed_c[c, d]) for d in instance.LOAD)
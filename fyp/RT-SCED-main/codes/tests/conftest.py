@@ -0,0 +1,12 @@
+"""
+The modules of the SCED tool import each other by name, so the program
+directory is put on the path for the tests.
+
+How to run: go to the program directory, and type down the below command
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
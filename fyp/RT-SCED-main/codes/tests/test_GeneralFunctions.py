@@ -0,0 +1,45 @@
+"""
+Tests of the quote-aware tokenizer GeneralFunctions.split.
+"""
+
+import pytest
+
+import GeneralFunctions
+
+
+def split(line):
+    return GeneralFunctions.strip(GeneralFunctions.split(line, ',', '\''))
+
+
+def test_split_without_quotes():
+    assert split("1, 230.0,1\n") == ['1', '230.0', '1']
+
+
+def test_split_keeps_delimiters_inside_quotes():
+    assert split("1,'BUS 1', 230.0,1") == ['1', "'BUS 1'", '230.0', '1']
+    assert split("1,'a,b',2") == ['1', "'a,b'", '2']
+    assert split("1,'a','b',3\n") == ['1', "'a'", "'b'", '3']
+
+
+def test_split_quoted_first_and_last_fields():
+    assert split("'x,y',1") == ["'x,y'", '1']
+    assert split("1,'a,b'") == ['1', "'a,b'"]
+
+
+def test_split_keeps_text_around_quotes():
+    assert split("1,'a'x,2") == ['1', "'a'x", '2']
+    assert split("1,x'a',2") == ['1', "x'a'", '2']
+
+
+def test_split_double_quotes_become_single_quotes():
+    assert split('1,"a,b",2') == ['1', "'a,b'", '2']
+
+
+def test_split_drops_comments():
+    assert split("1,2 // c,d") == ['1', '2']
+    assert split("1,'2' /* x,y") == ['1', "'2'"]
+
+
+def test_split_unpaired_quote_exits():
+    with pytest.raises(SystemExit):
+        GeneralFunctions.split("1,'a,2", ',', '\'')
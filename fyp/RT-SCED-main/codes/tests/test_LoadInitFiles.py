@@ -0,0 +1,67 @@
+"""
+Tests of the RAW reader: the views of LoadInitFiles.loadRawViews against the
+objects of loadBuses/loadLoads/loadGens/loadBranches.
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import Benchmarks
+import Diary
+import GeneralFunctions
+import GeneratePyomoDataFiles
+import LoadInitFiles
+import RawGenericModel
+
+rawFields = {0: ['busNumber', 'busKV', 'busType', 'busArea', 'busVm', 'busVa'],
+             1: ['busNumber', 'loadID', 'isInSvc', 'Pload', 'comment'],
+             2: ['busNumber', 'genID', 'isInSvc', 'PGen', 'PMax', 'PMin', 'comment'],
+             3: ['frmBusNumber', 'toBusNumber', 'brcID', 'isInSvc', 'R', 'X', 'rateA', 'rateB', 'rateC', 'angle', \
+                 'comment', 'xfmcomment', 'isXfm', 'tap']}
+
+
+@pytest.fixture
+def rawFile(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Diary writes its log into the working directory
+    fileName = str(tmp_path / "case.raw")
+    Benchmarks.writeSyntheticRaw(fileName, 200)
+    return fileName
+
+
+def readObjects(fileName, myDiary):
+    with open(fileName, "r") as pf:
+        GeneralFunctions.skipNLines(pf, 3)
+        return [LoadInitFiles.loadBuses(pf, myDiary), LoadInitFiles.loadLoads(pf, myDiary), \
+                LoadInitFiles.loadGens(pf, myDiary), LoadInitFiles.loadBranches(pf, myDiary)]
+
+
+def test_views_equal_objects(rawFile):
+    myDiary = Diary.Diary()
+    objects = readObjects(rawFile, myDiary)
+    views = LoadInitFiles.loadRawViews(rawFile, myDiary)
+    for section in rawFields:
+        assert len(views[section]) == len(objects[section])
+        for view, obj in zip(views[section], objects[section]):
+            for name in rawFields[section]:
+                assert getattr(view, name) == pytest.approx(getattr(obj, name)), name
+        names = rawFields[section][:4]
+        assert list(RawGenericModel.recordRows(views[section], names)) == \
+               list(RawGenericModel.recordRows(objects[section], names))
+    myDiary.close()
+
+
+# The generic-case pyomo data file is the same from the views as from the objects.
+def test_data_file_from_views(rawFile):
+    myDiary = Diary.Diary()
+    texts = []
+    for records in [readObjects(rawFile, myDiary), LoadInitFiles.loadRawViews(rawFile, myDiary)]:
+        genericModel = RawGenericModel.GenericModel(records[0], records[1], records[2], records[3], [], [], [])
+        dataWriter = GeneratePyomoDataFiles.generatePyomoFiles(True, myDiary)
+        dataWriter.setGenericCaseModel(genericModel)
+        dataWriter.setNeedHeading(True)
+        dataWriter.writeAllDataGC()
+        with open(dataWriter.getFileNamePyomoGC(), "r") as f:
+            texts.append(f.read())
+    assert texts[0] == texts[1]
+    myDiary.close()
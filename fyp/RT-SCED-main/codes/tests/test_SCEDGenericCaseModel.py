@@ -0,0 +1,163 @@
+"""
+Tests of the generic-case SCED on the synthetic ring cases of Benchmarks.py:
+scenario overlays against rebuilt instances, the Pyomo model against the
+matrix-form engine with binding post-contingency flow limits, and the compact
+(preventive PTDF/LODF) contingency formulation against the full one.
+"""
+
+import pytest
+
+pytest.importorskip("pyomo")
+from pyomo.environ import SolverFactory, value
+
+import Benchmarks
+
+solverName = "appsi_highs"
+if not SolverFactory(solverName).available(exception_flag=False):
+    pytest.skip(solverName + " is not available", allow_module_level=True)
+
+
+# Case with contingencies where they limit the dispatch: branch emergency
+# ratings are tight and gen 1 is a cheap large unit.
+def makeBindingCase(numBus, numCtgcy, numSegment=3):
+    data = Benchmarks.addContingencies(Benchmarks.makeGenericCaseData(numBus, numSegment), numCtgcy)
+    case = data[None]
+    case['Branch_rateC'] = dict((k, 30.0) for k in case['Branch_rateC'])
+    case['Gen_energyRamp'] = dict((g, 100.0) for g in case['Gen_energyRamp'])
+    case['Gen_spinRamp'] = dict((g, 5.0) for g in case['Gen_spinRamp'])
+    case['Gen_pgMax'][1] = 200.0
+    for i in case['GenCost_genIdx']:
+        if case['GenCost_genIdx'][i] == 1:
+            case['GenCost_segmentBreadth'][i] = 60.0
+            case['GenCost_segmentPrice'][i] = 5.0
+    return data
+
+
+def isClose(a, b):
+    return abs(a - b) < 1e-6*max(1.0, abs(b))
+
+
+def setSolar(case):
+    case['Solar_pgMax'] = {1: 40.0/100}
+
+def scaleLoads(case):
+    case['Load_pd'] = dict((d, v*1.1) for d, v in case['Load_pd'].items())
+
+def outageGen(g):
+    def change(case):
+        for name in ['Gen_isInSvc', 'Gen_pgInit', 'Gen_pgMax', 'Gen_pgMin']:
+            case[name] = dict(case[name])
+            case[name][g] = 0
+    return change
+
+def outageBranch(k):
+    def change(case):
+        case['Branch_isInSvc'] = dict(case['Branch_isInSvc'])
+        case['Branch_isInSvc'][k] = 0
+    return change
+
+numBus = 20
+numCtgcy = 4
+# [overlay changes, same change of the case data]
+overlayChanges = {
+    "renewable": [lambda o: o.setRenewable(1, 40.0), setSolar],
+    "load": [lambda o: o.scaleLoads(1.1), scaleLoads],
+    "branch": [lambda o: o.outageBranch(numCtgcy+2), outageBranch(numCtgcy+2)],
+    "gen1": [lambda o: o.outageGen(1), outageGen(1)],
+    "gen2": [lambda o: o.outageGen(2), outageGen(2)],
+    "gen5": [lambda o: o.outageGen(numBus//4), outageGen(numBus//4)],
+}
+
+
+# Every kind of change solved as an overlay on one base instance must give the
+# objective of an instance rebuilt from the changed data, and the base
+# objective must come back after the revert.
+@pytest.mark.parametrize("name", sorted(overlayChanges))
+def test_overlay_matches_rebuilt_instance(name):
+    from SCEDGenericCaseModel import model as SCEDModel
+    import PersistentSolver
+    import ScenarioOverlay
+    data = makeBindingCase(numBus, numCtgcy)
+    case = data[None]
+    case['SOLAR_GEN'] = {None: [1]}
+    case['Solar_busNumber'] = {1: 4}
+    case['Solar_pgMax'] = {1: 0.0}
+    addChange, changeData = overlayChanges[name]
+
+    changed = dict(case)
+    changeData(changed)
+    instance = SCEDModel.create_instance(data={None: changed})
+    SolverFactory(solverName).solve(instance)
+
+    session = PersistentSolver.PersistentSCEDSession(SCEDModel.create_instance(data=data), solverName)
+    session.solve()
+    baseObj = value(session.instance.minimizeCost)
+    overlay = ScenarioOverlay.ScenarioOverlay(name)
+    addChange(overlay)
+    overlay.apply(session.instance, session)
+    session.solve()
+    assert isClose(value(session.instance.minimizeCost), value(instance.minimizeCost))
+    overlay.revert(session.instance, session)
+    session.solve()
+    assert isClose(value(session.instance.minimizeCost), baseObj)
+
+
+# The contingency lines are listed in the reverse order of the contingencies
+# (line 1 takes out ring branch numBus for contingency 2, line 2 takes out
+# branch 2 for contingency 1), so that looking the outage branch up with the
+# contingency index drops the limit of branch 2 in contingency 2, the only one
+# that binds there. Both engines must leave out the limits of the outage
+# branches of every contingency, and only them.
+def test_contingency_flow_limits_match_matrix_engine():
+    pytest.importorskip("scipy")
+    from SCEDGenericCaseModel import model as SCEDModel
+    import SCEDGenericCaseMatrixModel
+    data = makeBindingCase(numBus, 2)
+    case = data[None]
+    case['Contingency_index'] = {1: 2, 2: 1}
+    case['Contingency_branchIdx'] = {1: numBus, 2: 2}
+    case['Branch_rateC'][2] = 15.0
+    instance = SCEDModel.create_instance(data=data)
+    SolverFactory(solverName).solve(instance)
+    solution = SCEDGenericCaseMatrixModel.MatrixSCEDModel(data).buildLP().solve()
+    assert isClose(value(instance.minimizeCost), solution.minimizeCost)
+
+
+# Without spin ramp the full model cannot redispatch after a contingency
+# (moving pgc away from pg costs spinRamp_penalty, far above any price
+# difference), so the preventive compact model must give the same objective.
+def test_compact_matches_full_without_redispatch():
+    from SCEDGenericCaseModel import model as SCEDModel
+    objectives = []
+    for useCompact in (0, 1):
+        data = makeBindingCase(numBus, numCtgcy)
+        case = data[None]
+        case['Gen_spinRamp'] = dict((g, 0.0) for g in case['Gen_spinRamp'])
+        case['useCompactContingency'] = {None: useCompact}
+        instance = SCEDModel.create_instance(data=data)
+        SolverFactory(solverName).solve(instance)
+        objectives.append(value(instance.minimizeCost))
+    assert isClose(objectives[1], objectives[0])
+
+
+def countNonzeros(instance):
+    from pyomo.environ import Constraint
+    from pyomo.core.expr.visitor import identify_variables
+    return sum(len(list(identify_variables(con.body, include_fixed=False)))
+               for con in instance.component_data_objects(Constraint, active=True))
+
+
+# The compact model keeps no contingency-state variables or rows: with
+# 20 contingencies it must be several times smaller than the full model.
+def test_compact_lp_is_smaller():
+    from SCEDGenericCaseModel import model as SCEDModel
+    sizes = []
+    for useCompact in (0, 1):
+        data = makeBindingCase(40, 20)
+        data[None]['useCompactContingency'] = {None: useCompact}
+        instance = SCEDModel.create_instance(data=data)
+        sizes.append([instance.nvariables(), instance.nconstraints(), countNonzeros(instance)])
+    full, compact = sizes
+    assert compact[0]*5 < full[0]
+    assert compact[1]*2 < full[1]
+    assert compact[2]*2 < full[2]
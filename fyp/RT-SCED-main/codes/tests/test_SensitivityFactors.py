@@ -0,0 +1,42 @@
+"""
+Tests of the PTDF/LODF factors used by the compact contingency formulation:
+the base-case flows corrected by the LODF of the outaged branches must be the
+flows of the network rebuilt without them.
+"""
+
+import numpy as np
+
+import SensitivityFactors
+
+
+# Ring of numBus buses with a few chords, and a random balanced injection
+def makeNetwork(numBus=12, seed=3):
+    rng = np.random.default_rng(seed)
+    frmPos = list(range(numBus)) + [0, 2, 5]
+    toPos = [(n+1) % numBus for n in range(numBus)] + [6, 9, 11]
+    x = rng.uniform(0.05, 0.3, len(frmPos))
+    injection = rng.normal(size=numBus)
+    injection[0] -= injection.sum()
+    return frmPos, toPos, x, injection
+
+
+def test_lodf_flows_match_rebuilt_network():
+    frmPos, toPos, x, injection = makeNetwork()
+    isInSvc = np.ones(len(x))
+    ptdf = SensitivityFactors.calcPTDF(len(injection), frmPos, toPos, x, isInSvc)
+    baseFlows = ptdf @ injection
+    outagePos = [1, 13]
+    lodf = SensitivityFactors.calcLODF(ptdf, frmPos, toPos, outagePos)
+    assert lodf.shape == (len(x), len(outagePos))
+    flows = baseFlows + lodf @ baseFlows[outagePos]
+    isInSvc[outagePos] = 0
+    rebuilt = SensitivityFactors.calcPTDF(len(injection), frmPos, toPos, x, isInSvc) @ injection
+    monitored = np.delete(np.arange(len(x)), outagePos)
+    assert np.allclose(flows[monitored], rebuilt[monitored])
+
+
+def test_lodf_is_none_for_islanding_outage():
+    frmPos, toPos, x, injection = makeNetwork()
+    ptdf = SensitivityFactors.calcPTDF(len(injection), frmPos, toPos, x, np.ones(len(x)))
+    # bus 7 is only connected by ring branches 6 (6-7) and 7 (7-8)
+    assert SensitivityFactors.calcLODF(ptdf, frmPos, toPos, [6, 7]) is None